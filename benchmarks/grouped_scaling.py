@@ -0,0 +1,54 @@
+"""Scaling of `resample_dataframe_grouped_polars` with the number of workers.
+
+Run with `python benchmarks/grouped_scaling.py [max_workers]`.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+from camminapy.data import resample_dataframe_grouped_polars
+
+N_ROWS = 5_000_000
+N_GROUPS = 10_000
+
+
+def _get_df() -> pl.DataFrame:
+    np.random.seed(1)
+    row = np.arange(N_ROWS)
+    return pl.DataFrame(
+        {
+            "session": row % N_GROUPS,
+            "t": row // N_GROUPS + np.random.rand(N_ROWS) / 2,
+            "heart_rate": np.random.randn(N_ROWS),
+            "power": np.random.randn(N_ROWS),
+            "sport": np.random.choice(["running", "cycling"], N_ROWS),
+        }
+    )
+
+
+def main(max_workers: int) -> None:
+    df = _get_df()
+    n_jobs = [2**i for i in range(max_workers.bit_length()) if 2**i < max_workers]
+    print(f"{'executor':>8} {'workers':>8} {'seconds':>8} {'speedup':>8}")
+    for executor in ["thread", "process"]:
+        baseline = None
+        for n in [*n_jobs, max_workers]:
+            t0 = time.perf_counter()
+            resample_dataframe_grouped_polars(
+                df,
+                interpolation_column="t",
+                interpolation_step=1.0,
+                group_column="session",
+                n_jobs=n,
+                executor=executor,
+            )
+            seconds = time.perf_counter() - t0
+            baseline = baseline or seconds
+            print(f"{executor:>8} {n:>8} {seconds:>8.2f} {baseline / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1)
@@ -0,0 +1,52 @@
+"""Startup cost of importing camminapy.
+
+Run with `python benchmarks/import_time.py`. Every statement runs in a fresh
+interpreter, and the best wall time of a few runs is reported. The interpreter
+startup itself (`pass`) is listed for reference. Use `python -X importtime -c ...`
+to see which modules are loaded by a statement.
+
+Seconds per statement, before and after the packages import lazily:
+
+                                                 statement    before     after
+                                                      pass     0.018     0.019
+                                          import camminapy     0.018     0.023
+                                     import camminapy.data     0.810     0.038
+                                     import camminapy.plot     1.393     0.036
+      from camminapy.data import resample_dataframe_polars     0.816     0.286
+                         from camminapy.plot import Footer     1.363     1.451
+
+Importing camminapy no longer creates `logs/` or loads rich, pandas or pyarrow;
+the log handlers are set up when the first message is logged.
+"""
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    "pass",
+    "import camminapy",
+    "import camminapy.data",
+    "import camminapy.plot",
+    "from camminapy.data import resample_dataframe_polars",
+    "from camminapy.plot import Footer",
+]
+N_RUNS = 5
+
+
+def _time_statement(statement: str) -> float:
+    seconds = []
+    for _ in range(N_RUNS):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)  # noqa: S603
+        seconds.append(time.perf_counter() - t0)
+    return min(seconds)
+
+
+def main() -> None:
+    print(f"{'statement':>58} {'seconds':>9}")
+    for statement in STATEMENTS:
+        print(f"{statement:>58} {_time_statement(statement):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Benchmark suite for `camminapy.data.resample` with regression tracking.
+
+Run all cases and store the results as a baseline:
+
+    python benchmarks/resample_suite.py --save baseline.json
+
+Run again after a change and compare against the baseline. Cases that got slower
+by more than `--threshold`, or whose peak RSS grew by more than
+`--memory-threshold`, are flagged, and the exit code is 1 if there are any:
+
+    python benchmarks/resample_suite.py --compare baseline.json
+
+If the baseline doesn't exist yet, the results are saved as the baseline instead.
+
+The sizes can be changed with `--rows`, `--groups`, `--columns`, `--dtypes` and
+`--ratios` (the interpolation step relative to the spacing of the input rows),
+e.g. `--rows 1e3 1e8`. Peak memory is measured on Linux only.
+"""
+import argparse
+import itertools
+import json
+import platform
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from camminapy.data import (
+    resample_dataframe_grouped_pandas,
+    resample_dataframe_grouped_polars,
+    resample_dataframe_pandas,
+    resample_dataframe_polars,
+)
+
+FUNCTIONS = {
+    "polars": resample_dataframe_polars,
+    "grouped_polars": resample_dataframe_grouped_polars,
+    "pandas": resample_dataframe_pandas,
+    "grouped_pandas": resample_dataframe_grouped_pandas,
+}
+
+
+def _get_df(n_rows: int, n_groups: int, n_columns: int, dtype: str) -> pl.DataFrame:
+    np.random.seed(1)
+    rows_per_group = max(n_rows // n_groups, 1)
+    group = np.repeat(np.arange(n_groups), rows_per_group)
+    n = len(group)
+    data: dict[str, Any] = {
+        "group": group,
+        "x": np.tile(np.arange(rows_per_group), n_groups) + np.random.rand(n) / 2,
+    }
+    for i in range(n_columns):
+        if dtype == "float":
+            data[f"c{i}"] = np.random.randn(n)
+        elif dtype == "int":
+            data[f"c{i}"] = np.random.randint(0, 1000, n)
+        else:
+            data[f"c{i}"] = np.random.choice(["running", "cycling", "swimming"], n)
+    df = pl.DataFrame(data)
+    if dtype == "categorical":
+        df = df.with_columns(pl.exclude("group", "x").cast(pl.Categorical))
+    return df
+
+
+def _reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mib() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_case(
+    function: str, n_rows: int, n_groups: int, n_columns: int, dtype: str, ratio: float
+) -> dict[str, float]:
+    df: pl.DataFrame | pd.DataFrame = _get_df(n_rows, n_groups, n_columns, dtype)
+    kwargs: dict[str, Any] = {"interpolation_column": "x", "interpolation_step": ratio}
+    if function.startswith("grouped"):
+        kwargs["group_column"] = "group"
+    else:
+        df = df.drop("group")
+    if function.endswith("pandas"):
+        df = df.to_pandas()
+
+    # Best of a few repetitions for small cases, a single run for large ones.
+    repetitions = max(1, min(5, 1_000_000 // n_rows))
+    _reset_peak_rss()
+    seconds = np.inf
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        FUNCTIONS[function](df, **kwargs)
+        seconds = min(seconds, time.perf_counter() - t0)
+    return {
+        "seconds": seconds,
+        "peak_rss_mib": _peak_rss_mib(),
+        "rows_per_second": len(df) / seconds,
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    results = {}
+    cases = itertools.product(
+        args.functions, args.rows, args.groups, args.columns, args.dtypes, args.ratios
+    )
+    for function, n_rows, n_groups, n_columns, dtype, ratio in cases:
+        if n_groups > 1 and not function.startswith("grouped"):
+            continue
+        name = (
+            f"{function}/rows={n_rows:g}/groups={n_groups}/columns={n_columns}"
+            f"/dtype={dtype}/ratio={ratio:g}"
+        )
+        result = _run_case(function, int(n_rows), n_groups, n_columns, dtype, ratio)
+        results[name] = result
+        print(
+            f"{name:<75} {result['seconds']:>9.4f}s "
+            f"{result['peak_rss_mib']:>9.0f}MiB {result['rows_per_second']:>12.0f}rows/s"
+        )
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+    memory_threshold: float,
+) -> list[str]:
+    """Returns the names of all cases that got slower or need more memory."""
+    regressions = []
+    print(
+        f"\n{'case':<75} {'baseline s':>11} {'now s':>9} {'ratio':>6}"
+        f" {'baseline MiB':>12} {'now MiB':>9} {'ratio':>6}"
+    )
+    for name in sorted(results.keys() & baseline.keys()):
+        before = baseline[name]["seconds"]
+        after = results[name]["seconds"]
+        rss_before = baseline[name]["peak_rss_mib"]
+        rss_after = results[name]["peak_rss_mib"]
+        flag = ""
+        if after > before * (1 + threshold):
+            flag += "  SLOWER"
+        if rss_after > rss_before * (1 + memory_threshold):
+            flag += "  MORE MEMORY"
+        if flag:
+            regressions.append(name)
+        print(
+            f"{name:<75} {before:>11.4f} {after:>9.4f} {after / before:>6.2f}"
+            f" {rss_before:>12.0f} {rss_after:>9.0f} {rss_after / rss_before:>6.2f}"
+            f"{flag}"
+        )
+    return regressions
+
+
+def save(path: Path, results: dict[str, dict[str, float]]) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "meta": {
+                    "python": platform.python_version(),
+                    "polars": pl.__version__,
+                    "machine": platform.machine(),
+                },
+                "cases": results,
+            },
+            indent=2,
+        )
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--functions", nargs="+", default=list(FUNCTIONS))
+    parser.add_argument("--rows", nargs="+", type=float, default=[1e3, 1e5])
+    parser.add_argument("--groups", nargs="+", type=int, default=[1, 100])
+    parser.add_argument("--columns", nargs="+", type=int, default=[4])
+    parser.add_argument(
+        "--dtypes", nargs="+", default=["float", "int", "string", "categorical"]
+    )
+    parser.add_argument("--ratios", nargs="+", type=float, default=[0.5, 10])
+    parser.add_argument("--save", type=Path, help="Store the results as JSON.")
+    parser.add_argument("--compare", type=Path, help="JSON baseline to compare to.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--memory-threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with pl.StringCache():
+        results = run(args)
+
+    if args.save is not None:
+        save(args.save, results)
+    if args.compare is not None:
+        if not args.compare.exists():
+            print(f"\nNo baseline at {args.compare} yet, saving these results there.")
+            save(args.compare, results)
+            return 0
+        baseline = json.loads(args.compare.read_text())["cases"]
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} regression(s) above {args.threshold:.0%} in "
+                f"time or {args.memory_threshold:.0%} in peak RSS."
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,19 @@
 """.. include:: ../README.md"""  # noqa
-
+import importlib
+from types import ModuleType
 
 __author__ = """Thomas Camminady"""
 __email__ = "0milieux_member@icloud.com"
+
+_SUBMODULES = ("data", "plot", "utils")
+
+
+def __getattr__(name: str) -> ModuleType:
+    # `camminapy.data` etc. are imported on first access only.
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_SUBMODULES))
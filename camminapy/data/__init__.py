@@ -1,13 +1,80 @@
-from camminapy.data.resample import (
-    resample_dataframe_grouped_pandas,
-    resample_dataframe_grouped_polars,
-    resample_dataframe_pandas,
-    resample_dataframe_polars,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from camminapy.data.dataset import resample_dataset_grouped_polars
+    from camminapy.data.downsample import (
+        downsample_dataframe_grouped_pandas,
+        downsample_dataframe_grouped_polars,
+        downsample_dataframe_pandas,
+        downsample_dataframe_polars,
+    )
+    from camminapy.data.fuse import (
+        fuse_dataframes_pandas,
+        fuse_dataframes_polars,
+    )
+    from camminapy.data.incremental import Resampler
+    from camminapy.data.lazy import (
+        resample_lazyframe_grouped_polars,
+        resample_lazyframe_polars,
+    )
+    from camminapy.data.plan import PlanCache
+    from camminapy.data.resample import (
+        resample_dataframe_grouped_pandas,
+        resample_dataframe_grouped_polars,
+        resample_dataframe_pandas,
+        resample_dataframe_polars,
+    )
+
+# The submodules are only imported once one of their names is used, so that
+# importing this package does not pull in polars, pandas or pyarrow.
+_MODULES = {
+    "PlanCache": "camminapy.data.plan",
+    "Resampler": "camminapy.data.incremental",
+    "resample_dataframe_polars": "camminapy.data.resample",
+    "resample_dataframe_grouped_polars": "camminapy.data.resample",
+    "resample_dataframe_pandas": "camminapy.data.resample",
+    "resample_dataframe_grouped_pandas": "camminapy.data.resample",
+    "resample_lazyframe_polars": "camminapy.data.lazy",
+    "resample_lazyframe_grouped_polars": "camminapy.data.lazy",
+    "resample_dataset_grouped_polars": "camminapy.data.dataset",
+    "downsample_dataframe_polars": "camminapy.data.downsample",
+    "downsample_dataframe_grouped_polars": "camminapy.data.downsample",
+    "downsample_dataframe_pandas": "camminapy.data.downsample",
+    "downsample_dataframe_grouped_pandas": "camminapy.data.downsample",
+    "fuse_dataframes_polars": "camminapy.data.fuse",
+    "fuse_dataframes_pandas": "camminapy.data.fuse",
+}
 
 __all__ = [
+    "PlanCache",
+    "Resampler",
     "resample_dataframe_polars",
     "resample_dataframe_grouped_polars",
     "resample_dataframe_pandas",
     "resample_dataframe_grouped_pandas",
+    "resample_lazyframe_polars",
+    "resample_lazyframe_grouped_polars",
+    "resample_dataset_grouped_polars",
+    "downsample_dataframe_polars",
+    "downsample_dataframe_grouped_polars",
+    "downsample_dataframe_pandas",
+    "downsample_dataframe_grouped_pandas",
+    "fuse_dataframes_polars",
+    "fuse_dataframes_pandas",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_MODULES[name])
+    # Bind all names of the module at once, see `camminapy.plot.__getattr__`.
+    for other_name, module_name in _MODULES.items():
+        if module_name == module.__name__:
+            globals()[other_name] = getattr(module, other_name)
+    return globals()[name]
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,404 @@
+import collections
+import datetime
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+from camminapy.data.resample import resample_dataframe_grouped_polars
+from camminapy.utils.logger import logger
+
+# File extensions of the partitions that are read, and their format.
+FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+    ".feather": "ipc",
+}
+
+
+def resample_dataset_grouped_polars(
+    source: str | Path | list[str | Path],
+    interpolation_column: str,
+    interpolation_step: float | datetime.timedelta,
+    group_column: str,
+    sink: str | Path | None = None,
+    columns: list[str] | None = None,
+    chunk_size: int = 1_000_000,
+    max_in_flight: int = 2,
+    methods: dict[str, str] | None = None,
+    low_memory: bool = False,
+    max_gap: float | datetime.timedelta | None = None,
+    dtype_policy: str = "preserve",
+    to_log: bool = False,
+) -> pl.DataFrame | None:
+    """Groupwise resamples a dataset of Parquet or Arrow IPC files chunk by chunk.
+
+    Parameters
+    ----------
+    source : str | Path | list[str | Path]
+        A directory, which is searched recursively for `.parquet`, `.arrow`,
+        `.ipc` and `.feather` files in sorted order, or a list of such files.
+        Directories named `{group_column}=value`, as written by hive partitioning,
+        provide the group of files that don't contain `group_column`.
+    interpolation_column : str
+        Which numeric or temporal column to use for the interpolation points.
+    interpolation_step : float | datetime.timedelta
+        Steps for the newly create interpolation points, see
+        `resample_dataframe_polars`.
+    group_column : str
+        The column over which to group. The rows of every group must follow each
+        other in the dataset, although they may span several chunks and files.
+    sink : str | Path | None
+        If given, a directory that the result is written to as it goes, one file
+        per input file at the same path relative to `source` and in the same
+        format, instead of being returned.
+    columns : list[str] | None
+        Which columns to read, besides `interpolation_column` and `group_column`.
+        By default all columns are read.
+    chunk_size : int
+        How many input rows are collected before they are resampled. Parquet files
+        are read by row group and IPC files by record batch, so a chunk can be
+        larger by up to one of those.
+    max_in_flight : int
+        How many chunks are resampled at the same time in a thread pool. At most
+        this many chunks, plus the one being read, are held in memory.
+    methods : dict[str, str] | None
+        The interpolation method per column, see `resample_dataframe_polars`.
+    low_memory : bool
+        Whether to resample unsorted groups one column at a time, see
+        `resample_dataframe_polars`.
+    max_gap : float | datetime.timedelta | None
+        Leaves gaps larger than this unbridged, see `resample_dataframe_polars`.
+    dtype_policy : str
+        `"preserve"` or `"compact"` dtypes of the resampled columns, see
+        `resample_dataframe_polars`. IPC files in `sink` extend the dictionary of
+        every categorical column from batch to batch, so polars reads them back
+        within a `pl.StringCache`.
+    to_log : bool
+        Whether or not to show additional logging info.
+
+    Returns
+    -------
+    pl.DataFrame | None
+        The same as `resample_dataframe_grouped_polars` would return for the whole
+        dataset, or `None` if the result was written to `sink`.
+
+    Info
+    -------
+    IPC files are memory mapped, so their record batches are read without copying
+    them, and Parquet files are read one row group at a time with only the needed
+    columns. The last group of a chunk may continue in the next chunk, so its rows
+    are carried over and resampled together with the next chunk. A group is
+    written to the output file of the input file that holds its last rows, and no
+    output is written for input files in which no group ends.
+    """
+    if max_in_flight < 1 or chunk_size < 1:
+        raise ValueError("`max_in_flight` and `chunk_size` must be positive.")
+    root, paths = _find_partitions(source)
+    if columns is not None:
+        columns = list(dict.fromkeys([interpolation_column, group_column, *columns]))
+
+    def resample(df: pl.DataFrame) -> pl.DataFrame:
+        return resample_dataframe_grouped_polars(
+            df,
+            interpolation_column=interpolation_column,
+            interpolation_step=interpolation_step,
+            group_column=group_column,
+            methods=methods,
+            low_memory=low_memory,
+            max_gap=max_gap,
+            dtype_policy=dtype_policy,
+        )
+
+    # Categorical columns of different chunks need the same string cache to be
+    # concatenated or written to the same file.
+    with pl.StringCache(), _Writers(root, sink) as writers:
+        chunks = _iter_chunks(paths, group_column, columns, chunk_size)
+        in_flight: collections.deque[tuple[Path, Future]] = collections.deque()
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            for path, df in chunks:
+                if len(in_flight) == max_in_flight:
+                    writers.add(*_result(in_flight.popleft()))
+                in_flight.append((path, pool.submit(resample, df)))
+            while in_flight:
+                writers.add(*_result(in_flight.popleft()))
+
+    if to_log:
+        logger.info(
+            f"Resampled {len(paths)} partitions to {writers.n_rows} rows "
+            f"in {writers.n_chunks} chunks."
+        )
+    return writers.collect()
+
+
+def _result(item: tuple[Path, Future]) -> tuple[Path, pl.DataFrame]:
+    """Waits for the result of a resampled chunk."""
+    path, future = item
+    return path, future.result()
+
+
+def _find_partitions(
+    source: str | Path | list[str | Path],
+) -> tuple[Path | None, list[Path]]:
+    """The directory of the dataset, if any, and its files in order."""
+    if isinstance(source, (str, Path)) and Path(source).is_dir():
+        root = Path(source)
+        paths = sorted(p for p in root.rglob("*") if p.suffix in FORMATS)
+    else:
+        root = None
+        sources = [source] if isinstance(source, (str, Path)) else source
+        paths = [Path(p) for p in sources]
+    for path in paths:
+        if path.suffix not in FORMATS:
+            raise ValueError(
+                f"Cannot read {path}, use one of {', '.join(FORMATS)} files."
+            )
+    if not paths:
+        raise ValueError(f"There are no files to resample in {source}.")
+    return root, paths
+
+
+def _iter_chunks(
+    paths: list[Path],
+    group_column: str,
+    columns: list[str] | None,
+    chunk_size: int,
+) -> Iterator[tuple[Path, pl.DataFrame]]:
+    """Yields chunks of complete groups and the file that holds their last rows.
+
+    The pieces of the last group read so far are carried over until rows of a
+    different group, or the end of the dataset, are read. Pieces are only
+    concatenated once they are yielded, see `_Chunker`.
+    """
+    chunker = _Chunker(group_column)
+    for path in paths:
+        for piece in _iter_pieces(path, group_column, columns):
+            is_new_file = chunker.current_path not in (None, path)
+            if is_new_file and not chunker.continues(piece):
+                # The carried group ended in the previous file.
+                chunker.finish_group()
+                yield from chunker.flush()
+            chunker.add(path, piece)
+            if chunker.n_rows >= chunk_size:
+                yield from chunker.flush()
+        # All but the last group of a file are complete at its end.
+        yield from chunker.flush()
+    chunker.finish_group()
+    yield from chunker.flush()
+
+
+class _Chunker:
+    """Collects the pieces of complete groups, and those of the last group so far.
+
+    Concatenating every piece onto the rows read before would copy a large group
+    once per piece, so the pieces are kept in lists until they are yielded.
+    """
+
+    def __init__(self, group_column: str) -> None:
+        self.group_column = group_column
+        self.n_rows = 0
+        self.current_path: Path | None = None
+        self._complete: list[pl.DataFrame] = []
+        self._complete_path: Path | None = None
+        self._current: list[pl.DataFrame] = []
+        self._finished: set = set()
+
+    def continues(self, piece: pl.DataFrame) -> bool:
+        """Whether `piece` starts with the last group read so far."""
+        if not self._current:
+            return False
+        last = self._current[-1][self.group_column][-1]
+        return piece[self.group_column][0] == last
+
+    def add(self, path: Path, piece: pl.DataFrame) -> None:
+        """Adds the rows of a piece, of which only the last group may go on."""
+        is_last = piece.select(_is_last_group(piece, self.group_column)).to_series()
+        n_complete = len(piece) - is_last.sum()
+        if n_complete == 0 and self.continues(piece):
+            self._current.append(piece)
+        else:
+            self.finish_group()
+            if n_complete > 0:
+                self._complete.append(piece.filter(~is_last))
+                self._complete_path = path
+                piece = piece.filter(is_last)
+            self._current = [piece]
+        self.current_path = path
+        self.n_rows += len(is_last)
+
+    def finish_group(self) -> None:
+        """Marks the last group read so far as complete."""
+        if self._current:
+            self._complete.extend(self._current)
+            self._complete_path = self.current_path
+            self._current = []
+
+    def flush(self) -> Iterator[tuple[Path, pl.DataFrame]]:
+        """Yields all complete groups as one chunk, if there are any."""
+        if not self._complete:
+            return
+        df = pl.concat(self._complete)
+        self._complete = []
+        self.n_rows -= len(df)
+        yield _checked(self._complete_path, df, self.group_column, self._finished)
+
+
+def _is_last_group(df: pl.DataFrame, group_column: str) -> pl.Expr:
+    """Whether a row belongs to the same group as the last row of `df`."""
+    last = df[group_column][-1]
+    if last is None:
+        return pl.col(group_column).is_null()
+    return (pl.col(group_column) == last).fill_null(False)
+
+
+def _checked(
+    path: Path, df: pl.DataFrame, group_column: str, finished: set
+) -> tuple[Path, pl.DataFrame]:
+    """Raises a `ValueError` if `df` continues a group of an earlier chunk."""
+    groups = set(df[group_column].unique().to_list())
+    if not groups.isdisjoint(finished):
+        raise ValueError(
+            f"The rows of the groups {sorted(groups & finished, key=str)} in "
+            f"{group_column!r} do not follow each other in the dataset."
+        )
+    finished |= groups
+    return path, df
+
+
+def _iter_pieces(
+    path: Path, group_column: str, columns: list[str] | None
+) -> Iterator[pl.DataFrame]:
+    """Reads a file by Parquet row group or IPC record batch."""
+    group = _hive_group(path, group_column)
+    if FORMATS[path.suffix] == "parquet":
+        file = pq.ParquetFile(path, memory_map=True)
+        batches = (
+            file.read_row_group(i, columns=_present(columns, file.schema_arrow))
+            for i in range(file.num_row_groups)
+        )
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        batches = (
+            reader.get_batch(i).select(_present(columns, reader.schema))
+            if columns is not None
+            else reader.get_batch(i)
+            for i in range(reader.num_record_batches)
+        )
+    for batch in batches:
+        df = pl.from_arrow(batch)
+        if group_column not in df.columns:
+            if group is None:
+                raise ValueError(f"{path} has no column {group_column!r}.")
+            df = df.with_columns(pl.lit(group).alias(group_column))
+        if len(df) > 0:
+            yield df
+
+
+def _present(columns: list[str] | None, schema: pa.Schema) -> list[str] | None:
+    """The columns that are stored in a file, leaving out hive partition keys."""
+    if columns is None:
+        return None
+    return [c for c in columns if c in schema.names]
+
+
+def _hive_group(path: Path, group_column: str) -> str | None:
+    """The value of a `{group_column}=value` directory in `path`, if any."""
+    for part in reversed(path.parent.parts):
+        key, _, value = part.partition("=")
+        if key == group_column and value:
+            return value
+    return None
+
+
+class _Writers:
+    """Writes resampled chunks to the output file of their input file.
+
+    Chunks arrive in the order of the input files, so only one file is open at a
+    time. Without a sink, the chunks are kept to be concatenated instead.
+    """
+
+    def __init__(self, root: Path | None, sink: str | Path | None) -> None:
+        self.root = root
+        self.sink = None if sink is None else Path(sink)
+        self.chunks: list[pl.DataFrame] = []
+        self.n_rows = 0
+        self.n_chunks = 0
+        self._path: Path | None = None
+        self._writer: pq.ParquetWriter | pa.ipc.RecordBatchFileWriter | None = None
+        # The dictionary of every categorical column of the open IPC file.
+        self._dictionaries: dict[str, pa.Array] = {}
+
+    def __enter__(self) -> "_Writers":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self._close()
+
+    def add(self, path: Path, df: pl.DataFrame) -> None:
+        """Writes or keeps one resampled chunk of the input file `path`."""
+        self.n_rows += len(df)
+        self.n_chunks += 1
+        if self.sink is None:
+            self.chunks.append(df)
+            return
+
+        table = df.to_arrow()
+        if path != self._path:
+            self._close()
+            self._path = path
+            output = self.sink / (
+                path.relative_to(self.root) if self.root is not None else path.name
+            )
+            output.parent.mkdir(parents=True, exist_ok=True)
+            if FORMATS[path.suffix] == "parquet":
+                self._writer = pq.ParquetWriter(output, table.schema)
+            else:
+                options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+                self._writer = pa.ipc.new_file(
+                    str(output), table.schema, options=options
+                )
+        if isinstance(self._writer, pa.ipc.RecordBatchFileWriter):
+            table = _share_dictionaries(table, self._dictionaries)
+        self._writer.write_table(table)
+
+    def collect(self) -> pl.DataFrame | None:
+        """The concatenated chunks, or `None` if they were written to the sink."""
+        if self.sink is not None:
+            return None
+        return pl.concat(self.chunks)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._dictionaries = {}
+
+
+def _share_dictionaries(table: pa.Table, dictionaries: dict[str, pa.Array]) -> pa.Table:
+    """Recodes the categorical columns of `table` to grow `dictionaries`.
+
+    Polars exports only the categories that a chunk uses, but an IPC file only
+    allows a dictionary to be extended by later batches, not replaced.
+    """
+    columns = []
+    for field, column in zip(table.schema, table.columns, strict=True):
+        if pa.types.is_dictionary(field.type):
+            column = column.combine_chunks()
+            dictionary = dictionaries.get(field.name, column.dictionary[:0])
+            new = column.dictionary.filter(
+                pc.invert(pc.is_in(column.dictionary, dictionary))
+            )
+            dictionary = dictionaries[field.name] = pa.concat_arrays([dictionary, new])
+            positions = pc.index_in(column.dictionary, dictionary)
+            column = pa.DictionaryArray.from_arrays(
+                positions.take(column.indices).cast(field.type.index_type),
+                dictionary,
+            )
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=table.schema)
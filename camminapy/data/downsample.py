@@ -0,0 +1,362 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from camminapy.data.resample import _GROUP_KEY, _from_pandas, _to_pandas
+from camminapy.utils.logger import logger
+from camminapy.utils.metrics import stage
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Aggregations that can be chosen per column.
+AGGREGATIONS = ("mean", "median", "min", "max", "sum", "first", "last", "count")
+
+# Aggregations that only work on numeric columns.
+NUMERIC_AGGREGATIONS = ("mean", "median", "sum")
+
+# Name of the temporary column that numbers the bins.
+_BIN = "__camminapy_bin__"
+
+
+def downsample_dataframe_polars(
+    df: pl.DataFrame,
+    interpolation_column: str,
+    interpolation_step: float,
+    aggregations: dict[str, str | list[str]] | None = None,
+    to_log: bool = False,
+) -> pl.DataFrame:
+    """Downsamples a dataframe by aggregating all rows within bins.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        The dataframe to downsample. Its rows don't need to be sorted.
+    interpolation_column : str
+        Which numeric column to bin.
+    interpolation_step : float
+        Width of the bins. The bins start at the smallest value of
+        `interpolation_column`, like the interpolation points of
+        `resample_dataframe_polars`.
+    aggregations : dict[str, str | list[str]] | None
+        The aggregation per column, one of `"mean"`, `"median"`, `"min"`, `"max"`,
+        `"sum"`, `"first"`, `"last"` or `"count"`. For a list of aggregations, the
+        column is replaced by one column per aggregation named
+        `{column}_{aggregation}`. Columns that are not listed use `"mean"` if they
+        are numeric and `"last"` otherwise.
+    to_log : bool
+        Whether or not to show additional logging info.
+
+    Returns
+    -------
+    pl.DataFrame
+        One row per bin that contains at least one row, sorted by
+        `interpolation_column`, which holds the start of the bin.
+
+    Info
+    -------
+    Unlike `resample_dataframe_polars`, this summarizes every row instead of
+    picking values at interpolation points, so it does not alias if
+    `interpolation_step` is much larger than the spacing of the data. Rows that are
+    sorted by `interpolation_column` are binned in a single pass, other rows are
+    sorted first, so `"first"` and `"last"` always follow `interpolation_column`.
+    Rows without a value in `interpolation_column` are dropped.
+    """
+    df_downsampled = _downsample(
+        df.with_columns(pl.lit(0, dtype=pl.UInt32).alias(_GROUP_KEY)),
+        interpolation_column,
+        interpolation_step,
+        aggregations,
+    )
+
+    if to_log:
+        n_input = len(df)
+        n_output = len(df_downsampled)
+        logger.info(f"Downsampled from {n_input} rows to {n_output} rows.")
+
+    return df_downsampled
+
+
+def _downsample(
+    df_keyed: pl.DataFrame,
+    interpolation_column: str,
+    interpolation_step: float,
+    aggregations: dict[str, str | list[str]] | None,
+    key_columns: tuple[str, ...] = (),
+) -> pl.DataFrame:
+    """Aggregates the rows of every group of `_GROUP_KEY` in bins.
+
+    The bin edges are the same values as the interpolation points of
+    `_interpolation_grid`, i.e. `origin + i * delta` with
+    `delta = (origin + step) - origin`.
+    """
+    _check_aggregations(df_keyed, interpolation_column, aggregations, key_columns)
+    with stage("sort", rows_in=len(df_keyed)) as current:
+        df_sorted = df_keyed.filter(pl.col(interpolation_column).is_not_null()).pipe(
+            _sort_within_groups, interpolation_column
+        )
+        current.rows_out = len(df_sorted)
+    with stage("bin", rows_in=len(df_sorted)):
+        bin_start, run = _bin(
+            df_sorted[_GROUP_KEY].to_numpy(),
+            df_sorted[interpolation_column].to_numpy(),
+            interpolation_step,
+        )
+
+    outputs = [pl.col(interpolation_column).first()]
+    for column, dtype in df_sorted.schema.items():
+        if column in (interpolation_column, _GROUP_KEY):
+            continue
+        if column in key_columns:
+            outputs.append(pl.col(column).first())
+        else:
+            outputs.extend(_aggregate(column, dtype, (aggregations or {}).get(column)))
+    with stage("aggregate", rows_in=len(df_sorted)) as current:
+        df_downsampled = (
+            df_sorted.with_columns(
+                pl.Series(interpolation_column, bin_start),
+                pl.Series(_BIN, run).set_sorted(),
+            )
+            .groupby(_BIN)
+            .agg(outputs)
+            .sort(_BIN)
+            .drop(_BIN)
+        )
+        current.rows_out = len(df_downsampled)
+    return df_downsampled
+
+
+def _bin(
+    key: np.ndarray, x: np.ndarray, interpolation_step: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """The start of the bin of every row, and the bins numbered consecutively.
+
+    The rows must be sorted by `key` and then by `x`.
+    """
+    if x.dtype.kind in "iu" and isinstance(interpolation_step, (int, np.integer)):
+        x = x.astype(np.int64, copy=False)
+    else:
+        x = x.astype(np.float64, copy=False)
+
+    # The first row of every group holds its smallest value, where the bins start.
+    group_start = np.flatnonzero(_is_new_run(key))
+    origin = x[group_start]
+    if len(group_start) > 1:
+        origin = np.repeat(origin, np.diff(np.r_[group_start, len(x)]))
+    delta = (origin + interpolation_step) - origin
+    bin_index = np.floor((x - origin) / delta).astype(np.int64)
+    # The division can round to a neighbouring bin, which the bin edges correct.
+    bin_index += origin + (bin_index + 1) * delta <= x
+    bin_index -= origin + bin_index * delta > x
+
+    # The rows of every bin are next to each other, so numbering the runs of rows
+    # gives a sorted key that polars can group on without hashing.
+    is_new_bin = _is_new_run(key) | _is_new_run(bin_index)
+    return origin + bin_index * delta, np.cumsum(is_new_bin)
+
+
+def _is_new_run(values: np.ndarray) -> np.ndarray:
+    """Whether every value differs from the previous one."""
+    is_new = np.ones(len(values), dtype=bool)
+    is_new[1:] = values[1:] != values[:-1]
+    return is_new
+
+
+def _sort_within_groups(
+    df_keyed: pl.DataFrame, interpolation_column: str
+) -> pl.DataFrame:
+    """Stably sorts the rows by `_GROUP_KEY` and then `interpolation_column`."""
+    key = df_keyed[_GROUP_KEY].to_numpy()
+    x = df_keyed[interpolation_column].to_numpy()
+    is_sorted = (key[1:] > key[:-1]) | ((key[1:] == key[:-1]) & (x[1:] >= x[:-1]))
+    if is_sorted.all():
+        return df_keyed
+    return df_keyed[np.lexsort((x, key))]
+
+
+def _aggregate(
+    column: str, dtype: pl.PolarsDataType, how: str | list[str] | None
+) -> list[pl.Expr]:
+    """The aggregation expressions of one column."""
+    if how is None:
+        how = "mean" if _is_numeric(dtype) else "last"
+    if isinstance(how, str):
+        return [getattr(pl.col(column), how)()]
+    return [getattr(pl.col(column), h)().alias(f"{column}_{h}") for h in how]
+
+
+def _check_aggregations(
+    df: pl.DataFrame,
+    interpolation_column: str,
+    aggregations: dict[str, str | list[str]] | None,
+    key_columns: tuple[str, ...],
+) -> None:
+    """Raises a `ValueError` if `aggregations` don't fit the columns of `df`."""
+    for column, how in (aggregations or {}).items():
+        if column not in df.columns or column in (interpolation_column, *key_columns):
+            raise ValueError(f"Cannot choose an aggregation for {column!r}.")
+        for h in [how] if isinstance(how, str) else how:
+            if h not in AGGREGATIONS:
+                raise ValueError(
+                    f"Unknown aggregation {h!r} for {column!r}, "
+                    f"use one of {AGGREGATIONS}."
+                )
+            if h in NUMERIC_AGGREGATIONS and not _is_numeric(df.schema[column]):
+                raise ValueError(
+                    f"Cannot aggregate {column!r} of type {df.schema[column]} by "
+                    f"{h!r}, which needs a numeric column."
+                )
+
+
+def _is_numeric(dtype: pl.PolarsDataType) -> bool:
+    """Whether a column of this type can be averaged and summed."""
+    return dtype in pl.INTEGER_DTYPES | pl.FLOAT_DTYPES
+
+
+#######################################################################################
+#                       Everything below is just wrappers.                            #
+#######################################################################################
+
+
+def downsample_dataframe_grouped_polars(
+    df: pl.DataFrame,
+    interpolation_column: str,
+    interpolation_step: float,
+    group_column: str,
+    aggregations: dict[str, str | list[str]] | None = None,
+    to_log: bool = False,
+) -> pl.DataFrame:
+    """Groupwise downsamples a dataframe by aggregating all rows within bins.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        The dataframe to downsample. Its rows don't need to be sorted.
+    interpolation_column : str
+        Which numeric column to bin.
+    interpolation_step : float
+        Width of the bins, which start at the smallest value of
+        `interpolation_column` in each group.
+    group_column : str
+        The column over which to group
+    aggregations : dict[str, str | list[str]] | None
+        The aggregation per column, see `downsample_dataframe_polars`.
+    to_log : bool
+        Whether or not to show additional logging info.
+
+    Returns
+    -------
+    pl.DataFrame
+        One row per bin of every group, with the groups in order of first
+        appearance, see `downsample_dataframe_polars`.
+    """
+    df_keyed = df.with_row_count(_GROUP_KEY).with_columns(
+        pl.col(_GROUP_KEY).min().over(group_column)
+    )
+    df_downsampled = _downsample(
+        df_keyed,
+        interpolation_column,
+        interpolation_step,
+        aggregations,
+        key_columns=(group_column,),
+    )
+
+    if to_log:
+        n_input = len(df)
+        n_output = len(df_downsampled)
+        logger.info(f"Downsampled groups from {n_input} rows to {n_output} rows.")
+
+    return df_downsampled
+
+
+def downsample_dataframe_pandas(
+    df: "pd.DataFrame",
+    interpolation_column: str,
+    interpolation_step: float,
+    aggregations: dict[str, str | list[str]] | None = None,
+    to_log: bool = False,
+    dtype_backend: str = "numpy",
+) -> "pd.DataFrame":
+    """Downsamples a dataframe by aggregating all rows within bins.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe to downsample.
+    interpolation_column : str
+        Which numeric column to bin.
+    interpolation_step : float
+        Width of the bins.
+    aggregations : dict[str, str | list[str]] | None
+        The aggregation per column, see `downsample_dataframe_polars`.
+    to_log : bool
+        Whether or not to show additional logging info.
+    dtype_backend : str
+        Either `"numpy"` or `"pyarrow"`, see `resample_dataframe_pandas`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per bin, see `downsample_dataframe_polars`.
+
+    Info
+    -------
+    This is a wrapper that just calls `downsample_dataframe_polars`.
+    """
+    df_downsampled = downsample_dataframe_polars(
+        df=_from_pandas(df),
+        interpolation_column=interpolation_column,
+        interpolation_step=interpolation_step,
+        aggregations=aggregations,
+        to_log=to_log,
+    )
+    return _to_pandas(df_downsampled, dtype_backend)
+
+
+def downsample_dataframe_grouped_pandas(
+    df: "pd.DataFrame",
+    interpolation_column: str,
+    interpolation_step: float,
+    group_column: str,
+    aggregations: dict[str, str | list[str]] | None = None,
+    to_log: bool = False,
+    dtype_backend: str = "numpy",
+) -> "pd.DataFrame":
+    """Groupwise downsamples a dataframe by aggregating all rows within bins.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe to downsample.
+    interpolation_column : str
+        Which numeric column to bin.
+    interpolation_step : float
+        Width of the bins.
+    group_column : str
+        The column over which to group
+    aggregations : dict[str, str | list[str]] | None
+        The aggregation per column, see `downsample_dataframe_polars`.
+    to_log : bool
+        Whether or not to show additional logging info.
+    dtype_backend : str
+        Either `"numpy"` or `"pyarrow"`, see `resample_dataframe_pandas`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per bin of every group, see `downsample_dataframe_grouped_polars`.
+
+    Info
+    -------
+    This is a wrapper that just calls `downsample_dataframe_grouped_polars`.
+    """
+    df_downsampled = downsample_dataframe_grouped_polars(
+        df=_from_pandas(df),
+        interpolation_column=interpolation_column,
+        interpolation_step=interpolation_step,
+        group_column=group_column,
+        aggregations=aggregations,
+        to_log=to_log,
+    )
+    return _to_pandas(df_downsampled, dtype_backend)
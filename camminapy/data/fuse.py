@@ -0,0 +1,427 @@
+import collections
+import datetime
+from typing import TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from camminapy.data.downsample import _sort_within_groups
+from camminapy.data.kernel import bracket, nearest
+from camminapy.data.plan import Plan
+from camminapy.data.resample import (
+    _GROUP_KEY,
+    _check_methods,
+    _explicit_grid,
+    _from_pandas,
+    _from_physical,
+    _interpolation_grid,
+    _physical_distance,
+    _points_from_pandas,
+    _resample_column,
+    _supports_sorted_path,
+    _take,
+    _to_pandas,
+    _to_physical,
+)
+from camminapy.utils.logger import logger
+from camminapy.utils.metrics import stage
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def fuse_dataframes_polars(
+    sources: list[pl.DataFrame],
+    interpolation_column: str,
+    interpolation_step: float | datetime.timedelta | None,
+    group_column: str | None = None,
+    methods: dict[str, str] | None = None,
+    tolerance: float
+    | datetime.timedelta
+    | dict[str, float | datetime.timedelta]
+    | None = None,
+    interpolation_points: "pl.Series | np.ndarray | None" = None,
+    to_log: bool = False,
+) -> pl.DataFrame:
+    """Resamples several independently sampled dataframes onto one common grid.
+
+    Parameters
+    ----------
+    sources : list[pl.DataFrame]
+        The dataframes to fuse, e.g. heart rate, power and GPS recordings. All of
+        them contain `interpolation_column` (and `group_column`), every other
+        column name may only appear in one of them. Their rows don't need to be
+        sorted, but must not contain duplicated values of `interpolation_column`
+        within a group or missing numeric values.
+    interpolation_column : str
+        Which numeric or temporal column to use for the interpolation points.
+    interpolation_step : float | datetime.timedelta | None
+        Steps of the common interpolation points, which start at the smallest value
+        of `interpolation_column` over all sources (per group), see
+        `resample_dataframe_polars`. `None` if `interpolation_points` are given
+        instead.
+    group_column : str | None
+        If given, the sources are fused separately for every group of this
+        column, in order of first appearance over all sources.
+    methods : dict[str, str] | None
+        The interpolation method per column, see `resample_dataframe_polars`.
+        Numeric columns that are not listed are interpolated linearly, string
+        columns take the value of the last row at or before every point, like a
+        backward asof join.
+    tolerance : float | datetime.timedelta | dict[str, float | datetime.timedelta]
+        How far the input rows that a value is computed from may lie from the
+        interpolation point, for all columns or per column. Values that need rows
+        further away are missing. By default, there is no limit.
+    interpolation_points : pl.Series | np.ndarray | None
+        Explicit common interpolation points, see `resample_dataframe_polars`.
+    to_log : bool
+        Whether or not to show additional logging info.
+
+    Returns
+    -------
+    pl.DataFrame
+        `interpolation_column`, `group_column` and the other columns of all
+        sources in order, with one row per interpolation point. A source has
+        missing values at points outside of its own range (in that group), as it
+        is not extrapolated.
+
+    Info
+    -------
+    This gives the same values as resampling every source onto the same
+    `interpolation_points` with `resample_dataframe_polars` and outer joining the
+    results, but sorts every source only once (if at all) and locates all
+    interpolation points in it with a single vectorized binary search, instead of
+    repeated joins over the whole grid.
+    """
+    dtype = _check_sources(sources, interpolation_column, group_column, methods)
+    if isinstance(tolerance, dict):
+        tolerances = tolerance
+    else:
+        tolerances = {c: tolerance for s in sources for c in s.columns}
+    # The sources themselves are converted to physical values as they are sorted.
+    df_axis = pl.DataFrame({interpolation_column: pl.Series([], dtype=dtype)})
+    _, step, points = _to_physical(
+        df_axis, interpolation_column, interpolation_step, interpolation_points
+    )
+
+    with stage("sort", rows_in=sum(len(s) for s in sources)):
+        df_groups, sorted_sources = _sort_sources(
+            sources, interpolation_column, group_column
+        )
+    n_groups = len(df_groups)
+
+    with stage("grid", rows_in=sum(len(s) for s in sorted_sources)) as current:
+        grid, group_index = _common_grid(
+            sorted_sources, interpolation_column, n_groups, step, points
+        )
+        current.rows_out = len(grid)
+
+    columns = [pl.Series(interpolation_column, grid)]
+    if group_column is not None:
+        columns.append(df_groups[group_column].take(group_index))
+    with stage("interpolate", rows_in=len(grid)) as current:
+        for df_sorted in sorted_sources:
+            tolerances_physical = {
+                column: _physical_distance(value, dtype)
+                for column, value in tolerances.items()
+                if value is not None and column in df_sorted.columns
+            }
+            columns.extend(
+                _fuse_source(
+                    df_sorted,
+                    interpolation_column,
+                    grid,
+                    group_index,
+                    n_groups,
+                    methods or {},
+                    tolerances_physical,
+                )
+            )
+        current.rows_out = len(grid)
+    df_fused = _from_physical(pl.DataFrame(columns), interpolation_column, dtype)
+
+    if to_log:
+        n_input = sum(len(s) for s in sources)
+        n_output = len(df_fused)
+        logger.info(
+            f"Fused {len(sources)} sources from {n_input} rows to {n_output} rows."
+        )
+
+    return df_fused
+
+
+def _check_sources(
+    sources: list[pl.DataFrame],
+    interpolation_column: str,
+    group_column: str | None,
+    methods: dict[str, str] | None,
+) -> pl.PolarsDataType:
+    """Raises a `ValueError` if the sources can't be fused, or returns the dtype.
+
+    The methods themselves are checked per source by `_check_methods`.
+    """
+    if len(sources) == 0:
+        raise ValueError("Pass at least one source to fuse.")
+    for df in sources:
+        for column in [interpolation_column, group_column]:
+            if column is not None and column not in df.columns:
+                raise ValueError(f"Every source needs a column {column!r}.")
+        _check_dtypes(df, interpolation_column, group_column)
+
+    counts = collections.Counter(
+        column
+        for df in sources
+        for column in df.columns
+        if column not in (interpolation_column, group_column)
+    )
+    duplicated = sorted(column for column, count in counts.items() if count > 1)
+    if duplicated:
+        raise ValueError(f"Columns {duplicated} appear in several sources.")
+    for column in methods or {}:
+        if column not in counts:
+            raise ValueError(f"Cannot choose an interpolation method for {column!r}.")
+
+    dtypes = {df.schema[interpolation_column] for df in sources}
+    if len(dtypes) > 1:
+        raise ValueError(
+            f"`{interpolation_column}` must have the same dtype in all sources, "
+            f"not {sorted(map(str, dtypes))}."
+        )
+    return dtypes.pop()
+
+
+def _check_dtypes(
+    df: pl.DataFrame, interpolation_column: str, group_column: str | None
+) -> None:
+    """Raises a `ValueError` for columns that `_resample_column` can't interpolate."""
+    numeric = pl.INTEGER_DTYPES | pl.FLOAT_DTYPES
+    for column, dtype in df.schema.items():
+        if column == group_column:
+            continue
+        if column == interpolation_column:
+            # A union of the groups would not match time zones any more.
+            is_supported = dtype in numeric or dtype in pl.TEMPORAL_DTYPES
+        else:
+            is_supported = dtype in numeric | {pl.Utf8, pl.Categorical}
+        if not is_supported:
+            raise ValueError(f"Cannot fuse column {column!r} of type {dtype}.")
+
+
+def _sort_sources(
+    sources: list[pl.DataFrame],
+    interpolation_column: str,
+    group_column: str | None,
+) -> tuple[pl.DataFrame, list[pl.DataFrame]]:
+    """Numbers the groups over all sources and sorts every source by them.
+
+    Returns the groups in order of first appearance, and every source with
+    `_GROUP_KEY` as the position of its group, sorted by `_GROUP_KEY` and then
+    `interpolation_column`, with `interpolation_column` as integers if it is
+    temporal (see `_to_physical`).
+    """
+    if group_column is None:
+        df_groups = pl.DataFrame({_GROUP_KEY: [0]}, schema={_GROUP_KEY: pl.UInt32})
+    else:
+        df_groups = (
+            pl.concat([df.select(group_column) for df in sources])
+            .unique(maintain_order=True)
+            .with_row_count(_GROUP_KEY)
+        )
+
+    sorted_sources = []
+    for df in sources:
+        df_physical = df.filter(pl.col(interpolation_column).is_not_null())
+        if df.schema[interpolation_column] in pl.TEMPORAL_DTYPES:
+            df_physical = df_physical.with_columns(
+                pl.col(interpolation_column).to_physical().cast(pl.Int64)
+            )
+        if group_column is None:
+            df_keyed = df_physical.with_columns(
+                pl.lit(0, dtype=pl.UInt32).alias(_GROUP_KEY)
+            )
+        else:
+            df_keyed = df_physical.join(df_groups, on=group_column, how="left").drop(
+                group_column
+            )
+        df_sorted = _sort_within_groups(df_keyed, interpolation_column)
+
+        key = df_sorted[_GROUP_KEY].to_numpy()
+        row_start = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])[: len(key)]
+        row_stop = np.r_[row_start[1:], len(key)]
+        if not _supports_sorted_path(
+            df_sorted.drop(_GROUP_KEY), interpolation_column, row_start, row_stop
+        ):
+            raise ValueError(
+                f"Sources must not contain duplicated values of "
+                f"`{interpolation_column}` within a group or missing numeric values."
+            )
+        sorted_sources.append(df_sorted)
+    return df_groups, sorted_sources
+
+
+def _row_ranges(df_sorted: pl.DataFrame, n_groups: int) -> tuple[np.ndarray, ...]:
+    """The first and one past the last row of every group of a sorted source."""
+    key = df_sorted[_GROUP_KEY].to_numpy()
+    groups = np.arange(n_groups)
+    return np.searchsorted(key, groups, "left"), np.searchsorted(key, groups, "right")
+
+
+def _common_grid(
+    sorted_sources: list[pl.DataFrame],
+    interpolation_column: str,
+    n_groups: int,
+    interpolation_step: float | None,
+    points: np.ndarray | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """The interpolation points between the smallest and largest value per group.
+
+    `interpolation_step` and `points` are in physical values, see `_to_physical`.
+    """
+    xs = [df[interpolation_column].to_numpy() for df in sorted_sources]
+    start = np.zeros(n_groups, dtype=np.result_type(*xs))
+    stop = np.zeros(n_groups, dtype=start.dtype)
+    seen = np.zeros(n_groups, dtype=bool)
+    for df_sorted, x in zip(sorted_sources, xs, strict=True):
+        row_start, row_stop = _row_ranges(df_sorted, n_groups)
+        has_rows = row_stop > row_start
+        first = has_rows & ~seen
+        both = has_rows & seen
+        start[first] = x[row_start[first]]
+        stop[first] = x[row_stop[first] - 1]
+        start[both] = np.minimum(start[both], x[row_start[both]])
+        stop[both] = np.maximum(stop[both], x[row_stop[both] - 1])
+        seen |= has_rows
+
+    if points is None:
+        grid, group_index = _interpolation_grid(
+            start[seen], stop[seen], interpolation_step
+        )
+    else:
+        grid, group_index = _explicit_grid(points, start[seen], stop[seen])
+    # Groups whose rows all miss `interpolation_column` have no points.
+    return grid, np.flatnonzero(seen)[group_index]
+
+
+def _fuse_source(
+    df_sorted: pl.DataFrame,
+    interpolation_column: str,
+    grid: np.ndarray,
+    group_index: np.ndarray,
+    n_groups: int,
+    methods: dict[str, str],
+    tolerances: dict[str, float],
+) -> list[pl.Series]:
+    """Resamples the columns of one sorted source onto the common grid."""
+    x = df_sorted[interpolation_column].to_numpy()
+    row_start, row_stop = _row_ranges(df_sorted, n_groups)
+
+    # Only points within the range of the group in this source can be resampled.
+    inside = (row_stop > row_start)[group_index]
+    if inside.any():
+        point_group = group_index[inside]
+        inside[inside] = (grid[inside] >= x[row_start[point_group]]) & (
+            grid[inside] <= x[row_stop[point_group] - 1]
+        )
+    points = grid[inside]
+    point_group = group_index[inside]
+    brackets = bracket(x, points, row_start[point_group], row_stop[point_group])
+    plan = Plan(grid=points, group_index=point_group, brackets=brackets)
+    position = np.full(len(grid), -1)
+    position[inside] = np.arange(len(points))
+
+    source_methods = {
+        column: methods[column] for column in df_sorted.columns if column in methods
+    }
+    _check_methods(df_sorted, interpolation_column, source_methods, is_sorted=True)
+    columns = []
+    for column, dtype in df_sorted.schema.items():
+        if column in (interpolation_column, _GROUP_KEY):
+            continue
+        method = source_methods.get(column)
+        if method is None:
+            method = "previous" if dtype in (pl.Utf8, pl.Categorical) else "linear"
+        values = _resample_column(
+            df_sorted[column], method, x, plan, row_start, row_stop
+        )
+        rows = position
+        if column in tolerances:
+            rows = position.copy()
+            distance = _distance(method, x, points, plan)
+            rows[inside] = np.where(distance <= tolerances[column], rows[inside], -1)
+        columns.append(_take(values, rows))
+    return columns
+
+
+def _distance(method: str, x: np.ndarray, points: np.ndarray, plan: Plan) -> np.ndarray:
+    """How far the rows that `method` uses lie from every interpolation point."""
+    brackets = plan.brackets
+    if method == "previous":
+        return points - x[brackets.left]
+    if method == "nearest":
+        return np.abs(x[nearest(x, points, brackets)] - points)
+    return np.maximum(points - x[brackets.left], x[brackets.right] - points)
+
+
+#######################################################################################
+#                       Everything below is just wrappers.                            #
+#######################################################################################
+
+
+def fuse_dataframes_pandas(
+    sources: list["pd.DataFrame"],
+    interpolation_column: str,
+    interpolation_step: float | datetime.timedelta | None,
+    group_column: str | None = None,
+    methods: dict[str, str] | None = None,
+    tolerance: float
+    | datetime.timedelta
+    | dict[str, float | datetime.timedelta]
+    | None = None,
+    interpolation_points: "pd.Series | np.ndarray | None" = None,
+    to_log: bool = False,
+    dtype_backend: str = "numpy",
+) -> "pd.DataFrame":
+    """Resamples several independently sampled dataframes onto one common grid.
+
+    Parameters
+    ----------
+    sources : list[pd.DataFrame]
+        The dataframes to fuse, see `fuse_dataframes_polars`.
+    interpolation_column : str
+        Which numeric or temporal column to use for the interpolation points.
+    interpolation_step : float | datetime.timedelta | None
+        Steps of the common interpolation points, see `fuse_dataframes_polars`.
+    group_column : str | None
+        If given, the sources are fused separately for every group of this column.
+    methods : dict[str, str] | None
+        The interpolation method per column, see `fuse_dataframes_polars`.
+    tolerance : float | datetime.timedelta | dict[str, float | datetime.timedelta]
+        How far the input rows may lie from the interpolation points, see
+        `fuse_dataframes_polars`.
+    interpolation_points : pd.Series | np.ndarray | None
+        Explicit common interpolation points, see `resample_dataframe_polars`.
+    to_log : bool
+        Whether or not to show additional logging info.
+    dtype_backend : str
+        Either `"numpy"` or `"pyarrow"`, see `resample_dataframe_pandas`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per interpolation point, see `fuse_dataframes_polars`.
+
+    Info
+    -------
+    This is a wrapper that just calls `fuse_dataframes_polars`.
+    """
+    df_fused = fuse_dataframes_polars(
+        sources=[_from_pandas(df) for df in sources],
+        interpolation_column=interpolation_column,
+        interpolation_step=interpolation_step,
+        group_column=group_column,
+        methods=methods,
+        tolerance=tolerance,
+        interpolation_points=_points_from_pandas(interpolation_points),
+        to_log=to_log,
+    )
+    return _to_pandas(df_fused, dtype_backend)
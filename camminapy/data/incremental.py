@@ -0,0 +1,99 @@
+import numpy as np
+import polars as pl
+import polars.selectors as cs
+
+from camminapy.data.resample import _resample_sorted, _supports_sorted_path
+from camminapy.utils.logger import logger
+
+
+class Resampler:
+    """Resamples rows that arrive in order of `interpolation_column`, bit by bit.
+
+    Every call to `append` returns the interpolation points that became available
+    with the new rows. Concatenating everything `append` returned is identical to
+    calling `resample_dataframe_polars` once on all rows that were appended.
+
+    Only the last input row, the last output row and the first value of
+    `interpolation_column` (where the interpolation points are anchored) are kept
+    between calls, so the cost of each call only depends on the number of new rows.
+    Use a `pl.StringCache` if the rows contain categorical columns.
+    """
+
+    def __init__(
+        self,
+        interpolation_column: str,
+        interpolation_step: float,
+        to_log: bool = False,
+    ):
+        self.interpolation_column = interpolation_column
+        self.interpolation_step = interpolation_step
+        self.to_log = to_log
+        self._origin: np.ndarray | None = None
+        self._last_input_row: pl.DataFrame | None = None
+        self._last_output_row: pl.DataFrame | None = None
+
+    def append(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Adds new rows and returns the newly completed interpolation points.
+
+        Parameters
+        ----------
+        df : pl.DataFrame
+            The new rows. They must be sorted by `interpolation_column`, come after
+            all previous rows, and must not contain missing numeric values.
+
+        Returns
+        -------
+        pl.DataFrame
+            The resampled data at all interpolation points up to the last new row
+            that were not returned before.
+        """
+        n_input = len(df)
+        if self._last_input_row is None:
+            if len(df) == 0:
+                return df
+            self._origin = np.array([df[0, self.interpolation_column]])
+        else:
+            df = pl.concat([self._last_input_row, df])
+
+        row_start = np.array([0])
+        row_stop = np.array([len(df)])
+        if not _supports_sorted_path(
+            df, self.interpolation_column, row_start, row_stop
+        ):
+            raise ValueError(
+                f"Rows must be strictly sorted by `{self.interpolation_column}` and "
+                "continue after the previous rows, without missing numeric values."
+            )
+        df_resampled = _resample_sorted(
+            df,
+            self.interpolation_column,
+            self.interpolation_step,
+            row_start,
+            row_stop,
+            origin=self._origin,
+        )
+
+        if self._last_input_row is not None:
+            # Everything up to the previous last row has been returned already.
+            df_resampled = df_resampled.filter(
+                pl.col(self.interpolation_column)
+                > self._last_input_row[0, self.interpolation_column]
+            )
+        if self._last_output_row is not None:
+            # String columns are forward filled across calls.
+            df_resampled = (
+                pl.concat([self._last_output_row, df_resampled])
+                .with_columns(
+                    cs.string(include_categorical=True).fill_null(strategy="forward")
+                )
+                .slice(1)
+            )
+
+        if self.to_log:
+            n_output = len(df_resampled)
+            logger.info(f"Resampled {n_input} new rows to {n_output} rows.")
+
+        self._last_input_row = df[-1:]
+        if len(df_resampled) > 0:
+            self._last_output_row = df_resampled[-1:]
+        return df_resampled
@@ -0,0 +1,266 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class Brackets:
+    """Position of every interpolation point relative to the input rows.
+
+    Point `i` lies between the input rows `left[i]` and `right[i]`, as the
+    `rank[i]`-th of `steps[i] - 1` points in that gap. Points that coincide with an
+    input row have `left == right` and `rank == 0`.
+    """
+
+    left: np.ndarray
+    right: np.ndarray
+    rank: np.ndarray
+    steps: np.ndarray
+
+    @property
+    def exact(self) -> np.ndarray:
+        """Whether an interpolation point coincides with an input row."""
+        return self.left == self.right
+
+    @property
+    def weight(self) -> np.ndarray:
+        """The relative position of every point between its two input rows."""
+        return self.rank / self.steps
+
+
+def searchsorted_grouped(
+    x: np.ndarray,
+    points: np.ndarray,
+    row_start: np.ndarray,
+    row_stop: np.ndarray,
+) -> np.ndarray:
+    """Vectorized `np.searchsorted(..., side="right")` within row ranges.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Values that are sorted within every range `row_start[i]:row_stop[i]`.
+    points : np.ndarray
+        The values to look up.
+    row_start : np.ndarray
+        First row of the range to search in, one per point.
+    row_stop : np.ndarray
+        One past the last row of the range to search in, one per point.
+
+    Returns
+    -------
+    np.ndarray
+        For every point, the first row in its range whose value is larger.
+    """
+    if len(x) > 0 and (row_start == 0).all() and (row_stop == len(x)).all():
+        return np.searchsorted(x, points, side="right")
+
+    # A plain binary search that advances all points at once, which takes
+    # log2(longest range) iterations of vectorized numpy operations.
+    lo = row_start.astype(np.int64)
+    hi = row_stop.astype(np.int64)
+    active = np.flatnonzero(lo < hi)
+    while len(active) > 0:
+        mid = (lo[active] + hi[active]) // 2
+        go_right = x[mid] <= points[active]
+        lo[active] = np.where(go_right, mid + 1, lo[active])
+        hi[active] = np.where(go_right, hi[active], mid)
+        active = active[lo[active] < hi[active]]
+    return lo
+
+
+def bracket(
+    x: np.ndarray,
+    points: np.ndarray,
+    row_start: np.ndarray,
+    row_stop: np.ndarray,
+) -> Brackets:
+    """Brackets interpolation points by the rows of a sorted input.
+
+    The brackets reproduce what `resample_dataframe_polars` has always done: the
+    interpolation points are merged into the input rows and every gap is filled
+    linearly by position. A point that is the `j`-th of `k` points falling
+    strictly between two consecutive input rows therefore gets `rank == j` and
+    `steps == k + 1`, no matter how far apart the points are.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Values of the interpolation column, strictly increasing within every
+        range `row_start[i]:row_stop[i]`.
+    points : np.ndarray
+        The interpolation points, sorted within every range and lying between the
+        smallest and largest value of their range.
+    row_start : np.ndarray
+        First row of the range each point belongs to.
+    row_stop : np.ndarray
+        One past the last row of the range each point belongs to.
+
+    Returns
+    -------
+    Brackets
+        Indices into `x` and weights for every interpolation point.
+    """
+    left = searchsorted_grouped(x, points, row_start, row_stop) - 1
+    exact = x[left] == points
+    right = np.where(exact, left, left + 1)
+
+    # Points between the same two input rows form a run. The rank within the run
+    # and the length of the run give the position within the gap.
+    rank = np.zeros(len(points), dtype=np.int64)
+    steps = np.ones(len(points), dtype=np.int64)
+    between = np.flatnonzero(~exact)
+    if len(between) > 0:
+        run_left = left[between]
+        run_start = np.flatnonzero(np.r_[True, run_left[1:] != run_left[:-1]])
+        run_length = np.diff(np.r_[run_start, len(between)])
+        rank[between] = np.arange(len(between)) - np.repeat(run_start, run_length) + 1
+        steps[between] = np.repeat(run_length, run_length) + 1
+
+    return Brackets(left=left, right=right, rank=rank, steps=steps)
+
+
+def blend(values: np.ndarray, brackets: Brackets) -> np.ndarray:
+    """Linearly interpolates `values` at the bracketed points.
+
+    The arithmetic is done in the dtype of `values` and in the same order as
+    `pl.Series.interpolate`, so that the results are identical to what polars
+    computes when the interpolation points are merged into the input.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The input values, one per row of the bracketed interpolation column.
+    brackets : Brackets
+        The output of `bracket`.
+
+    Returns
+    -------
+    np.ndarray
+        The values at the interpolation points.
+    """
+    result = values[brackets.left]
+    between = np.flatnonzero(~brackets.exact)
+    if len(between) == 0:
+        return result
+
+    dtype = values.dtype
+    low = values[brackets.left[between]]
+    high = values[brackets.right[between]]
+    rank = brackets.rank[between].astype(dtype)
+    steps = brackets.steps[between].astype(dtype)
+    with np.errstate(all="ignore"):
+        if dtype.kind == "i":
+            # Integer division that truncates towards zero.
+            numerator = rank * (high - low)
+            quotient = numerator // steps
+            quotient += (numerator % steps != 0) & (numerator < 0)
+            result[between] = low + quotient
+        else:
+            # Polars interpolates decreasing stretches from the high end.
+            divide = np.floor_divide if dtype.kind == "u" else np.true_divide
+            increasing = high >= low
+            result[between] = np.where(
+                increasing,
+                low + divide(rank * (high - low), steps).astype(dtype, copy=False),
+                high
+                + divide((steps - rank) * (low - high), steps).astype(
+                    dtype, copy=False
+                ),
+            )
+    return result
+
+
+def in_gap(x: np.ndarray, brackets: Brackets, max_gap: float) -> np.ndarray:
+    """Whether every bracketed point lies between two rows more than `max_gap` apart.
+
+    Points that coincide with an input row never lie in a gap.
+    """
+    return ~brackets.exact & (x[brackets.right] - x[brackets.left] > max_gap)
+
+
+def nearest(x: np.ndarray, points: np.ndarray, brackets: Brackets) -> np.ndarray:
+    """The row closest to every bracketed point, the left one on ties."""
+    closer_to_left = points - x[brackets.left] <= x[brackets.right] - points
+    return np.where(closer_to_left, brackets.left, brackets.right)
+
+
+def cubic(
+    x: np.ndarray,
+    values: np.ndarray,
+    points: np.ndarray,
+    brackets: Brackets,
+    row_start: np.ndarray,
+    row_stop: np.ndarray,
+) -> np.ndarray:
+    """Cubic Hermite interpolation of `values` at the bracketed points.
+
+    The slope at every input row is the finite difference between its two
+    neighbours (one-sided at the first and last row of a range), so only the two
+    rows next to each gap are needed besides the two rows that bracket a point.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The bracketed interpolation column.
+    values : np.ndarray
+        The input values, one per row of `x`.
+    points : np.ndarray
+        The interpolation points.
+    brackets : Brackets
+        The output of `bracket` for `points`.
+    row_start : np.ndarray
+        First row of the range each point belongs to.
+    row_stop : np.ndarray
+        One past the last row of the range each point belongs to.
+
+    Returns
+    -------
+    np.ndarray
+        The interpolated values as floats.
+    """
+    x = x.astype(np.float64, copy=False)
+    values = values.astype(np.result_type(values.dtype, np.float32), copy=False)
+    result = values[brackets.left]
+    between = np.flatnonzero(~brackets.exact)
+    if len(between) == 0:
+        return result
+
+    left = brackets.left[between]
+    right = brackets.right[between]
+    before = np.maximum(left - 1, row_start[between])
+    after = np.minimum(right + 1, row_stop[between] - 1)
+    width = x[right] - x[left]
+    slope_left = (values[right] - values[before]) / (x[right] - x[before])
+    slope_right = (values[after] - values[left]) / (x[after] - x[left])
+
+    t = (points[between] - x[left]) / width
+    result[between] = (
+        (2 * t**3 - 3 * t**2 + 1) * values[left]
+        + (t**3 - 2 * t**2 + t) * width * slope_left
+        + (-2 * t**3 + 3 * t**2) * values[right]
+        + (t**3 - t**2) * width * slope_right
+    )
+    return result
+
+
+def fill_forward(valid: np.ndarray, group_index: np.ndarray) -> np.ndarray:
+    """For every point, the last valid point up to it within the same group.
+
+    Parameters
+    ----------
+    valid : np.ndarray
+        Which points carry a value.
+    group_index : np.ndarray
+        The group of every point, with the points of a group next to each other.
+
+    Returns
+    -------
+    np.ndarray
+        Position of the last valid point of the same group, or `-1` if there is
+        none.
+    """
+    last = np.maximum.accumulate(np.where(valid, np.arange(len(valid)), -1))
+    found = last >= 0
+    found[found] = group_index[last[found]] == group_index[found]
+    return np.where(found, last, -1)
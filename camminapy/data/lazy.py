@@ -0,0 +1,210 @@
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+from camminapy.data.dataset import _iter_chunks
+from camminapy.data.incremental import Resampler
+from camminapy.data.resample import resample_dataframe_grouped_polars
+
+# Temporary column that orders the groups by their first appearance.
+_RANK = "__camminapy_rank__"
+
+
+def resample_lazyframe_polars(
+    lf: pl.LazyFrame,
+    interpolation_column: str,
+    interpolation_step: float,
+    sink: str | Path | None = None,
+    chunk_size: int = 1_000_000,
+    columns: list[str] | None = None,
+    temp_dir: str | Path | None = None,
+    to_log: bool = False,
+) -> pl.DataFrame | None:
+    """Resamples a lazyframe chunk by chunk to obtain data at interpolation points.
+
+    Parameters
+    ----------
+    lf : pl.LazyFrame
+        The lazyframe to interpolate, e.g. from `pl.scan_parquet`. Its rows must
+        be sorted by `interpolation_column`, and it must not contain missing
+        values in numeric columns.
+    interpolation_column : str
+        Which numeric column to use for the interpolation points.
+    interpolation_step : float
+        Steps for the newly create interpolation points
+    sink : str | Path | None
+        If given, the result is written to this parquet file, one row group per
+        chunk, instead of being returned.
+    chunk_size : int
+        How many input rows are read into memory at once.
+    columns : list[str] | None
+        Which columns to read besides `interpolation_column`. Defaults to all.
+    temp_dir : str | Path | None
+        Where the lazyframe is spilled to, see Info. Defaults to the temporary
+        directory of `tempfile`.
+    to_log : bool
+        Whether or not to show additional logging info.
+
+    Returns
+    -------
+    pl.DataFrame | None
+        The same as `resample_dataframe_polars` would return for the collected
+        lazyframe, or `None` if the result was written to `sink`.
+
+    Info
+    -------
+    The lazyframe is evaluated once, by the streaming engine of polars where it
+    can, and spilled to a temporary IPC file, which is then read back one record
+    batch at a time. Only the selected columns are read from the source.
+    """
+    lf = _project(lf, [interpolation_column], columns)
+    with pl.StringCache(), tempfile.TemporaryDirectory(dir=temp_dir) as directory:
+        path = Path(directory) / "spill.arrow"
+        _spill(lf, path)
+        resampler = Resampler(interpolation_column, interpolation_step, to_log=to_log)
+        chunks = (resampler.append(df) for df in _iter_batches(path, chunk_size))
+        return _collect_or_write(chunks, sink)
+
+
+def resample_lazyframe_grouped_polars(
+    lf: pl.LazyFrame,
+    interpolation_column: str,
+    interpolation_step: float,
+    group_column: str,
+    sink: str | Path | None = None,
+    chunk_size: int = 1_000_000,
+    columns: list[str] | None = None,
+    temp_dir: str | Path | None = None,
+    to_log: bool = False,
+) -> pl.DataFrame | None:
+    """Groupwise resamples a lazyframe a few groups at a time.
+
+    Parameters
+    ----------
+    lf : pl.LazyFrame
+        The lazyframe to interpolate, e.g. from `pl.scan_parquet`.
+    interpolation_column : str
+        Which numeric column to use for the interpolation points.
+    interpolation_step : float
+        Steps for the newly create interpolation points
+    group_column : str
+        The column over which to group
+    sink : str | Path | None
+        If given, the result is written to this parquet file, one row group per
+        chunk of groups, instead of being returned.
+    chunk_size : int
+        How many input rows are read into memory at once. A chunk always holds
+        complete groups, so it grows beyond `chunk_size` for larger groups.
+    columns : list[str] | None
+        Which columns to read besides `interpolation_column` and `group_column`.
+        Defaults to all.
+    temp_dir : str | Path | None
+        Where the lazyframe is spilled to, see Info. Defaults to the temporary
+        directory of `tempfile`.
+    to_log : bool
+        Whether or not to show additional logging info.
+
+    Returns
+    -------
+    pl.DataFrame | None
+        The same as `resample_dataframe_grouped_polars` would return for the
+        collected lazyframe, or `None` if the result was written to `sink`.
+
+    Info
+    -------
+    The source is scanned twice: once for the groups, and once to sort its rows
+    by group, in order of their first appearance, and `interpolation_column`.
+    The sorted rows are spilled to a temporary IPC file by the streaming engine
+    of polars, which sorts out of core, and read back one record batch at a time.
+    Only the selected columns are read from the source. If `group_column` has
+    missing values, the rows are sorted in memory instead.
+    """
+    lf = _project(lf, [interpolation_column, group_column], columns)
+    with pl.StringCache(), tempfile.TemporaryDirectory(dir=temp_dir) as directory:
+        ranks = (
+            lf.select(pl.col(group_column).unique(maintain_order=True))
+            .collect()
+            .with_row_count(_RANK)
+        )
+        lf_sorted = lf.join(ranks.lazy(), on=group_column, how="left")
+        null_rank = ranks.filter(pl.col(group_column).is_null())[_RANK]
+        if len(null_rank) > 0:
+            # Missing keys never match in a join.
+            lf_sorted = lf_sorted.with_columns(pl.col(_RANK).fill_null(null_rank[0]))
+        lf_sorted = lf_sorted.sort([_RANK, interpolation_column]).drop(_RANK)
+        path = Path(directory) / "spill.arrow"
+        # The streaming engine of polars mixes up the rows of missing join keys.
+        _spill(lf_sorted, path, streaming=len(null_rank) == 0)
+        chunks = (
+            resample_dataframe_grouped_polars(
+                df,
+                interpolation_column=interpolation_column,
+                interpolation_step=interpolation_step,
+                group_column=group_column,
+                to_log=to_log,
+            )
+            for _, df in _iter_chunks([path], group_column, None, chunk_size)
+        )
+        return _collect_or_write(chunks, sink)
+
+
+def _project(
+    lf: pl.LazyFrame, required: list[str], columns: list[str] | None
+) -> pl.LazyFrame:
+    """Selects the required and the requested columns, in their original order."""
+    if columns is None:
+        return lf
+    keep = set(required) | set(columns)
+    return lf.select([c for c in lf.columns if c in keep])
+
+
+def _spill(lf: pl.LazyFrame, path: Path, streaming: bool = True) -> None:
+    """Evaluates a lazyframe into an IPC file, streaming it if polars can."""
+    plan = lf.explain(streaming=streaming, common_subplan_elimination=False)
+    if streaming and plan.lstrip().startswith("--- PIPELINE"):
+        lf.sink_ipc(path)
+    else:
+        # `sink_ipc` panics on plans that the streaming engine cannot run.
+        lf.collect(streaming=streaming).write_ipc(path)
+
+
+def _iter_batches(path: Path, chunk_size: int) -> Iterator[pl.DataFrame]:
+    """Reads the record batches of an IPC file, about `chunk_size` rows at once."""
+    reader = pa.ipc.open_file(pa.memory_map(str(path)))
+    batches: list[pa.RecordBatch] = []
+    n_rows = 0
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        batches.append(batch)
+        n_rows += batch.num_rows
+        if n_rows >= chunk_size:
+            yield pl.from_arrow(pa.Table.from_batches(batches))
+            batches, n_rows = [], 0
+    if n_rows > 0:
+        yield pl.from_arrow(pa.Table.from_batches(batches))
+
+
+def _collect_or_write(
+    chunks: Iterator[pl.DataFrame],
+    sink: str | Path | None,
+) -> pl.DataFrame | None:
+    """Concatenates the chunks, or appends them to a parquet file one by one."""
+    if sink is None:
+        return pl.concat(list(chunks))
+
+    writer = None
+    try:
+        for df in chunks:
+            table = df.to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return None
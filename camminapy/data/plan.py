@@ -0,0 +1,140 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from camminapy.data.kernel import Brackets
+
+
+@dataclass
+class Plan:
+    """Everything needed to resample any column of one interpolation axis.
+
+    `grid` holds the interpolation points, `group_index` the group each point
+    belongs to, and `brackets` where each point lies among the input rows.
+    """
+
+    grid: np.ndarray
+    group_index: np.ndarray
+    brackets: Brackets
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays of the plan."""
+        return sum(array.nbytes for array in self._arrays())
+
+    def _arrays(self) -> list[np.ndarray]:
+        return [
+            self.grid,
+            self.group_index,
+            self.brackets.left,
+            self.brackets.right,
+            self.brackets.rank,
+            self.brackets.steps,
+        ]
+
+
+class PlanCache:
+    """A least recently used cache of interpolation plans with a memory cap.
+
+    Pass the same cache to repeated resample calls on the same interpolation
+    column, e.g. for other columns of the same recording or for a reprocessing
+    run. The interpolation points and brackets are then only computed once, and
+    every further call just gathers and blends the values of the other columns.
+
+    Plans are keyed on a hash of the values of `interpolation_column`, the group
+    boundaries and `interpolation_step` (or the explicit interpolation points).
+    Hashing the column is a single pass over its memory and much cheaper than
+    building the plan. The cache is safe to share between threads.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Least recently used plans are evicted once the plans in the cache take
+        more memory than this. Plans larger than `max_bytes` are not cached.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._plans: OrderedDict[bytes, Plan] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """The number of cached plans."""
+        return len(self._plans)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by all cached plans."""
+        return self._nbytes
+
+    def clear(self) -> None:
+        """Removes all plans from the cache."""
+        with self._lock:
+            self._plans.clear()
+            self._nbytes = 0
+
+    def get(
+        self,
+        x: np.ndarray,
+        interpolation_step: float,
+        row_start: np.ndarray,
+        row_stop: np.ndarray,
+        origin: np.ndarray | None,
+        build: Callable[[], Plan],
+        points: np.ndarray | None = None,
+    ) -> Plan:
+        """Returns the cached plan for this axis, or builds and caches it."""
+        key = _fingerprint(x, interpolation_step, row_start, row_stop, origin, points)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        plan = build()
+        for array in plan._arrays():
+            # Cached arrays end up in many results, so nobody may change them.
+            array.flags.writeable = False
+        if plan.nbytes > self.max_bytes:
+            return plan
+
+        with self._lock:
+            if key not in self._plans:
+                self._plans[key] = plan
+                self._nbytes += plan.nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._plans.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+        return plan
+
+
+def _fingerprint(
+    x: np.ndarray,
+    interpolation_step: float,
+    row_start: np.ndarray,
+    row_stop: np.ndarray,
+    origin: np.ndarray | None,
+    points: np.ndarray | None = None,
+) -> bytes:
+    """Hashes everything that determines a plan."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(
+        f"{type(interpolation_step).__name__}:{interpolation_step!r}".encode()
+    )
+    for array in [x, row_start, row_stop, origin, points]:
+        if array is None:
+            digest.update(b"None")
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data)
+    return digest.digest()
@@ -1,16 +1,274 @@
+import contextvars
+import datetime
+import functools
+import io
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
 import polars as pl
 import polars.selectors as cs
 
+from camminapy.data.kernel import (
+    blend,
+    bracket,
+    cubic,
+    fill_forward,
+    in_gap,
+    nearest,
+)
+from camminapy.data.plan import Plan, PlanCache
 from camminapy.utils.logger import logger
+from camminapy.utils.metrics import stage
+
+if TYPE_CHECKING:
+    # Polars imports pandas itself when converting, which keeps it out of the
+    # import time of this module.
+    import pandas as pd
+
+# Name of the temporary column that identifies groups during grouped resampling.
+_GROUP_KEY = "__camminapy_group__"
+
+# Names of the temporary columns that number the input and the merged rows in
+# low-memory mode.
+_ROW = "__camminapy_row__"
+_MERGED_ROW = "__camminapy_merged_row__"
+
+# Name of the temporary column that flags interpolation points in gaps.
+_GAP = "__camminapy_gap__"
+
+# Interpolation methods that can be chosen per column.
+METHODS = ("linear", "nearest", "previous", "cubic")
+
+# How the dtypes of the resampled columns are chosen.
+DTYPE_POLICIES = ("preserve", "compact")
+
+# The casts of the `"compact"` dtype policy.
+_COMPACT_DTYPES = {pl.Float64: pl.Float32, pl.Utf8: pl.Categorical}
+
+# The dtypes that `"compact"` casts before resampling already. Floats are only cast
+# in the result, so that they are interpolated with 64 bits.
+_COMPACT_INPUT_DTYPES = [pl.Utf8]
+
+# Nanoseconds per unit of the integer representation of temporal columns.
+_NANOSECONDS = {"ns": 1, "us": 10**3, "ms": 10**6, "d": 86_400 * 10**9}
+
+
+def _interpolation_grid(
+    start: np.ndarray,
+    stop: np.ndarray,
+    step: float,
+    origin: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Builds the interpolation points for many groups at once.
+
+    For each group this returns exactly the same values as
+    `np.arange(origin, stop + step, step)` restricted to values between `start`
+    and `stop`.
+
+    Parameters
+    ----------
+    start : np.ndarray
+        The smallest value of the interpolation column per group.
+    stop : np.ndarray
+        The largest value of the interpolation column per group.
+    step : float
+        Steps for the newly create interpolation points
+    origin : np.ndarray | None
+        Where the interpolation points of each group are anchored. Defaults to
+        `start`, but can be smaller if only part of a group is resampled.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The concatenated interpolation points of all groups and, for each point,
+        the position of the group it belongs to.
+    """
+    if np.asarray(start).dtype.kind in "iu" and isinstance(step, (int, np.integer)):
+        dtype = np.dtype(np.int64)
+    else:
+        dtype = np.dtype(np.float64)
+    start = np.asarray(start).astype(dtype)
+    stop = np.asarray(stop).astype(dtype)
+    origin = start if origin is None else np.asarray(origin).astype(dtype)
+
+    # Same length and fill rule as `np.arange`: the values are
+    # `origin + i * delta` with `delta = (origin + step) - origin`.
+    delta = (origin + step) - origin
+    first = np.maximum(np.ceil((start - origin) / delta), 0).astype(np.int64)
+    first -= (first > 0) & (origin + (first - 1) * delta >= start)
+    first += origin + first * delta < start
+    length = np.ceil((stop + step - origin) / step).astype(np.int64) - first
+    length = np.maximum(length, 0)
+
+    group_index = np.repeat(np.arange(len(start)), length)
+    offset = np.arange(length.sum()) - np.repeat(np.cumsum(length) - length, length)
+    grid = origin[group_index] + (first[group_index] + offset) * delta[group_index]
+
+    keep = grid <= stop[group_index]
+    return grid[keep], group_index[keep]
+
+
+def _explicit_grid(
+    points: np.ndarray,
+    start: np.ndarray,
+    stop: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Selects the given interpolation points for many groups at once.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Sorted interpolation points without duplicates.
+    start : np.ndarray
+        The smallest value of the interpolation column per group.
+    stop : np.ndarray
+        The largest value of the interpolation column per group.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The points between `start` and `stop` of every group, concatenated, and
+        for each point the position of the group it belongs to, like
+        `_interpolation_grid`.
+    """
+    first = np.searchsorted(points, start, side="left")
+    length = np.maximum(np.searchsorted(points, stop, side="right") - first, 0)
+    group_index = np.repeat(np.arange(len(start)), length)
+    offset = np.arange(length.sum()) - np.repeat(np.cumsum(length) - length, length)
+    return points[first[group_index] + offset], group_index
+
+
+def _to_physical(
+    df: pl.DataFrame,
+    interpolation_column: str,
+    interpolation_step: float | datetime.timedelta | None,
+    interpolation_points: "pl.Series | np.ndarray | None",
+) -> tuple[pl.DataFrame, float | None, np.ndarray | None]:
+    """Brings the interpolation axis into the form that the resampling works on.
+
+    A temporal `interpolation_column` is replaced by its integer representation
+    (e.g. microseconds since the epoch for `pl.Datetime("us")`) and the step is
+    converted to the same unit, so that the interpolation points are computed in
+    exact integer arithmetic. Explicit interpolation points are cast to the dtype
+    of `interpolation_column`, which must not round them, sorted and deduplicated.
+    """
+    if (interpolation_step is None) == (interpolation_points is None):
+        raise ValueError(
+            "Pass exactly one of `interpolation_step` and `interpolation_points`."
+        )
+    dtype = df.schema[interpolation_column]
+    is_temporal = dtype in pl.TEMPORAL_DTYPES
+    if is_temporal:
+        df = df.with_columns(pl.col(interpolation_column).to_physical().cast(pl.Int64))
+        if interpolation_step is not None:
+            interpolation_step = _physical_step(interpolation_step, dtype)
+
+    if interpolation_points is None:
+        return df, interpolation_step, None
+    points = pl.Series(interpolation_points)
+    points_cast = points.cast(dtype)
+    if not points_cast.cast(points.dtype).series_equal(points, null_equal=True):
+        raise ValueError(
+            f"The interpolation points can't be cast to the {dtype} of "
+            f"`{interpolation_column}` without rounding them."
+        )
+    points = points_cast
+    if is_temporal:
+        points = points.to_physical().cast(pl.Int64)
+    return df, None, points.drop_nulls().unique().sort().to_numpy()
+
+
+def _physical_step(
+    interpolation_step: float | datetime.timedelta, dtype: pl.PolarsDataType
+) -> int:
+    """Converts a step to the unit of the integer representation of `dtype`."""
+    if isinstance(interpolation_step, (int, np.integer)):
+        return interpolation_step
+    if hasattr(interpolation_step, "to_timedelta64"):
+        # Keeps the nanoseconds of a `pd.Timedelta`.
+        interpolation_step = interpolation_step.to_timedelta64()
+    if not isinstance(interpolation_step, (datetime.timedelta, np.timedelta64)):
+        raise ValueError(
+            f"A {dtype} interpolation column needs a timedelta or integer step, "
+            f"not {interpolation_step!r}."
+        )
+    nanoseconds = int(
+        np.timedelta64(interpolation_step).astype("timedelta64[ns]").astype(np.int64)
+    )
+    unit = _NANOSECONDS["d" if dtype == pl.Date else getattr(dtype, "time_unit", "ns")]
+    if nanoseconds % unit != 0 or nanoseconds <= 0:
+        raise ValueError(
+            f"The step {interpolation_step!r} is not a positive multiple of the "
+            f"resolution of the {dtype} interpolation column."
+        )
+    return nanoseconds // unit
+
+
+def _physical_distance(
+    distance: float | datetime.timedelta, dtype: pl.PolarsDataType
+) -> float:
+    """Converts a distance to the unit of the interpolation column."""
+    if dtype in pl.TEMPORAL_DTYPES:
+        return _physical_step(distance, dtype)
+    return distance
+
+
+def _apply_dtype_policy(
+    df: pl.DataFrame,
+    dtype_policy: str,
+    keep: list[str],
+    dtypes: list[pl.PolarsDataType] | None = None,
+) -> pl.DataFrame:
+    """Casts the columns of `df` other than `keep` as `dtype_policy` asks for.
+
+    `"compact"` casts 64-bit floats to 32-bit floats and strings to categoricals.
+    If `dtypes` are given, only columns of those dtypes are cast.
+    """
+    if dtype_policy not in DTYPE_POLICIES:
+        raise ValueError(
+            f"Unknown dtype_policy {dtype_policy!r}, use one of {DTYPE_POLICIES}."
+        )
+    if dtype_policy == "preserve":
+        return df
+    return df.with_columns(
+        [
+            pl.col(column).cast(_COMPACT_DTYPES[dtype])
+            for column, dtype in df.schema.items()
+            if column not in keep
+            and dtype in _COMPACT_DTYPES
+            and (dtypes is None or dtype in dtypes)
+        ]
+    )
+
+
+def _from_physical(
+    df_resampled: pl.DataFrame, interpolation_column: str, dtype: pl.PolarsDataType
+) -> pl.DataFrame:
+    """Reverts `_to_physical` for the resampled interpolation column.
+
+    Float columns other than 64-bit ones are cast back as well, as the
+    interpolation points are computed with 64 bits.
+    """
+    if dtype not in pl.TEMPORAL_DTYPES and dtype not in pl.FLOAT_DTYPES:
+        return df_resampled
+    return df_resampled.with_columns(pl.col(interpolation_column).cast(dtype))
 
 
 def resample_dataframe_polars(
     df: pl.DataFrame,
     interpolation_column: str,
-    interpolation_step: float,
+    interpolation_step: float | datetime.timedelta | None,
     to_log: bool = False,
+    plan_cache: PlanCache | None = None,
+    methods: dict[str, str] | None = None,
+    low_memory: bool = False,
+    interpolation_points: "pl.Series | np.ndarray | None" = None,
+    max_gap: float | datetime.timedelta | None = None,
+    dtype_policy: str = "preserve",
 ) -> pl.DataFrame:
     """Resamples a dataframe to obtain data at interpolation points.
 
@@ -19,11 +277,58 @@ def resample_dataframe_polars(
     df : pl.DataFrame
         The dataframe to interpolate.
     interpolation_column : str
-        Which numeric column to use for the interpolation points.
-    interpolation_step : float
-        Steps for the newly create interpolation points
+        Which numeric or temporal column to use for the interpolation points.
+    interpolation_step : float | datetime.timedelta | None
+        Steps for the newly create interpolation points. For a temporal
+        `interpolation_column`, a `datetime.timedelta` (or `np.timedelta64`,
+        `pd.Timedelta`) or an integer in the unit of the column. Integer and
+        temporal steps on integer and temporal columns are exact. `None` if
+        `interpolation_points` are given instead.
     to_log : bool
         Whether or not to show additional logging info.
+    plan_cache : PlanCache | None
+        If given, the interpolation points and their position among the input rows
+        are looked up in (and added to) this cache, so that repeated resamples of
+        the same interpolation column only gather and blend the other columns.
+        Only used for inputs that are sorted by `interpolation_column`.
+    methods : dict[str, str] | None
+        The interpolation method per column, one of `"linear"`, `"nearest"`,
+        `"previous"` (the last input row at or before an interpolation point) or
+        `"cubic"` (a cubic Hermite spline, which returns floats). String columns
+        can only use `"nearest"` or `"previous"`. Columns that are not listed are
+        interpolated linearly, or forward filled from the interpolation points
+        that coincide with an input row for string columns. Choosing methods
+        requires the rows to be sorted by `interpolation_column` without
+        duplicates or missing numeric values.
+    low_memory : bool
+        Whether to resample unsorted inputs one column at a time. This is slower,
+        but peak memory stays at about the size of the input plus the output,
+        whereas merging the interpolation points into all columns at once takes
+        several times the size of the input. Inputs that are sorted by
+        `interpolation_column` are always resampled one column at a time.
+    interpolation_points : pl.Series | np.ndarray | None
+        Explicit interpolation points instead of evenly spaced ones, e.g. a
+        timeline shared by many dataframes. They are cast to the dtype of
+        `interpolation_column`, sorted and deduplicated, and only points between
+        the smallest and largest value of `interpolation_column` are used. As
+        string columns only take values at points that coincide with an input row,
+        choose `"previous"` or `"nearest"` for them in `methods` instead.
+    max_gap : float | datetime.timedelta | None
+        If given, interpolation points between two input rows that are more than
+        `max_gap` apart in `interpolation_column` (e.g. a pause in a recording)
+        are missing in all other columns instead of bridging the gap, whatever
+        their interpolation method. String columns are not forward filled across
+        such gaps either. Interpolation points that coincide with an input row
+        always keep its values.
+    dtype_policy : str
+        `"preserve"` keeps the dtype of every column, except that `"cubic"`
+        returns 64-bit floats. `"compact"` returns 64-bit float columns as
+        32-bit floats, which are still interpolated with 64 bits, and string
+        columns as categoricals, which roughly halves the memory and file size of
+        typical results. Integer columns,
+        like those of quantized sensors, keep their dtype either way, and
+        `interpolation_column` is never cast. Concatenating the categoricals of
+        several results needs a `pl.StringCache`.
 
     Returns
     -------
@@ -33,41 +338,466 @@ def resample_dataframe_polars(
         data is interpolated onto that timeline.
         **Note**: This will **NOT** extrapolate.
     """
+    dtype = df.schema[interpolation_column]
+    df = _apply_dtype_policy(
+        df, dtype_policy, keep=[interpolation_column], dtypes=_COMPACT_INPUT_DTYPES
+    )
+    df_physical, interpolation_step, points = _to_physical(
+        df, interpolation_column, interpolation_step, interpolation_points
+    )
+    if max_gap is not None:
+        max_gap = _physical_distance(max_gap, dtype)
+    row_start = np.array([0])
+    row_stop = np.array([len(df)])
+    with stage("check", rows_in=len(df)):
+        is_sorted = _supports_sorted_path(
+            df_physical, interpolation_column, row_start, row_stop
+        )
+    if is_sorted:
+        df_resampled = _resample_sorted(
+            df_physical,
+            interpolation_column,
+            interpolation_step,
+            row_start,
+            row_stop,
+            plan_cache=plan_cache,
+            methods=_check_methods(df, interpolation_column, methods, is_sorted=True),
+            points=points,
+            max_gap=max_gap,
+        )
+    else:
+        _check_methods(df, interpolation_column, methods, is_sorted=False)
+        df_resampled = _resample_joined(
+            df_physical,
+            interpolation_column,
+            interpolation_step,
+            low_memory,
+            points,
+            max_gap,
+        )
+    df_resampled = _from_physical(df_resampled, interpolation_column, dtype)
+    df_resampled = _apply_dtype_policy(
+        df_resampled, dtype_policy, keep=[interpolation_column]
+    )
+
+    if to_log:
+        n_input = len(df)
+        n_output = len(df_resampled)
+        logger.info(f"Resampled from {n_input} rows to {n_output} rows.")
+
+    return df_resampled
+
+
+def _resample_joined(
+    df: pl.DataFrame,
+    interpolation_column: str,
+    interpolation_step: float | None,
+    low_memory: bool = False,
+    points: np.ndarray | None = None,
+    max_gap: float | None = None,
+) -> pl.DataFrame:
+    """Resamples a dataframe by joining the interpolation points onto it.
+
+    This works for any input, including unsorted rows, duplicated or missing values
+    in `interpolation_column` and missing data in the other columns. If `points`
+    are given, they are used instead of evenly spaced interpolation points. See
+    `_flag_gaps` for `max_gap`.
+    """
     # Get the x-values onto which we want to interpolate the data.
-    interpolation_points = pl.DataFrame(
-        {
-            interpolation_column: np.arange(
-                start=df.min()[0, interpolation_column],
-                stop=df.max()[0, interpolation_column] + interpolation_step,
-                step=interpolation_step,
+    with stage("grid", rows_in=len(df)) as current:
+        start = df[interpolation_column].min()
+        stop = df[interpolation_column].max()
+        if points is None:
+            grid = np.arange(
+                start=start, stop=stop + interpolation_step, step=interpolation_step
             )
-        }
-    ).filter(pl.col(interpolation_column) <= df.max()[0, interpolation_column])
+        else:
+            grid, _ = _explicit_grid(points, np.array([start]), np.array([stop]))
+        interpolation_points = pl.DataFrame({interpolation_column: grid}).filter(
+            pl.col(interpolation_column) <= stop
+        )
+        current.rows_out = len(interpolation_points)
+
+    if low_memory:
+        return _resample_by_column(
+            df, interpolation_points, [interpolation_column], max_gap
+        )
+    if max_gap is not None:
+        df = df.with_row_count(_ROW)
+
     # Add the new interpolation points to the input dataframe and interpolate the
     # data onto those new interpolation points.
-    df_with_data_at_additional_interpolation_points = (
-        interpolation_points.join(df, on=[interpolation_column], how="outer")
-        .sort(interpolation_column)
-        .interpolate()
-    )
+    with stage("outer_join", rows_in=len(df)) as current:
+        df_with_data_at_additional_interpolation_points = interpolation_points.join(
+            df, on=[interpolation_column], how="outer"
+        )
+        current.rows_out = len(df_with_data_at_additional_interpolation_points)
+    with stage("sort", rows_in=current.rows_out):
+        df_with_data_at_additional_interpolation_points = (
+            df_with_data_at_additional_interpolation_points.sort(interpolation_column)
+        )
+        if max_gap is not None:
+            df_with_data_at_additional_interpolation_points = _flag_gaps(
+                df_with_data_at_additional_interpolation_points,
+                [interpolation_column],
+                max_gap,
+            )
+    with stage("interpolate", rows_in=current.rows_out):
+        df_with_data_at_additional_interpolation_points = (
+            df_with_data_at_additional_interpolation_points.interpolate()
+        )
 
     # After interpolation, we now have data at the new nodes. What's left is
     # to only select those new interpolation nodes and the new data.
-    df_with_data_only_at_interpolation_points = interpolation_points.join(
-        df_with_data_at_additional_interpolation_points,
-        on=[interpolation_column],
-        how="left",
-    ).sort(interpolation_column)
-
-    if to_log:
-        n_input = len(df)
-        n_output = len(df_with_data_only_at_interpolation_points)
-        logger.info(f"Resampled from {n_input} rows to {n_output} rows.")
+    with stage("left_join", rows_in=current.rows_out) as current:
+        df_with_data_only_at_interpolation_points = interpolation_points.join(
+            df_with_data_at_additional_interpolation_points,
+            on=[interpolation_column],
+            how="left",
+        ).sort(interpolation_column)
+        current.rows_out = len(df_with_data_only_at_interpolation_points)
 
     # Forward fill string columns because interpolation does not
     # work on them. Only the first entry will be preserved and the others are none.
-    return df_with_data_only_at_interpolation_points.with_columns(
-        cs.string(include_categorical=True).fill_null(strategy="forward"),
+    with stage("forward_fill", rows_in=current.rows_out):
+        return _fill_strings(
+            df_with_data_only_at_interpolation_points, [interpolation_column]
+        )
+
+
+def _resample_by_column(
+    df: pl.DataFrame,
+    interpolation_points: pl.DataFrame,
+    on: list[str],
+    max_gap: float | None = None,
+) -> pl.DataFrame:
+    """Does the joins of `_resample_joined` one column at a time.
+
+    Only the columns `on` and the row numbers of `df` are merged with the
+    interpolation points. Every other column is then taken into the merged order,
+    interpolated and reduced to the interpolation points before the next one, so
+    that only one column of the merged rows is held at a time. If `on` contains
+    `_GROUP_KEY`, the columns are interpolated and filled within every group, as in
+    `_resample_grouped_joined`.
+    """
+    with stage("outer_join", rows_in=len(df)) as current:
+        df_merged = (
+            interpolation_points.join(
+                df.select(on).with_row_count(_ROW), on=on, how="outer"
+            )
+            .sort(on)
+            .with_row_count(_MERGED_ROW)
+        )
+        current.rows_out = len(df_merged)
+    with stage("left_join", rows_in=current.rows_out) as current:
+        df_selected = interpolation_points.join(df_merged, on=on, how="left").sort(on)
+        selected = df_selected[_MERGED_ROW]
+        df_selected = df_selected.select(on)
+        if max_gap is not None:
+            df_selected = df_selected.with_columns(
+                _flag_gaps(df_merged, on, max_gap)[_GAP].take(selected)
+            )
+        current.rows_out = len(df_selected)
+
+    columns = df_selected.select(on).get_columns()
+    with stage("interpolate", rows_in=len(df_merged)):
+        for column in df.columns:
+            if column in on:
+                continue
+            values = _interpolate_merged(
+                df[column].take(df_merged[_ROW]), df_merged, on
+            ).take(selected)
+            if max_gap is not None or values.dtype in (pl.Utf8, pl.Categorical):
+                values = _fill_strings(df_selected.with_columns(values), on)[column]
+            columns.append(values)
+    return pl.DataFrame(columns)
+
+
+def _interpolate_merged(
+    values: pl.Series, df_merged: pl.DataFrame, on: list[str]
+) -> pl.Series:
+    """Interpolates one column of the merged rows of `_resample_by_column`."""
+    if _GROUP_KEY not in on:
+        return values.interpolate()
+    if values.dtype in (pl.Utf8, pl.Categorical):
+        return values
+    return (
+        pl.DataFrame([df_merged[_GROUP_KEY], values])
+        .select(pl.col(values.name).interpolate().over(_GROUP_KEY))
+        .to_series()
+    )
+
+
+def _flag_gaps(df_merged: pl.DataFrame, on: list[str], max_gap: float) -> pl.DataFrame:
+    """Flags the merged rows that are interpolation points in a gap, in `_GAP`.
+
+    That is the case for interpolation points that don't coincide with an input row
+    (which have a value in `_ROW`), if the input rows right before and after them
+    are more than `max_gap` apart in the last column of `on`, like `in_gap` does for
+    the sorted path. If `on` contains `_GROUP_KEY`, only rows of the same group are
+    considered. `_ROW` is dropped.
+    """
+    is_input = pl.col(_ROW).is_not_null()
+    df_merged = df_merged.with_columns(
+        pl.when(is_input).then(pl.col(on[-1])).alias(_GAP)
+    )
+    previous_x = pl.col(_GAP).forward_fill()
+    next_x = pl.col(_GAP).backward_fill()
+    if _GROUP_KEY in on:
+        previous_x = previous_x.over(_GROUP_KEY)
+        next_x = next_x.over(_GROUP_KEY)
+    return df_merged.with_columns(
+        (~is_input & (next_x - previous_x > max_gap)).fill_null(False).alias(_GAP)
+    ).drop(_ROW)
+
+
+def _fill_strings(df: pl.DataFrame, on: list[str]) -> pl.DataFrame:
+    """Forward fills the string columns of the joined interpolation points.
+
+    The strings are filled within every group if `on` contains `_GROUP_KEY`. If
+    `df` flags gaps in a `_GAP` column, the strings are not filled across them
+    either, all columns but `on` are missing at the points in gaps and `_GAP` is
+    dropped.
+    """
+    over: list[str | pl.Expr] = [_GROUP_KEY] if _GROUP_KEY in on else []
+    if _GAP in df.columns:
+        over.append(pl.col(_GAP).cumsum())
+    if not over:
+        return df.with_columns(
+            cs.string(include_categorical=True).fill_null(strategy="forward"),
+        )
+
+    df = _forward_fill_strings(df, over)
+    if _GAP not in df.columns:
+        return df
+    return df.with_columns(pl.when(~pl.col(_GAP)).then(pl.exclude(*on, _GAP))).drop(
+        _GAP
+    )
+
+
+def _supports_sorted_path(
+    df: pl.DataFrame,
+    interpolation_column: str,
+    row_start: np.ndarray,
+    row_stop: np.ndarray,
+) -> bool:
+    """Checks whether `_resample_sorted` gives the same result as the joins would.
+
+    That is the case if `interpolation_column` is strictly increasing within every
+    group of rows `row_start[i]:row_stop[i]`, and every other column is either a
+    string column or a numeric column without missing values.
+    """
+    for column, dtype in df.schema.items():
+        if dtype in (pl.Utf8, pl.Categorical) and column != interpolation_column:
+            continue
+        if dtype not in pl.INTEGER_DTYPES | pl.FLOAT_DTYPES:
+            return False
+        if df[column].null_count() > 0:
+            return False
+
+    x = df[interpolation_column].to_numpy()
+    is_increasing = x[1:] > x[:-1]
+    # Rows at the boundary between two groups don't need to be increasing.
+    is_increasing[row_start[1:] - 1] = True
+    return bool(is_increasing.all()) and bool((row_stop > row_start).all())
+
+
+def _resample_sorted(
+    df: pl.DataFrame,
+    interpolation_column: str,
+    interpolation_step: float | None,
+    row_start: np.ndarray,
+    row_stop: np.ndarray,
+    origin: np.ndarray | None = None,
+    plan_cache: PlanCache | None = None,
+    methods: dict[str, str] | None = None,
+    points: np.ndarray | None = None,
+    max_gap: float | None = None,
+    group_column: str | None = None,
+) -> pl.DataFrame:
+    """Resamples a dataframe whose rows are sorted within every group.
+
+    Instead of merging the interpolation points into the dataframe, every
+    interpolation point is located once by a binary search in `interpolation_column`
+    and the same indices and weights are then used for all other columns, whatever
+    their interpolation method. See `_supports_sorted_path` for the requirements on
+    `df` and `_interpolation_grid` for `origin`. If `points` are given, they are
+    used instead of evenly spaced interpolation points. Interpolation points in gaps
+    larger than `max_gap` are missing in all other columns but `group_column`.
+    """
+    x = df[interpolation_column].to_numpy()
+
+    def build_plan() -> Plan:
+        if points is None:
+            grid, group_index = _interpolation_grid(
+                start=x[row_start],
+                stop=x[row_stop - 1],
+                step=interpolation_step,
+                origin=origin,
+            )
+        else:
+            grid, group_index = _explicit_grid(
+                points, start=x[row_start], stop=x[row_stop - 1]
+            )
+        brackets = bracket(x, grid, row_start[group_index], row_stop[group_index])
+        return Plan(grid=grid, group_index=group_index, brackets=brackets)
+
+    with stage("plan", rows_in=len(df)) as current:
+        if plan_cache is None:
+            plan = build_plan()
+        else:
+            plan = plan_cache.get(
+                x, interpolation_step, row_start, row_stop, origin, build_plan, points
+            )
+        current.rows_out = len(plan.grid)
+
+    if methods is None:
+        methods = {}
+    with stage("interpolate", rows_in=len(df)) as current:
+        gap = None if max_gap is None else in_gap(x, plan.brackets, max_gap)
+        columns = [pl.Series(interpolation_column, plan.grid)]
+        for column in df.columns:
+            if column != interpolation_column:
+                columns.append(
+                    _resample_column(
+                        df[column],
+                        methods.get(column),
+                        x,
+                        plan,
+                        row_start,
+                        row_stop,
+                        None if column == group_column else gap,
+                    )
+                )
+        current.rows_out = len(plan.grid)
+    return pl.DataFrame(columns)
+
+
+def _resample_column(
+    series: pl.Series,
+    method: str | None,
+    x: np.ndarray,
+    plan: Plan,
+    row_start: np.ndarray,
+    row_stop: np.ndarray,
+    gap: np.ndarray | None = None,
+) -> pl.Series:
+    """Interpolates one column with the given method, see `_resample_sorted`.
+
+    If given, `gap` flags the interpolation points that are missing because they
+    lie in a gap of the input rows.
+    """
+    brackets = plan.brackets
+    if method in ("nearest", "previous") or series.dtype in (pl.Utf8, pl.Categorical):
+        return _take(series, _source_rows(series, method, x, plan, gap))
+    if method == "cubic":
+        values = cubic(
+            x,
+            series.to_numpy(),
+            plan.grid,
+            brackets,
+            row_start[plan.group_index],
+            row_stop[plan.group_index],
+        )
+        interpolated = pl.Series(series.name, values)
+    else:
+        interpolated = pl.Series(
+            series.name, blend(series.to_numpy(), brackets), series.dtype
+        )
+    if gap is not None and gap.any():
+        interpolated = interpolated.set(pl.Series(gap), None).alias(series.name)
+    return interpolated
+
+
+def _source_rows(
+    series: pl.Series,
+    method: str | None,
+    x: np.ndarray,
+    plan: Plan,
+    gap: np.ndarray | None,
+) -> np.ndarray:
+    """The input row per interpolation point for methods that take values as is.
+
+    Negative rows mark missing values, see `_take`.
+    """
+    brackets = plan.brackets
+    if method == "nearest":
+        rows = nearest(x, plan.grid, brackets)
+    elif method == "previous":
+        rows = brackets.left
+    else:
+        # String columns only carry over the values at interpolation points that
+        # coincide with an input row, which are then forward filled up to the
+        # next gap.
+        is_valid = series.is_not_null().to_numpy()[brackets.left]
+        has_value = brackets.exact & is_valid
+        if gap is not None:
+            has_value |= gap
+        last = fill_forward(has_value, plan.group_index)
+        rows = np.where(last >= 0, brackets.left[last], -1)
+        if gap is not None:
+            # Points after a gap that are filled from the gap stay missing.
+            rows[(last >= 0) & gap[last]] = -1
+    if gap is not None:
+        rows = np.where(gap, -1, rows)
+    return rows
+
+
+def _take(series: pl.Series, rows: np.ndarray) -> pl.Series:
+    """Takes the given rows of `series`, and missing values for negative rows."""
+    missing = rows < 0
+    if not missing.any():
+        return series.take(rows)
+    return series.take(pl.Series(rows).set(pl.Series(missing), None))
+
+
+def _check_methods(
+    df: pl.DataFrame,
+    interpolation_column: str,
+    methods: dict[str, str] | None,
+    is_sorted: bool,
+) -> dict[str, str] | None:
+    """Raises a `ValueError` if `methods` don't fit the columns of `df`."""
+    if not methods:
+        return methods
+    if not is_sorted:
+        raise ValueError(
+            "Interpolation methods can only be chosen if the rows are sorted by "
+            f"`{interpolation_column}` without duplicates or missing numeric values."
+        )
+    for column, method in methods.items():
+        if column not in df.columns or column == interpolation_column:
+            raise ValueError(f"Cannot choose an interpolation method for {column!r}.")
+        if method not in METHODS:
+            raise ValueError(
+                f"Unknown interpolation method {method!r} for {column!r}, "
+                f"use one of {METHODS}."
+            )
+        if df.schema[column] in (pl.Utf8, pl.Categorical) and method not in (
+            "nearest",
+            "previous",
+        ):
+            raise ValueError(
+                f"String column {column!r} can only use 'nearest' or 'previous'."
+            )
+    return methods
+
+
+def _forward_fill_strings(
+    df: pl.DataFrame, over: list[str | pl.Expr] | None = None
+) -> pl.DataFrame:
+    """Forward fills all string columns within each window of `over`.
+
+    By default, the windows are the groups of `_GROUP_KEY`.
+    """
+    # A window expression would be the natural choice, but polars cannot evaluate
+    # categoricals in a window. So we forward fill over the whole frame and mask
+    # everything that precedes the first value of a group instead.
+    string_columns = cs.string(include_categorical=True)
+    return df.with_columns(
+        pl.when(string_columns.is_not_null().cumsum().over(over or _GROUP_KEY) > 0)
+        .then(string_columns.fill_null(strategy="forward"))
+        .otherwise(None)
     )
 
 
@@ -79,9 +809,17 @@ def resample_dataframe_polars(
 def resample_dataframe_grouped_polars(
     df: pl.DataFrame,
     interpolation_column: str,
-    interpolation_step: float,
+    interpolation_step: float | datetime.timedelta | None,
     group_column: str,
     to_log: bool = False,
+    n_jobs: int = 1,
+    executor: str = "process",
+    plan_cache: PlanCache | None = None,
+    methods: dict[str, str] | None = None,
+    low_memory: bool = False,
+    interpolation_points: "pl.Series | np.ndarray | None" = None,
+    max_gap: float | datetime.timedelta | None = None,
+    dtype_policy: str = "preserve",
 ) -> pl.DataFrame:
     """Groupwise resamples a dataframe to obtain data at interpolation points.
 
@@ -90,13 +828,39 @@ def resample_dataframe_grouped_polars(
     df : pl.DataFrame
         The dataframe to interpolate.
     interpolation_column : str
-        Which numeric column to use for the interpolation points.
-    interpolation_step : float
-        Steps for the newly create interpolation points
+        Which numeric or temporal column to use for the interpolation points.
+    interpolation_step : float | datetime.timedelta | None
+        Steps for the newly create interpolation points, see
+        `resample_dataframe_polars`.
     group_column : str
         The column over which to group
     to_log : bool
         Whether or not to show additional logging info.
+    n_jobs : int
+        Into how many shards of groups with roughly the same number of rows the
+        dataframe is split, to be resampled by as many workers. `-1` uses one
+        worker per CPU.
+    executor : str
+        Either `"process"` to resample the shards in a process pool, or `"thread"`
+        to resample them in a thread pool.
+    plan_cache : PlanCache | None
+        A cache of interpolation plans, see `resample_dataframe_polars`. Process
+        pools don't share the cache.
+    methods : dict[str, str] | None
+        The interpolation method per column, see `resample_dataframe_polars`.
+    low_memory : bool
+        Whether to resample unsorted groups one column at a time, see
+        `resample_dataframe_polars`.
+    interpolation_points : pl.Series | np.ndarray | None
+        Explicit interpolation points, see `resample_dataframe_polars`. Every
+        group is resampled onto those of the points that lie within its range, so
+        that all groups share one timeline.
+    max_gap : float | datetime.timedelta | None
+        Leaves gaps larger than this in `interpolation_column` unbridged within
+        every group, see `resample_dataframe_polars`.
+    dtype_policy : str
+        `"preserve"` or `"compact"` dtypes of the resampled columns, see
+        `resample_dataframe_polars`. `group_column` is only cast in the result.
 
     Returns
     -------
@@ -107,27 +871,308 @@ def resample_dataframe_grouped_polars(
 
     Info
     -------
-    This is a wrapper that just calls `resample_dataframe_polars` for each group.
+    The result is identical to calling `resample_dataframe_polars` for each group
+    (in order of first appearance) and concatenating the results, but all groups
+    are resampled in one pass over the whole dataframe.
     """
-    return pl.concat(
-        [
-            resample_dataframe_polars(
-                groupdf,
-                interpolation_column=interpolation_column,
-                interpolation_step=interpolation_step,
-                to_log=to_log,
+    dtype = df.schema[interpolation_column]
+    # The group column is cast at the end, as polars cannot use categoricals in
+    # all of the window expressions below.
+    df = _apply_dtype_policy(
+        df,
+        dtype_policy,
+        keep=[interpolation_column, group_column],
+        dtypes=_COMPACT_INPUT_DTYPES,
+    )
+    df, interpolation_step, points = _to_physical(
+        df, interpolation_column, interpolation_step, interpolation_points
+    )
+    if max_gap is not None:
+        max_gap = _physical_distance(max_gap, dtype)
+
+    # Identify every group by the row index of its first appearance. This keeps
+    # the groups in the same order as `groupby(..., maintain_order=True)` and
+    # gives us a plain integer key to join and sort on.
+    with stage("group", rows_in=len(df)) as current:
+        df_keyed = df.with_row_count(_GROUP_KEY).with_columns(
+            pl.col(_GROUP_KEY).min().over(group_column)
+        )
+
+        # Bring the rows of each group next to each other (without reordering rows
+        # within a group) to check whether the groups can be resampled without
+        # joins.
+        key = df_keyed[_GROUP_KEY].to_numpy()
+        if not (key[1:] >= key[:-1]).all():
+            df_keyed = df_keyed[np.argsort(key, kind="stable")]
+            key = df_keyed[_GROUP_KEY].to_numpy()
+        row_start = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        row_stop = np.r_[row_start[1:], len(key)]
+        df_grouped = df_keyed.drop(_GROUP_KEY)
+        current.rows_out = len(df_grouped)
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs > 1 and len(row_start) > 1:
+        with stage("parallel", rows_in=len(df)) as current:
+            df_resampled = _resample_grouped_in_parallel(
+                df_grouped,
+                interpolation_column,
+                interpolation_step,
+                group_column,
+                row_start,
+                n_jobs,
+                executor,
+                plan_cache,
+                methods,
+                low_memory,
+                points,
+                max_gap,
             )
-            for _, groupdf in df.groupby(group_column, maintain_order=True)
-        ]
+            current.rows_out = len(df_resampled)
+    else:
+        with stage("check", rows_in=len(df)):
+            is_sorted = _supports_sorted_path(
+                df_grouped, interpolation_column, row_start, row_stop
+            )
+        if is_sorted:
+            df_resampled = _resample_sorted(
+                df_grouped,
+                interpolation_column,
+                interpolation_step,
+                row_start,
+                row_stop,
+                plan_cache=plan_cache,
+                methods=_check_methods(
+                    df_grouped, interpolation_column, methods, is_sorted=True
+                ),
+                points=points,
+                max_gap=max_gap,
+                group_column=group_column,
+            )
+        else:
+            _check_methods(df_grouped, interpolation_column, methods, is_sorted=False)
+            df_resampled = _resample_grouped_joined(
+                df_keyed,
+                interpolation_column,
+                interpolation_step,
+                group_column,
+                low_memory,
+                points,
+                max_gap,
+            )
+    df_resampled = _from_physical(df_resampled, interpolation_column, dtype)
+    df_resampled = _apply_dtype_policy(
+        df_resampled, dtype_policy, keep=[interpolation_column]
     )
 
+    if to_log:
+        n_groups = len(row_start)
+        n_input = len(df)
+        n_output = len(df_resampled)
+        logger.info(
+            f"Resampled {n_groups} groups from {n_input} rows to {n_output} rows."
+        )
+
+    return df_resampled
+
+
+def _resample_grouped_in_parallel(
+    df_grouped: pl.DataFrame,
+    interpolation_column: str,
+    interpolation_step: float | None,
+    group_column: str,
+    row_start: np.ndarray,
+    n_jobs: int,
+    executor: str,
+    plan_cache: PlanCache | None,
+    methods: dict[str, str] | None,
+    low_memory: bool,
+    points: np.ndarray | None,
+    max_gap: float | None,
+) -> pl.DataFrame:
+    """Resamples shards of consecutive groups in a pool of workers.
+
+    The shards are cut at group boundaries, such that every shard has about the
+    same number of rows. Workers in a process pool receive and return their shard
+    as Arrow IPC bytes, which is much cheaper than pickling a dataframe.
+    """
+    n_rows = len(df_grouped)
+    targets = np.arange(1, n_jobs) * n_rows / n_jobs
+    cuts = np.searchsorted(row_start, targets)
+    edges = np.unique(np.r_[0, row_start[cuts[cuts < len(row_start)]], n_rows])
+    shards = [
+        df_grouped.slice(start, stop - start)
+        for start, stop in zip(edges[:-1], edges[1:], strict=True)
+    ]
+    resample_shard = functools.partial(
+        resample_dataframe_grouped_polars,
+        interpolation_column=interpolation_column,
+        interpolation_step=interpolation_step,
+        group_column=group_column,
+        methods=methods,
+        low_memory=low_memory,
+        interpolation_points=points,
+        max_gap=max_gap,
+    )
+
+    with pl.StringCache():
+        if executor == "thread":
+            resample_shard = functools.partial(resample_shard, plan_cache=plan_cache)
+            # In a copy of this context, the stages of the shards count as nested.
+            contexts = [contextvars.copy_context() for _ in shards]
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                results = pool.map(
+                    contextvars.Context.run,
+                    contexts,
+                    [resample_shard] * len(shards),
+                    shards,
+                )
+                return pl.concat(list(results))
+        if executor == "process":
+            # Polars is multithreaded and not safe to fork, so we spawn workers.
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=n_jobs, mp_context=context) as pool:
+                results = pool.map(
+                    functools.partial(_resample_ipc, resample_shard=resample_shard),
+                    [_to_ipc(shard) for shard in shards],
+                )
+                return pl.concat(
+                    [pl.read_ipc(io.BytesIO(result)) for result in results]
+                )
+    raise ValueError(f"Unknown executor {executor!r}, use 'process' or 'thread'.")
+
+
+def _to_ipc(df: pl.DataFrame) -> bytes:
+    """Serializes a dataframe to Arrow IPC bytes."""
+    buffer = io.BytesIO()
+    df.write_ipc(buffer)
+    return buffer.getvalue()
+
+
+def _resample_ipc(
+    shard: bytes,
+    resample_shard: Callable[[pl.DataFrame], pl.DataFrame],
+) -> bytes:
+    """Worker function of `_resample_grouped_in_parallel` for process pools."""
+    return _to_ipc(resample_shard(pl.read_ipc(io.BytesIO(shard))))
+
+
+def _resample_grouped_joined(
+    df_keyed: pl.DataFrame,
+    interpolation_column: str,
+    interpolation_step: float | None,
+    group_column: str,
+    low_memory: bool = False,
+    points: np.ndarray | None = None,
+    max_gap: float | None = None,
+) -> pl.DataFrame:
+    """Groupwise version of `_resample_joined` for groups given by `_GROUP_KEY`.
+
+    `group_column` is never missing in gaps larger than `max_gap`.
+    """
+    with stage("grid", rows_in=len(df_keyed)) as current:
+        bounds = (
+            df_keyed.groupby(_GROUP_KEY)
+            .agg(
+                pl.col(interpolation_column).min().alias("start"),
+                pl.col(interpolation_column).max().alias("stop"),
+            )
+            .sort(_GROUP_KEY)
+        )
+        start = bounds["start"].to_numpy()
+        stop = bounds["stop"].to_numpy()
+        if points is None:
+            grid, group_index = _interpolation_grid(start, stop, interpolation_step)
+        else:
+            grid, group_index = _explicit_grid(points, start, stop)
+        interpolation_points = pl.DataFrame(
+            {
+                _GROUP_KEY: bounds[_GROUP_KEY].to_numpy()[group_index],
+                interpolation_column: grid,
+            }
+        )
+        current.rows_out = len(interpolation_points)
+
+    on = [_GROUP_KEY, interpolation_column]
+    if low_memory:
+        df_resampled = _resample_by_column(df_keyed, interpolation_points, on, max_gap)
+        return _broadcast_groups(df_resampled, df_keyed, group_column, max_gap)
+    if max_gap is not None:
+        df_keyed = df_keyed.with_row_count(_ROW)
+
+    with stage("outer_join", rows_in=len(df_keyed)) as current:
+        df_with_data_at_additional_interpolation_points = interpolation_points.join(
+            df_keyed, on=[_GROUP_KEY, interpolation_column], how="outer"
+        )
+        current.rows_out = len(df_with_data_at_additional_interpolation_points)
+    with stage("sort", rows_in=current.rows_out):
+        df_with_data_at_additional_interpolation_points = (
+            df_with_data_at_additional_interpolation_points.sort(on)
+        )
+        if max_gap is not None:
+            df_with_data_at_additional_interpolation_points = _flag_gaps(
+                df_with_data_at_additional_interpolation_points, on, max_gap
+            )
+    with stage("interpolate", rows_in=current.rows_out):
+        df_with_data_at_additional_interpolation_points = (
+            df_with_data_at_additional_interpolation_points.with_columns(
+                (
+                    cs.all()
+                    - cs.by_name(*on, *([_GAP] if max_gap is not None else []))
+                    - cs.string(include_categorical=True)
+                )
+                .interpolate()
+                .over(_GROUP_KEY)
+            )
+        )
+
+    with stage("left_join", rows_in=current.rows_out) as current:
+        df_with_data_only_at_interpolation_points = interpolation_points.join(
+            df_with_data_at_additional_interpolation_points,
+            on=[_GROUP_KEY, interpolation_column],
+            how="left",
+        ).sort([_GROUP_KEY, interpolation_column])
+        current.rows_out = len(df_with_data_only_at_interpolation_points)
+
+    with stage("forward_fill", rows_in=current.rows_out):
+        df_resampled = _fill_strings(df_with_data_only_at_interpolation_points, on)
+        return _broadcast_groups(df_resampled, df_keyed, group_column, max_gap)
+
+
+def _broadcast_groups(
+    df_resampled: pl.DataFrame,
+    df_keyed: pl.DataFrame,
+    group_column: str,
+    max_gap: float | None,
+) -> pl.DataFrame:
+    """Drops `_GROUP_KEY` after restoring `group_column` at points in gaps.
+
+    The joins leave every column but `on` missing in gaps larger than `max_gap`,
+    so `group_column` is taken from the input rows with the same `_GROUP_KEY`.
+    """
+    if max_gap is not None:
+        groups = df_keyed.select(_GROUP_KEY, group_column).unique(_GROUP_KEY)
+        df_resampled = (
+            df_resampled.drop(group_column)
+            .join(groups, on=_GROUP_KEY, how="left")
+            .select(df_resampled.columns)
+        )
+    return df_resampled.drop(_GROUP_KEY)
+
 
 def resample_dataframe_pandas(
-    df: pd.DataFrame,
+    df: "pd.DataFrame",
     interpolation_column: str,
-    interpolation_step: float,
+    interpolation_step: float | datetime.timedelta | None,
     to_log: bool = False,
-) -> pd.DataFrame:
+    dtype_backend: str = "numpy",
+    plan_cache: PlanCache | None = None,
+    methods: dict[str, str] | None = None,
+    low_memory: bool = False,
+    interpolation_points: "pd.Series | np.ndarray | None" = None,
+    max_gap: float | datetime.timedelta | None = None,
+    dtype_policy: str = "preserve",
+) -> "pd.DataFrame":
     """Resamples a dataframe to obtain data at interpolation points.
 
     Parameters
@@ -136,10 +1181,29 @@ def resample_dataframe_pandas(
         The dataframe to interpolate.
     interpolation_column : str
         Which numeric column to use for the interpolation points.
-    interpolation_step : float
-        Steps for the newly create interpolation points
+    interpolation_step : float | datetime.timedelta | None
+        Steps for the newly create interpolation points, see
+        `resample_dataframe_polars`.
     to_log : bool
         Whether or not to show additional logging info.
+    dtype_backend : str
+        Either `"numpy"` for numpy-backed columns (and Python strings), or
+        `"pyarrow"` for `pd.ArrowDtype` columns, which share memory with the
+        resampled polars dataframe instead of copying it.
+    plan_cache : PlanCache | None
+        A cache of interpolation plans, see `resample_dataframe_polars`.
+    methods : dict[str, str] | None
+        The interpolation method per column, see `resample_dataframe_polars`.
+    low_memory : bool
+        Whether to resample unsorted inputs one column at a time, see
+        `resample_dataframe_polars`.
+    interpolation_points : pd.Series | np.ndarray | None
+        Explicit interpolation points, see `resample_dataframe_polars`.
+    max_gap : float | datetime.timedelta | None
+        Leaves gaps larger than this unbridged, see `resample_dataframe_polars`.
+    dtype_policy : str
+        `"preserve"` or `"compact"` dtypes of the resampled columns, see
+        `resample_dataframe_polars`.
 
     Returns
     -------
@@ -152,21 +1216,37 @@ def resample_dataframe_pandas(
     -------
     This is a wrapper that just calls `resample_dataframe_polars`.
     """
-    return resample_dataframe_polars(
-        df=pl.DataFrame(df),
+    df_resampled = resample_dataframe_polars(
+        df=_from_pandas(df),
         interpolation_column=interpolation_column,
         interpolation_step=interpolation_step,
         to_log=to_log,
-    ).to_pandas()
+        plan_cache=plan_cache,
+        methods=methods,
+        low_memory=low_memory,
+        interpolation_points=_points_from_pandas(interpolation_points),
+        max_gap=max_gap,
+        dtype_policy=dtype_policy,
+    )
+    return _to_pandas(df_resampled, dtype_backend)
 
 
 def resample_dataframe_grouped_pandas(
-    df: pd.DataFrame,
+    df: "pd.DataFrame",
     interpolation_column: str,
-    interpolation_step: float,
+    interpolation_step: float | datetime.timedelta | None,
     group_column: str,
     to_log: bool = False,
-) -> pd.DataFrame:
+    dtype_backend: str = "numpy",
+    n_jobs: int = 1,
+    executor: str = "process",
+    plan_cache: PlanCache | None = None,
+    methods: dict[str, str] | None = None,
+    low_memory: bool = False,
+    interpolation_points: "pd.Series | np.ndarray | None" = None,
+    max_gap: float | datetime.timedelta | None = None,
+    dtype_policy: str = "preserve",
+) -> "pd.DataFrame":
     """Groupwise resamples a dataframe to obtain data at interpolation points.
 
     Parameters
@@ -175,12 +1255,36 @@ def resample_dataframe_grouped_pandas(
         The dataframe to interpolate.
     interpolation_column : str
         Which numeric column to use for the interpolation points.
-    interpolation_step : float
-        Steps for the newly create interpolation points
+    interpolation_step : float | datetime.timedelta | None
+        Steps for the newly create interpolation points, see
+        `resample_dataframe_polars`.
     group_column : str
         The column over which to group
     to_log : bool
         Whether or not to show additional logging info.
+    dtype_backend : str
+        Either `"numpy"` for numpy-backed columns (and Python strings), or
+        `"pyarrow"` for `pd.ArrowDtype` columns, which share memory with the
+        resampled polars dataframe instead of copying it.
+    n_jobs : int
+        Into how many shards the groups are split to be resampled in parallel, see
+        `resample_dataframe_grouped_polars`.
+    executor : str
+        Either `"process"` or `"thread"`, see `resample_dataframe_grouped_polars`.
+    plan_cache : PlanCache | None
+        A cache of interpolation plans, see `resample_dataframe_grouped_polars`.
+    methods : dict[str, str] | None
+        The interpolation method per column, see `resample_dataframe_polars`.
+    low_memory : bool
+        Whether to resample unsorted inputs one column at a time, see
+        `resample_dataframe_polars`.
+    interpolation_points : pd.Series | np.ndarray | None
+        Explicit interpolation points, see `resample_dataframe_polars`.
+    max_gap : float | datetime.timedelta | None
+        Leaves gaps larger than this unbridged, see `resample_dataframe_polars`.
+    dtype_policy : str
+        `"preserve"` or `"compact"` dtypes of the resampled columns, see
+        `resample_dataframe_polars`.
 
     Returns
     -------
@@ -194,10 +1298,50 @@ def resample_dataframe_grouped_pandas(
     This is a wrapper that just calls `resample_dataframe_grouped_polars`.
 
     """
-    return resample_dataframe_grouped_polars(
-        df=pl.DataFrame(df),
+    df_resampled = resample_dataframe_grouped_polars(
+        df=_from_pandas(df),
         interpolation_column=interpolation_column,
         interpolation_step=interpolation_step,
         group_column=group_column,
         to_log=to_log,
-    ).to_pandas()
+        n_jobs=n_jobs,
+        executor=executor,
+        plan_cache=plan_cache,
+        methods=methods,
+        low_memory=low_memory,
+        interpolation_points=_points_from_pandas(interpolation_points),
+        max_gap=max_gap,
+        dtype_policy=dtype_policy,
+    )
+    return _to_pandas(df_resampled, dtype_backend)
+
+
+def _from_pandas(df: "pd.DataFrame") -> pl.DataFrame:
+    """Converts to polars through arrow, sharing memory where possible."""
+    with stage("from_pandas", rows_in=len(df)):
+        # NaN is missing in pandas, and missing values are interpolated across.
+        return pl.from_pandas(df, rechunk=False, nan_to_null=True)
+
+
+def _points_from_pandas(
+    points: "pd.Series | np.ndarray | None",
+) -> "pl.Series | np.ndarray | None":
+    """Converts explicit interpolation points from pandas to polars."""
+    if points is None or isinstance(points, np.ndarray):
+        return points
+    return pl.from_pandas(points)
+
+
+def _to_pandas(df: pl.DataFrame, dtype_backend: str) -> "pd.DataFrame":
+    """Converts to pandas with either numpy or arrow-backed columns."""
+    if dtype_backend == "pyarrow":
+        with stage("to_pandas", rows_in=len(df)):
+            return df.to_pandas(use_pyarrow_extension_array=True)
+    if dtype_backend == "numpy":
+        # Keep one block per column and release the arrow buffers as soon as they
+        # are converted, so that the conversion does not double the peak memory.
+        with stage("to_pandas", rows_in=len(df)):
+            return df.to_pandas(split_blocks=True, self_destruct=True)
+    raise ValueError(
+        f"Unknown dtype_backend {dtype_backend!r}, use 'numpy' or 'pyarrow'."
+    )
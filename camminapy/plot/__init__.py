@@ -1,4 +1,48 @@
-from camminapy.plot.altair_config import altair_setup, altair_theme
-from camminapy.plot.footer import Footer
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["Footer", "altair_setup", "altair_theme"]
+# The theme module has no dependencies, so its function is imported right away.
+# This binds `altair_theme` to the function rather than to the submodule of the
+# same name, which later imports find loaded and leave alone.
+from camminapy.plot.altair_theme import altair_theme
+
+if TYPE_CHECKING:
+    from camminapy.plot.altair_aggregate import aggregate_chart_data
+    from camminapy.plot.altair_config import altair_setup
+    from camminapy.plot.altair_data import project_chart_data
+    from camminapy.plot.altair_export import export_charts
+    from camminapy.plot.footer import Footer
+
+# The submodules are only imported once one of their names is used, so that
+# importing this package does not pull in altair or git.
+_MODULES = {
+    "Footer": "camminapy.plot.footer",
+    "aggregate_chart_data": "camminapy.plot.altair_aggregate",
+    "altair_setup": "camminapy.plot.altair_config",
+    "export_charts": "camminapy.plot.altair_export",
+    "project_chart_data": "camminapy.plot.altair_data",
+}
+
+__all__ = [
+    "Footer",
+    "aggregate_chart_data",
+    "altair_setup",
+    "altair_theme",
+    "export_charts",
+    "project_chart_data",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_MODULES[name])
+    # Bind all names of the module at once.
+    for other_name, module_name in _MODULES.items():
+        if module_name == module.__name__:
+            globals()[other_name] = getattr(module, other_name)
+    return globals()[name]
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,430 @@
+import math
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import altair as alt
+import pandas as pd
+import polars as pl
+
+# Aggregation operations of Vega-Lite, as polars expressions of a field.
+_OPS: dict[str, Callable[[str | None], pl.Expr]] = {
+    "count": lambda field: pl.count(),
+    "valid": lambda field: pl.col(field).is_not_null().sum(),
+    "missing": lambda field: pl.col(field).is_null().sum(),
+    "distinct": lambda field: pl.col(field).n_unique(),
+    "sum": lambda field: pl.col(field).sum(),
+    "product": lambda field: pl.col(field).product(),
+    "mean": lambda field: pl.col(field).mean(),
+    "average": lambda field: pl.col(field).mean(),
+    "median": lambda field: pl.col(field).median(),
+    "min": lambda field: pl.col(field).min(),
+    "max": lambda field: pl.col(field).max(),
+    "variance": lambda field: pl.col(field).var(),
+    "variancep": lambda field: pl.col(field).var(ddof=0),
+    "stdev": lambda field: pl.col(field).std(),
+    "stdevp": lambda field: pl.col(field).std(ddof=0),
+}
+
+# Operations whose result is a number of rows, whatever the type of the field.
+_COUNTS = {"count", "valid", "missing", "distinct"}
+
+# Channels that bins are computed for, with the channel of the ends of the bins.
+_BIN_CHANNELS = {"x": "x2", "y": "y2"}
+
+# Parameters of bins that are computed like Vega does, and their defaults.
+_BIN_DEFAULTS = {"maxbins": 10, "step": None, "nice": True}
+
+# The tolerance of Vega when it puts values into bins.
+_EPSILON = 1e-14
+
+
+class _UnsupportedError(Exception):
+    """A view that is left for Vega-Lite to aggregate."""
+
+
+def aggregate_chart_data(chart: alt.TopLevelMixin) -> alt.TopLevelMixin:
+    """Aggregates the dataframes of a chart in polars instead of in the browser.
+
+    The aggregations of the encoding of a view (e.g. `"count()"` or
+    `"mean(y):Q"`, grouped by all other fields of the encoding), bins on `x` and
+    `y` (e.g. `alt.X("x", bin=True)` of histograms and heatmaps) and the `filter`,
+    `bin` and `aggregate` transforms of the view are computed like Vega-Lite
+    does. The view then gets the aggregated rows, encoded with the same titles,
+    with `bin="binned"` and the bin ends on `x2` or `y2`. The data that is
+    written and sent to the browser thus grows with the number of bins and
+    groups instead of with the number of rows.
+
+    Views are left as they are if they use anything else, e.g. filters with
+    expressions or selections, time units, other transforms or selections other
+    than `interactive()`, and if they share their data or inherit an encoding
+    from a layer or facet.
+
+    Parameters
+    ----------
+    chart : alt.TopLevelMixin
+        Any chart, including layered, concatenated and faceted ones, with pandas
+        or polars dataframes.
+
+    Returns
+    -------
+    alt.TopLevelMixin
+        A copy of the chart with aggregated data where possible.
+    """
+    chart = chart.copy(deep=True)
+    for view in _views(chart):
+        try:
+            data, encoding = _aggregate_view(view)
+        except _UnsupportedError:
+            continue
+        view.data = data
+        view.transform = alt.Undefined
+        view.encoding = alt.FacetedEncoding.from_dict(encoding)
+    return chart
+
+
+def _views(obj: Any, inherits: bool = False) -> Iterator[alt.Chart]:
+    """The views of a chart that have their own dataframe and inherit nothing."""
+    if isinstance(obj, alt.Chart):
+        data = obj._get("data")
+        if not inherits and isinstance(data, (pd.DataFrame, pl.DataFrame)):
+            yield obj
+        return
+    if isinstance(obj, alt.SchemaBase):
+        inherits = inherits or any(
+            obj._get(key) is not alt.Undefined for key in ("encoding", "transform")
+        )
+        obj = obj._kwds
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key != "data":
+                yield from _views(value, inherits)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _views(value, inherits)
+
+
+def _aggregate_view(view: alt.Chart) -> tuple[Any, dict[str, Any]]:
+    """The aggregated data and the encoding of a view."""
+    data = view.data
+    is_pandas = isinstance(data, pd.DataFrame)
+    if is_pandas and not all(isinstance(c, str) for c in data.columns):
+        raise _UnsupportedError
+    for param in _to_dicts(view._get("params")):
+        if "select" in param and param.get("bind") != "scales":
+            raise _UnsupportedError
+    transforms = _to_dicts(view._get("transform"))
+    if view._get("encoding") is alt.Undefined:
+        raise _UnsupportedError
+    # Vega-Lite infers the types of the fields of pandas dataframes only.
+    encoding = view.encoding.to_dict(
+        validate=False, context={"data": data if is_pandas else None}
+    )
+
+    df = pl.from_pandas(data) if is_pandas else data
+    for transform in transforms:
+        df = _transform(df, transform)
+    if any("aggregate" in d for d in _field_defs(encoding)):
+        df, encoding = _aggregate_encoding(df, encoding)
+    elif not transforms:
+        raise _UnsupportedError
+    return df.to_pandas() if is_pandas else df, encoding
+
+
+def _to_dicts(specs: Any) -> list[dict[str, Any]]:
+    """The specifications of a list, like the transforms of a view, as dicts."""
+    if specs is alt.Undefined:
+        return []
+    return [s.to_dict() if isinstance(s, alt.SchemaBase) else s for s in specs]
+
+
+def _field_defs(encoding: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """The definitions of all channels, including every field of a tooltip."""
+    for value in encoding.values():
+        yield from value if isinstance(value, list) else [value]
+
+
+def _column(df: pl.DataFrame, field: Any) -> str:
+    """A field that is a column of the data."""
+    if not isinstance(field, str) or field not in df.columns:
+        raise _UnsupportedError
+    return field
+
+
+def _transform(df: pl.DataFrame, transform: dict[str, Any]) -> pl.DataFrame:
+    """Applies a `filter`, `bin` or `aggregate` transform."""
+    keys = set(transform)
+    if keys == {"filter"}:
+        return df.filter(_predicate(df, transform["filter"]))
+    if keys == {"bin", "field", "as"}:
+        field = _column(df, transform["field"])
+        names = transform["as"]
+        start, end = (names, f"{names}_end") if isinstance(names, str) else names
+        params = _bin_params(transform["bin"])
+        bin_start, bin_end, _ = _bins(df, field, params)
+        return df.with_columns([bin_start.alias(start), bin_end.alias(end)])
+    if keys <= {"aggregate", "groupby"} and "aggregate" in keys:
+        groupby = [_column(df, f) for f in transform.get("groupby", [])]
+        aggregations = []
+        for aggregate in transform["aggregate"]:
+            op, field = aggregate["op"], aggregate.get("field")
+            if op not in _OPS:
+                raise _UnsupportedError
+            if op != "count":
+                _column(df, field)
+            aggregations.append(_OPS[op](field).alias(aggregate["as"]))
+        return _group(df, groupby, aggregations)
+    raise _UnsupportedError
+
+
+def _predicate(df: pl.DataFrame, predicate: Any) -> pl.Expr:
+    """A predicate of Vega-Lite, e.g. `{"field": "x", "lt": 5}` or an `and` of them."""
+    if not isinstance(predicate, dict):
+        # An expression like "datum.x < 5" or a selection.
+        raise _UnsupportedError
+    if set(predicate) == {"not"}:
+        return ~_predicate(df, predicate["not"])
+    if set(predicate) == {"and"}:
+        return pl.all_horizontal([_predicate(df, p) for p in predicate["and"]])
+    if set(predicate) == {"or"}:
+        return pl.any_horizontal([_predicate(df, p) for p in predicate["or"]])
+
+    field = _column(df, predicate.get("field"))
+    tests = set(predicate) - {"field"}
+    if len(tests) != 1 or df[field].dtype in pl.TEMPORAL_DTYPES:
+        # E.g. with a time unit, or comparing dates with their representation.
+        raise _UnsupportedError
+    test = tests.pop()
+    value = predicate[test]
+    if any(
+        isinstance(v, dict) for v in (value if isinstance(value, list) else [value])
+    ):
+        raise _UnsupportedError
+    return _field_predicate(df, field, test, value)
+
+
+def _field_predicate(df: pl.DataFrame, field: str, test: str, value: Any) -> pl.Expr:
+    """A test of a field, e.g. `"lt"` with a value of 5."""
+    column = pl.col(field)
+    if test == "valid":
+        return _is_valid(df, field) if value else ~_is_valid(df, field)
+    if test == "range":
+        lower, upper = value
+        # Either end may be left open.
+        bounds = [pl.lit(True)]
+        if lower is not None:
+            bounds.append(column >= lower)
+        if upper is not None:
+            bounds.append(column <= upper)
+        return pl.all_horizontal(bounds)
+    comparisons = {
+        "equal": lambda: column == value,
+        "lt": lambda: column < value,
+        "lte": lambda: column <= value,
+        "gt": lambda: column > value,
+        "gte": lambda: column >= value,
+        "oneOf": lambda: column.is_in(value),
+    }
+    if test not in comparisons:
+        raise _UnsupportedError
+    return comparisons[test]()
+
+
+def _is_valid(df: pl.DataFrame, field: str) -> pl.Expr:
+    """Whether a value is neither missing nor NaN, which Vega both counts invalid."""
+    is_valid = pl.col(field).is_not_null()
+    if df[field].dtype in pl.FLOAT_DTYPES:
+        is_valid &= pl.col(field).is_not_nan()
+    return is_valid
+
+
+def _aggregate_encoding(
+    df: pl.DataFrame, encoding: dict[str, Any]
+) -> tuple[pl.DataFrame, dict[str, Any]]:
+    """Aggregates the data by the fields that the encoding doesn't aggregate."""
+    grouping = _Grouping(df)
+    rewritten: dict[str, Any] = {}
+    for channel, value in encoding.items():
+        field_defs = [
+            grouping.add(channel, field_def, encoding, rewritten)
+            for field_def in (value if isinstance(value, list) else [value])
+        ]
+        rewritten[channel] = field_defs if isinstance(value, list) else field_defs[0]
+    return grouping.aggregate(rewritten), rewritten
+
+
+class _Grouping:
+    """The groups and aggregations of the data that an encoding asks for."""
+
+    def __init__(self, df: pl.DataFrame) -> None:
+        self.df = df
+        self.groupby: list[str] = []
+        self.aggregations: dict[str, pl.Expr] = {}
+        # The field and parameters of every column of bins.
+        self.bins: dict[str, tuple[str, dict[str, Any]]] = {}
+
+    def add(
+        self,
+        channel: str,
+        field_def: dict[str, Any],
+        encoding: dict[str, Any],
+        rewritten: dict[str, Any],
+    ) -> dict[str, Any]:
+        """The definition of a channel that refers to the aggregated columns."""
+        field_def = dict(field_def)
+        _check_field_def(field_def)
+        field = field_def.get("field")
+        if "aggregate" in field_def:
+            name, expression = _aggregation(self.df, field_def)
+            self.aggregations[name] = expression
+        elif _is_binned(field_def):
+            secondary = _BIN_CHANNELS.get(channel)
+            if secondary is None or secondary in encoding:
+                raise _UnsupportedError
+            params = _bin_params(field_def["bin"])
+            name = _bin_name(_column(self.df, field), params)
+            self.bins[name] = (field, params)
+            self.groupby += [name, f"{name}_end"]
+            rewritten[secondary] = {"field": f"{name}_end"}
+            field_def.setdefault("title", f"{field} (binned)")
+            field_def["field"] = name
+        elif field is not None:
+            self.groupby.append(_column(self.df, field))
+        return field_def
+
+    def aggregate(self, rewritten: dict[str, Any]) -> pl.DataFrame:
+        """The aggregated data, and the size of the bins in `rewritten`."""
+        df = self.df
+        # Vega-Lite leaves out the rows with invalid values in binned fields.
+        for field, _ in self.bins.values():
+            df = df.filter(_is_valid(df, field))
+        for name, (field, params) in self.bins.items():
+            bin_start, bin_end, step = _bins(df, field, params)
+            df = df.with_columns([bin_start.alias(name), bin_end.alias(f"{name}_end")])
+            for field_def in _field_defs(rewritten):
+                if field_def.get("field") == name:
+                    field_def["bin"] = {"binned": True, "step": step}
+        aggregations = [e.alias(name) for name, e in self.aggregations.items()]
+        return _group(df, list(dict.fromkeys(self.groupby)), aggregations)
+
+
+def _check_field_def(field_def: dict[str, Any]) -> None:
+    """Raises if a definition of a channel refers to fields in other ways."""
+    condition = field_def.get("condition", [])
+    conditions = condition if isinstance(condition, list) else [condition]
+    if (
+        "timeUnit" in field_def
+        or isinstance(field_def.get("sort"), dict)
+        or any("field" in c or "test" in c for c in conditions)
+        or ("aggregate" in field_def and _is_binned(field_def))
+    ):
+        raise _UnsupportedError
+
+
+def _aggregation(df: pl.DataFrame, field_def: dict[str, Any]) -> tuple[str, pl.Expr]:
+    """Replaces the aggregation of a channel by the name of its column."""
+    op = field_def.pop("aggregate")
+    field = field_def.get("field")
+    if not isinstance(op, str) or op not in _OPS:
+        # E.g. `argmax`, which Vega-Lite writes as a dict.
+        raise _UnsupportedError
+    if op == "count":
+        name = "__count" if field is None else f"count_{field}"
+        title = "Count of Records"
+    else:
+        name = f"{op}_{_column(df, field)}"
+        title = f"{op.capitalize()} of {field}"
+    if op in _COUNTS:
+        field_def["type"] = "quantitative"
+    field_def.setdefault("title", title)
+    field_def["field"] = name
+    return name, _OPS[op](field)
+
+
+def _is_binned(field_def: dict[str, Any]) -> bool:
+    """Whether Vega-Lite bins a field itself, i.e. it isn't binned already."""
+    bin_def = field_def.get("bin", False)
+    if bin_def == "binned" or not bin_def:
+        return False
+    if isinstance(bin_def, dict) and bin_def.get("binned", False):
+        return False
+    if field_def.get("type") != "quantitative":
+        raise _UnsupportedError
+    return True
+
+
+def _bin_params(bin_def: Any) -> dict[str, Any]:
+    """The parameters of bins, e.g. from `alt.Bin(maxbins=20)`."""
+    if bin_def is True:
+        bin_def = {}
+    if not isinstance(bin_def, dict) or not set(bin_def) <= set(_BIN_DEFAULTS):
+        # E.g. an extent, which may leave values out of all bins.
+        raise _UnsupportedError
+    return {**_BIN_DEFAULTS, **bin_def}
+
+
+def _bin_name(field: str, params: dict[str, Any]) -> str:
+    """The name of the column of the starts of the bins, like Vega-Lite's."""
+    parts = [
+        f"{key}_{value}"
+        for key, value in params.items()
+        if value != _BIN_DEFAULTS[key] or key == "maxbins"
+    ]
+    return "_".join(["bin", *parts, field])
+
+
+def _bins(
+    df: pl.DataFrame, field: str, params: dict[str, Any]
+) -> tuple[pl.Expr, pl.Expr, float]:
+    """The starts and ends of the bins of a field, and their size.
+
+    The bins are those of Vega's `bin` transform, including its tolerances.
+    """
+    if df[field].dtype not in pl.NUMERIC_DTYPES:
+        raise _UnsupportedError
+    values = df[field].cast(pl.Float64)
+    values = values.filter(values.is_not_nan())
+    if values.null_count() == len(values):
+        raise _UnsupportedError
+    start, stop, step = _bin_extent(
+        values.min(), values.max(), params["maxbins"], params["step"], params["nice"]
+    )
+    stop = start + math.ceil((stop - start) / step) * step
+    value = pl.col(field).cast(pl.Float64).clip(start, stop - step)
+    bin_start = start + step * (_EPSILON + (value - start) / step).floor()
+    bin_end = start + step * (1 + (bin_start - start) / step)
+    return bin_start, bin_end, step
+
+
+def _bin_extent(
+    lower: float, upper: float, maxbins: int, step: float | None, nice: bool
+) -> tuple[float, float, float]:
+    """The start, stop and step of the bins that Vega's `bin` function chooses."""
+    span = (upper - lower) or abs(lower) or 1
+    if step is None:
+        level = math.ceil(math.log(maxbins) / math.log(10))
+        # Rounds halves up, like JavaScript.
+        exponent = math.floor(math.log(span) / math.log(10) + 0.5) - level
+        step = math.pow(10, exponent)
+        while math.ceil(span / step) > maxbins:
+            step *= 10
+        for divisor in (5, 2):
+            if span / (step / divisor) <= maxbins:
+                step /= divisor
+
+    log_step = math.log(step)
+    precision = 0 if log_step >= 0 else int(-log_step / math.log(10)) + 1
+    eps = math.pow(10, -precision - 1)
+    if nice:
+        nice_lower = math.floor(lower / step + eps) * step
+        lower = nice_lower - step if lower < nice_lower else nice_lower
+        upper = math.ceil(upper / step) * step
+    return lower, lower + step if upper == lower else upper, step
+
+
+def _group(
+    df: pl.DataFrame, groupby: list[str], aggregations: list[pl.Expr]
+) -> pl.DataFrame:
+    """Aggregates the data, by groups if there are any."""
+    if not groupby:
+        return df.select(aggregations)
+    return df.groupby(groupby, maintain_order=True).agg(aggregations)
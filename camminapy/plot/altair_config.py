@@ -1,38 +1,86 @@
-import os
-
 import altair as alt
 import toolz
 
-from camminapy.plot.altair_theme import (
-    altair_theme_gray,
-)
+from camminapy.plot.altair_data import to_arrow, to_parquet
+from camminapy.plot.altair_downsample import downsample_for_plot
+
+# Re-exported, as the function used to be defined here.
+from camminapy.plot.altair_theme import altair_theme as altair_theme
+from camminapy.plot.altair_theme import altair_theme_gray
+from camminapy.plot.data_cache import data_cache
 
 
-def altair_theme() -> None:
-    for _ in range(2):
-        alt.themes.register("theme_gray", altair_theme_gray)
-        alt.themes.enable("theme_gray")
+def altair_setup(
+    csv_or_json: str = "json",
+    max_bytes: int | None = 2**30,
+    max_age_seconds: float | None = 7 * 24 * 60 * 60,
+    downsample: str | None = None,
+) -> None:
+    """Writes the data of altair charts to files instead of embedding it.
 
+    `csv_or_json` is the format of the files, `"csv"`, `"json"`, `"arrow"` (Arrow
+    IPC, which Vega reads much faster than text and which is also a Feather file)
+    or `"parquet"` (which needs a renderer with a Parquet loader). Arrow and
+    Parquet files are written straight from polars or pyarrow, and
+    `project_chart_data` leaves out the columns that a chart doesn't use.
+    `aggregate_chart_data` writes only the bins and aggregates of charts like
+    histograms and heatmaps instead of all their rows.
 
-def altair_setup(csv_or_json: str = "json") -> None:
+    The files are named after a hash of the data, so charts of the same data
+    share one file, which is only written once. The least recently used files
+    are deleted once all files take more than `max_bytes`, and files are deleted
+    once they were not used for `max_age_seconds`, see `DataCache`.
+
+    With `downsample="lttb"` or `"minmax"`, dataframes are reduced to a few rows
+    per horizontal pixel of the theme's width and per series before they are
+    written, see `downsample_for_plot`. This is meant for large line charts only,
+    as it drops rows that other charts, like histograms, need.
+    """
     alt.data_transformers.register("csv_dir", csv_dir)
     alt.data_transformers.register("json_dir", json_dir)
+    alt.data_transformers.register("arrow_dir", arrow_dir)
+    alt.data_transformers.register("parquet_dir", parquet_dir)
     for _ in range(2):  # For some reason I need to run this twice for it to work.
         alt.data_transformers.enable(
-            f"{csv_or_json}_dir", data_dir="./.temporary_altair_data/"
+            f"{csv_or_json}_dir",
+            data_dir="./.temporary_altair_data/",
+            max_bytes=max_bytes,
+            max_age_seconds=max_age_seconds,
+            downsample=None
+            if downsample is None
+            else {
+                "method": downsample,
+                "width": altair_theme_gray()["config"]["view"]["width"],
+            },
         )
 
 
-def csv_dir(data, data_dir="altairdata") -> None:
-    return generic_dir(data, alt.to_csv, data_dir)
+def csv_dir(data, data_dir="altairdata", **options) -> dict:
+    return generic_dir(data, alt.to_csv, data_dir, "csv", **options)
+
+
+def json_dir(data, data_dir="altairdata", **options) -> dict:
+    return generic_dir(data, alt.to_json, data_dir, "json", **options)
+
+
+def arrow_dir(data, data_dir="altairdata", **options) -> dict:
+    return generic_dir(data, to_arrow, data_dir, "arrow", **options)
 
 
-def json_dir(data, data_dir="altairdata") -> None:
-    return generic_dir(data, alt.to_json, data_dir)
+def parquet_dir(data, data_dir="altairdata", **options) -> dict:
+    return generic_dir(data, to_parquet, data_dir, "parquet", **options)
 
 
-def generic_dir(data, to_disk: toolz.functoolz.curry, data_dir="altairdata") -> None:
-    os.makedirs(data_dir, exist_ok=True)
-    return toolz.curried.pipe(
-        data, to_disk(filename=data_dir + "/{prefix} -{hash}.{extension}")
-    )
+def generic_dir(
+    data,
+    to_disk: toolz.functoolz.curry,
+    data_dir="altairdata",
+    extension="json",
+    max_bytes=None,
+    max_age_seconds=None,
+    downsample=None,
+) -> dict:
+    if downsample is not None:
+        data = downsample_for_plot(data, **downsample)
+    cache = data_cache(data_dir, max_bytes, max_age_seconds)
+    return cache.write(data, to_disk, extension)
@@ -0,0 +1,188 @@
+import hashlib
+import io
+import os
+import re
+from collections.abc import Iterator
+from typing import Any
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+import pyarrow.interchange
+import pyarrow.ipc
+import pyarrow.parquet as pq
+import toolz
+
+# Fields in Vega expressions, like `datum.x` or `datum["x"]`.
+_DATUM = re.compile(r"""datum(?:\.(\w+)|\[["'](.+?)["']\])""")
+
+# Arrow types that the JavaScript Arrow library of Vega reads, for those it may not.
+_VEGA_TYPES = {
+    pa.large_string(): pa.string(),
+    pa.large_binary(): pa.binary(),
+}
+
+
+@toolz.curry
+def to_arrow(
+    data: Any,
+    prefix: str = "altair-data",
+    extension: str = "arrow",
+    filename: str = "{prefix}-{hash}.{extension}",
+    urlpath: str = "",
+) -> dict[str, Any]:
+    """Writes the data of a chart to an Arrow IPC file, like `alt.to_json`.
+
+    The file is uncompressed and uses types that Vega's `arrow` format reads. An
+    Arrow IPC file is the same as a Feather (version 2) file.
+    """
+    table = _for_vega(_to_table(data))
+    buffer = io.BytesIO()
+    with pa.ipc.new_file(buffer, table.schema) as writer:
+        writer.write_table(table)
+    return _write(buffer.getvalue(), "arrow", prefix, extension, filename, urlpath)
+
+
+@toolz.curry
+def to_parquet(
+    data: Any,
+    prefix: str = "altair-data",
+    extension: str = "parquet",
+    filename: str = "{prefix}-{hash}.{extension}",
+    urlpath: str = "",
+) -> dict[str, Any]:
+    """Writes the data of a chart to a Parquet file, like `alt.to_json`.
+
+    Vega itself cannot read Parquet files, so this is for renderers that register
+    a loader for the `parquet` format.
+    """
+    buffer = io.BytesIO()
+    pq.write_table(_to_table(data), buffer)
+    return _write(buffer.getvalue(), "parquet", prefix, extension, filename, urlpath)
+
+
+def project_chart_data(chart: alt.TopLevelMixin) -> alt.TopLevelMixin:
+    """Keeps only the columns of a chart's dataframes that the chart refers to.
+
+    A column is kept if any string of the specification refers to it, as a field
+    (e.g. `"mean(y):Q"` of an encoding or tooltip) or as `datum.y` or
+    `datum["y"]` in an expression. Dataframes of which no column is referred to,
+    e.g. for a chart that only counts rows, are kept as they are. Tooltips that
+    show all fields of the data only show the kept ones.
+
+    Parameters
+    ----------
+    chart : alt.TopLevelMixin
+        Any chart, including layered, concatenated and faceted ones.
+
+    Returns
+    -------
+    alt.TopLevelMixin
+        A copy of the chart with projected dataframes, which are written much
+        faster by the data transformers, especially as Arrow or Parquet.
+    """
+    chart = chart.copy(deep=True)
+    fields = {field for string in _strings(chart) for field in _fields(string)}
+    for node in _nodes(chart):
+        data = node._kwds.get("data")
+        if not isinstance(data, pd.DataFrame) and not hasattr(data, "select"):
+            continue
+        kept = [c for c in data.columns if str(c) in fields]
+        if not kept or len(kept) == len(data.columns):
+            continue
+        if isinstance(data, pd.DataFrame):
+            node._kwds["data"] = data[kept]
+        else:
+            node._kwds["data"] = data.select(kept)
+    return chart
+
+
+def _fields(string: str) -> set[str]:
+    """The names of the columns that a string of a specification may refer to."""
+    fields = {string}
+    for dotted, quoted in _DATUM.findall(string):
+        fields.add(dotted or quoted)
+    field = alt.utils.parse_shorthand(string).get("field")
+    if field is not None:
+        # Vega-Lite escapes dots, which otherwise access nested fields.
+        fields |= {field, field.replace("\\.", "."), field.split(".")[0]}
+    return fields
+
+
+def _strings(obj: Any) -> Iterator[str]:
+    """All strings in a specification, except in its data."""
+    if isinstance(obj, alt.SchemaBase):
+        obj = obj._kwds
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key != "data":
+                yield from _strings(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _strings(value)
+    elif isinstance(obj, str):
+        yield obj
+
+
+def _nodes(obj: Any) -> Iterator[alt.SchemaBase]:
+    """All parts of a specification, like the layers of a chart."""
+    if isinstance(obj, alt.SchemaBase):
+        yield obj
+        obj = obj._kwds
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key != "data":
+                yield from _nodes(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _nodes(value)
+
+
+def _to_table(data: Any) -> pa.Table:
+    """Converts the data of a chart to Arrow, without pandas for other frames."""
+    if isinstance(data, pd.DataFrame):
+        return pa.Table.from_pandas(data, preserve_index=False)
+    if isinstance(data, dict):
+        if "values" not in data:
+            raise KeyError("values expected in data dict, but not present.")
+        return pa.Table.from_pylist(data["values"])
+    if hasattr(data, "to_arrow"):
+        # E.g. polars, whose own conversion avoids the interchange protocol.
+        return data.to_arrow()
+    if hasattr(data, "__dataframe__"):
+        return pa.interchange.from_dataframe(data)
+    raise NotImplementedError(
+        "to_arrow and to_parquet only work with data expressed as a DataFrame or "
+        "as a dict"
+    )
+
+
+def _for_vega(table: pa.Table) -> pa.Table:
+    """Casts large strings and dictionaries to types that Vega reads."""
+    fields = []
+    for field in table.schema:
+        field_type = field.type
+        if pa.types.is_dictionary(field_type):
+            field_type = pa.dictionary(
+                pa.int32(),
+                _VEGA_TYPES.get(field_type.value_type, field_type.value_type),
+            )
+        fields.append(field.with_type(_VEGA_TYPES.get(field_type, field_type)))
+    schema = pa.schema(fields)
+    return table if schema == table.schema else table.cast(schema)
+
+
+def _write(
+    content: bytes,
+    format_type: str,
+    prefix: str,
+    extension: str,
+    filename: str,
+    urlpath: str,
+) -> dict[str, Any]:
+    """Writes a file named after the hash of `content`, like `alt.to_json`."""
+    data_hash = hashlib.md5(content).hexdigest()  # noqa: S324
+    filename = filename.format(prefix=prefix, hash=data_hash, extension=extension)
+    with open(filename, "wb") as f:
+        f.write(content)
+    return {"url": os.path.join(urlpath, filename), "format": {"type": format_type}}
@@ -0,0 +1,259 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+# Methods to choose the points that are kept.
+METHODS = ("lttb", "minmax")
+
+# Name of the temporary column that numbers the rows.
+_ROW = "__camminapy_row__"
+
+
+def downsample_for_plot(
+    data: Any,
+    x: str | None = None,
+    y: list[str] | None = None,
+    group: list[str] | None = None,
+    method: str = "lttb",
+    width: int = 1400,
+    points_per_pixel: float = 2,
+) -> Any:
+    """Keeps a few rows per horizontal pixel of every series of a line chart.
+
+    Parameters
+    ----------
+    data : Any
+        A pandas or polars dataframe. Other data is returned as it is.
+    x : str | None
+        The column on the horizontal axis. Defaults to the first temporal column,
+        or else the first numeric column that is sorted within every series.
+    y : list[str] | None
+        The columns whose shape is kept. Defaults to all other numeric columns.
+    group : list[str] | None
+        The columns that tell the series apart, i.e. the color or detail fields of
+        the chart. Defaults to all string, categorical and boolean columns.
+    method : str
+        `"lttb"` (Largest-Triangle-Three-Buckets) keeps the row of every bucket
+        that spans the largest triangle with the rows kept before and after it.
+        `"minmax"` keeps the rows with the smallest and largest value of every
+        bucket. Both always keep the first and last row of every series.
+    width : int
+        The width of the chart in pixels, see `altair_theme_gray`.
+    points_per_pixel : float
+        How many rows are kept per pixel and series. The buckets span the same
+        range of `x` for all series, so that they line up with the pixels.
+
+    Returns
+    -------
+    Any
+        The kept rows in their original order, of the same type as `data`. The
+        union of the rows kept for each of `y` is returned, and `data` as it is if
+        it is not larger than the number of points that are kept, or if there is
+        no column for the horizontal axis.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, use one of {METHODS}.")
+    is_pandas = isinstance(data, pd.DataFrame)
+    if not is_pandas and not isinstance(data, pl.DataFrame):
+        return data
+    n_points = int(width * points_per_pixel)
+    if len(data) <= n_points:
+        return data
+
+    df = pl.from_pandas(data) if is_pandas else data
+    group = _default_group(df) if group is None else group
+    # Every series is identified by the position of its first row.
+    if group:
+        key = (
+            df.select(group)
+            .with_row_count(_ROW)
+            .select(pl.col(_ROW).min().over(group))
+            .to_series()
+            .to_numpy()
+        )
+    else:
+        key = np.zeros(len(df), dtype=np.int64)
+    x = _default_x(df, group, key) if x is None else x
+    if x is None:
+        return data
+    if y is None:
+        y = [c for c, t in df.schema.items() if _is_numeric(t) and c not in (x, *group)]
+
+    x_values = df[x].to_physical().cast(pl.Float64).to_numpy()
+    order = _sort_order(key, x_values)
+    order = order[~np.isnan(x_values[order])]
+    series, x_values = key[order], x_values[order]
+
+    n_buckets = max(n_points - 2 if method == "lttb" else n_points // 2, 1)
+    bucket = np.zeros(len(order), dtype=np.int64)
+    if len(order) > 0 and x_values.max() > x_values.min():
+        scaled = (x_values - x_values.min()) / (x_values.max() - x_values.min())
+        bucket = np.minimum((scaled * n_buckets).astype(np.int64), n_buckets - 1)
+
+    choose = _lttb if method == "lttb" else _minmax
+    kept = [_ends(series)]
+    for column in y:
+        y_values = df[column].cast(pl.Float64).to_numpy()[order]
+        valid = np.flatnonzero(~np.isnan(y_values))
+        kept.append(
+            valid[
+                choose(series[valid], x_values[valid], y_values[valid], bucket[valid])
+            ]
+        )
+    rows = np.unique(order[np.concatenate(kept)])
+    return data.iloc[rows] if is_pandas else data[rows]
+
+
+def _sort_order(key: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """The order of the rows by `key` and then by `x`, with missing `x` last."""
+    if _is_sorted(key, x):
+        return np.arange(len(key))
+    return np.lexsort((x, key))
+
+
+def _is_sorted(key: np.ndarray, x: np.ndarray) -> bool:
+    """Whether the rows are sorted by `key` and then by `x`."""
+    return bool(
+        ((key[1:] > key[:-1]) | ((key[1:] == key[:-1]) & (x[1:] >= x[:-1]))).all()
+    )
+
+
+def _default_group(df: pl.DataFrame) -> list[str]:
+    """The string, categorical and boolean columns."""
+    return [
+        c for c, t in df.schema.items() if t in (pl.Utf8, pl.Categorical, pl.Boolean)
+    ]
+
+
+def _default_x(df: pl.DataFrame, group: list[str], key: np.ndarray) -> str | None:
+    """The first temporal column, or the first numeric one that is sorted."""
+    for column, dtype in df.schema.items():
+        if dtype in pl.TEMPORAL_DTYPES:
+            return column
+    order = None if _is_sorted(key, key) else np.argsort(key, kind="stable")
+    for column, dtype in df.schema.items():
+        if not _is_numeric(dtype) or column in group:
+            continue
+        x = df[column].cast(pl.Float64).to_numpy()
+        if order is None:
+            is_sorted = _is_sorted(key, x)
+        else:
+            is_sorted = _is_sorted(key[order], x[order])
+        if is_sorted:
+            return column
+    return None
+
+
+def _is_numeric(dtype: pl.PolarsDataType) -> bool:
+    return dtype in pl.NUMERIC_DTYPES
+
+
+def _is_new_run(values: np.ndarray) -> np.ndarray:
+    """Whether every value differs from the previous one."""
+    is_new = np.ones(len(values), dtype=bool)
+    is_new[1:] = values[1:] != values[:-1]
+    return is_new
+
+
+def _ends(series: np.ndarray) -> np.ndarray:
+    """The first and last row of every series."""
+    is_first = _is_new_run(series)
+    is_last = np.r_[is_first[1:], True]
+    return np.flatnonzero(is_first | is_last)
+
+
+def _minmax(
+    series: np.ndarray, x: np.ndarray, y: np.ndarray, bucket: np.ndarray
+) -> np.ndarray:
+    """The rows with the smallest and largest `y` of every bucket of every series.
+
+    The rows must be sorted by `series` and then by `x`.
+    """
+    is_new = _is_new_run(series) | _is_new_run(bucket)
+    segment = np.cumsum(is_new) - 1
+    start = np.flatnonzero(is_new)
+    return np.concatenate(
+        [
+            _first_where(y == np.minimum.reduceat(y, start)[segment], segment),
+            _first_where(y == np.maximum.reduceat(y, start)[segment], segment),
+        ]
+    )
+
+
+def _first_where(condition: np.ndarray, segment: np.ndarray) -> np.ndarray:
+    """The first row of every segment where `condition` holds."""
+    candidates = np.flatnonzero(condition)
+    return candidates[_is_new_run(segment[candidates])]
+
+
+def _lttb(
+    series: np.ndarray, x: np.ndarray, y: np.ndarray, bucket: np.ndarray
+) -> np.ndarray:
+    """The row of every bucket of every series that LTTB keeps.
+
+    The rows must be sorted by `series` and then by `x`. Every bucket depends on
+    the row kept in the previous bucket, so this loops over the buckets, but
+    handles the same bucket of all series at once.
+    """
+    if len(x) == 0:
+        return np.zeros(0, dtype=np.int64)
+    s = _Segments(series, bucket)
+    anchor_x, anchor_y = s.next_anchor(x, y)
+    previous_x = x[s.series_start]
+    previous_y = y[s.series_start]
+
+    kept = []
+    for segments in s.by_rank():
+        lengths = s.stop[segments] - s.start[segments]
+        local = np.repeat(np.arange(len(segments)), lengths)
+        offset = np.cumsum(lengths) - lengths
+        rows = np.arange(lengths.sum()) - offset[local] + s.start[segments][local]
+
+        which = s.series[segments][local]
+        px, py = previous_x[which], previous_y[which]
+        nx, ny = anchor_x[segments][local], anchor_y[segments][local]
+        area = np.abs((px - nx) * (y[rows] - py) - (px - x[rows]) * (ny - py))
+
+        largest = np.maximum.reduceat(area, offset)
+        best = rows[_first_where(area == largest[local], local)]
+        previous_x[s.series[segments]] = x[best]
+        previous_y[s.series[segments]] = y[best]
+        kept.append(best)
+    return np.concatenate(kept)
+
+
+class _Segments:
+    """The runs of rows of the same series and bucket, see `_lttb`."""
+
+    def __init__(self, series: np.ndarray, bucket: np.ndarray) -> None:
+        is_first = _is_new_run(series)
+        self.series_start = np.flatnonzero(is_first)
+        self.series_stop = np.r_[self.series_start[1:], len(series)]
+        is_new = is_first | _is_new_run(bucket)
+        self.start = np.flatnonzero(is_new)
+        self.stop = np.r_[self.start[1:], len(series)]
+        # The position of the series of every segment, and the rank of the
+        # segment within its series.
+        self.series = np.cumsum(is_first)[self.start] - 1
+        first_segment = np.flatnonzero(_is_new_run(self.series))
+        self.rank = np.arange(len(self.start)) - first_segment[self.series]
+
+    def next_anchor(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, ...]:
+        """The mean of the next segment, or the last row of the series."""
+        counts = self.stop - self.start
+        mean_x = np.add.reduceat(x, self.start) / counts
+        mean_y = np.add.reduceat(y, self.start) / counts
+        is_last = np.r_[self.series[1:] != self.series[:-1], True]
+        last_row = self.series_stop[self.series] - 1
+        anchor_x = np.where(is_last, x[last_row], np.r_[mean_x[1:], 0.0])
+        anchor_y = np.where(is_last, y[last_row], np.r_[mean_y[1:], 0.0])
+        return anchor_x, anchor_y
+
+    def by_rank(self) -> list[np.ndarray]:
+        """The segments of every rank, e.g. the first bucket of every series."""
+        order = np.argsort(self.rank, kind="stable")
+        ranks = self.rank[order]
+        cuts = np.flatnonzero(_is_new_run(ranks))
+        return np.split(order, cuts[1:])
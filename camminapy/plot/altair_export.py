@@ -0,0 +1,114 @@
+import os
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import altair as alt
+import pandas as pd
+import polars as pl
+
+from camminapy.plot.altair_data import _nodes, to_arrow, to_parquet
+from camminapy.plot.altair_theme import altair_theme_gray
+from camminapy.plot.data_cache import DataCache
+
+# Functions that write the data of charts, by format.
+DATA_FORMATS = {
+    "csv": alt.to_csv,
+    "json": alt.to_json,
+    "arrow": to_arrow,
+    "parquet": to_parquet,
+}
+
+# Formats of the charts that are exported.
+FILE_FORMATS = ("html", "json")
+
+
+def export_charts(
+    charts: Mapping[str, alt.TopLevelMixin] | Sequence[alt.TopLevelMixin],
+    out_dir: str | Path,
+    file_format: str = "html",
+    data_format: str = "json",
+    max_workers: int | None = None,
+) -> dict[str, Path]:
+    """Saves many charts at once, writing every distinct dataframe only once.
+
+    The dataframes of all charts, including those of layers and concatenated
+    charts, are written to `out_dir/data`, named after a hash of their content
+    (see `DataCache`). A dataframe that several charts use, or several equal
+    dataframes, are thus hashed and written only once, and every chart refers
+    to the shared file by a url relative to `out_dir`. The charts are then
+    saved with the gray theme of `altair_theme`. Both the data and the charts
+    are written by a pool of threads.
+
+    Parameters
+    ----------
+    charts : Mapping[str, alt.TopLevelMixin] | Sequence[alt.TopLevelMixin]
+        The charts by the name of their file, or a list of charts, which are named
+        `chart-0`, `chart-1`, and so on.
+    out_dir : str | Path
+        The directory that the charts are saved to.
+    file_format : str
+        `"html"` or `"json"` (a Vega-Lite specification).
+    data_format : str
+        `"csv"`, `"json"`, `"arrow"` or `"parquet"`, see `altair_setup`. Vega
+        reads all but Parquet, which needs a renderer with a Parquet loader.
+    max_workers : int | None
+        How many threads write the data and the charts. Defaults to that of a
+        `ThreadPoolExecutor`.
+
+    Returns
+    -------
+    dict[str, Path]
+        The file of every chart, by the name of the chart.
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(
+            f"Unknown file format {file_format!r}, use one of {FILE_FORMATS}."
+        )
+    if data_format not in DATA_FORMATS:
+        raise ValueError(
+            f"Unknown data format {data_format!r}, use one of {list(DATA_FORMATS)}."
+        )
+    if not isinstance(charts, Mapping):
+        charts = {f"chart-{i}": chart for i, chart in enumerate(charts)}
+    out_dir = Path(out_dir)
+    cache = DataCache(out_dir / "data")
+
+    # Copies of the charts, which share the dataframes of the original ones.
+    charts = {name: chart.copy(deep=True) for name, chart in charts.items()}
+    nodes = [
+        node
+        for chart in charts.values()
+        for node in _nodes(chart)
+        if isinstance(node._kwds.get("data"), (pd.DataFrame, pl.DataFrame))
+    ]
+    # The same dataframe object is only hashed once.
+    datasets = {id(node._kwds["data"]): node._kwds["data"] for node in nodes}
+
+    to_disk = DATA_FORMATS[data_format]
+    paths = {name: out_dir / f"{name}.{file_format}" for name in charts}
+    alt.themes.register("theme_gray", altair_theme_gray)
+    with ThreadPoolExecutor(max_workers) as executor, alt.themes.enable("theme_gray"):
+        written = executor.map(
+            lambda data: cache.write(data, to_disk, data_format), datasets.values()
+        )
+        urls = dict(zip(datasets, written, strict=True))
+        for node in nodes:
+            url = urls[id(node._kwds["data"])]
+            node._kwds["data"] = alt.UrlData(
+                url=Path(os.path.relpath(url["url"], out_dir)).as_posix(),
+                format=url["format"],
+            )
+        # Consumes the results, which raises the first error of any chart.
+        list(
+            executor.map(
+                _save, charts.values(), paths.values(), [file_format] * len(charts)
+            )
+        )
+    return paths
+
+
+def _save(chart: alt.TopLevelMixin, path: Path, file_format: str) -> None:
+    """Saves a chart whose data is in files already."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    chart.save(str(path), format=file_format)
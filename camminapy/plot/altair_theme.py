@@ -1,6 +1,14 @@
 from typing import Any
 
 
+def altair_theme() -> None:
+    import altair as alt
+
+    for _ in range(2):
+        alt.themes.register("theme_gray", altair_theme_gray)
+        alt.themes.enable("theme_gray")
+
+
 def altair_theme_gray() -> dict[str, Any]:
     """A simple altair theme.
 
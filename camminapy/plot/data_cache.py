@@ -0,0 +1,205 @@
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import toolz
+
+# Name of the files that `DataCache` writes, like altair's own default.
+_FILENAME = "altair-data-{hash}.{extension}"
+
+
+@dataclass
+class _Entry:
+    size: int
+    last_used: float
+
+
+class DataCache:
+    """Writes the data of charts to files named after a hash of their content.
+
+    Dataframes are hashed without serializing them, so a chart whose data was
+    already written reuses that file instead of writing it again. The files in
+    `data_dir` are indexed once per process, which also picks up files of earlier
+    processes. After every write, files that were not used for more than
+    `max_age_seconds` are deleted, and then the least recently used files until
+    all files take at most `max_bytes`.
+
+    Use `data_cache` to get the cache of a directory, which is shared by all
+    charts of the process.
+    """
+
+    def __init__(
+        self,
+        data_dir: str | Path,
+        max_bytes: int | None = None,
+        max_age_seconds: float | None = None,
+    ) -> None:
+        self.data_dir = Path(data_dir)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._index: dict[str, _Entry] | None = None
+        self._lock = threading.Lock()
+
+    def write(
+        self, data: Any, to_disk: toolz.functoolz.curry, extension: str
+    ) -> dict[str, Any]:
+        """Writes `data` with `to_disk` unless the same data was written before.
+
+        Parameters
+        ----------
+        data : Any
+            The data of a chart, e.g. a pandas or polars dataframe.
+        to_disk : toolz.functoolz.curry
+            Either `alt.to_json` or `alt.to_csv`.
+        extension : str
+            The extension of the files that `to_disk` writes.
+
+        Returns
+        -------
+        dict[str, Any]
+            The url and format of the file, like `to_disk` returns. Data that
+            cannot be hashed cheaply, like a dict of values, is written by
+            `to_disk` under the hash of its serialized form.
+        """
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        key = fingerprint(data)
+        if key is None:
+            filename = os.path.join(self.data_dir, _FILENAME)
+            url = toolz.curried.pipe(data, to_disk(filename=filename))
+            self._add(Path(url["url"]).name)
+            return url
+
+        name = _FILENAME.format(hash=key, extension=extension)
+        url = {
+            "url": os.path.join(self.data_dir, name),
+            "format": {"type": extension},
+        }
+        if self._touch(name):
+            return url
+
+        # Written under a temporary name first, so that other processes never see
+        # a partially written file.
+        temporary = self.data_dir / f".{name}.{os.getpid()}.{threading.get_ident()}"
+        toolz.curried.pipe(data, to_disk(filename=str(temporary)))
+        os.replace(temporary, self.data_dir / name)
+        self._add(name)
+        return url
+
+    def clear(self) -> None:
+        """Deletes all files of the cache."""
+        with self._lock:
+            for name in self._load():
+                (self.data_dir / name).unlink(missing_ok=True)
+            self._index = {}
+
+    def _load(self) -> dict[str, _Entry]:
+        """The index of all files, which is built on first use."""
+        if self._index is None:
+            self._index = {}
+            for path in self.data_dir.glob(_FILENAME.format(hash="*", extension="*")):
+                stat = path.stat()
+                self._index[path.name] = _Entry(stat.st_size, stat.st_mtime)
+        return self._index
+
+    def _touch(self, name: str) -> bool:
+        """Marks a file as used, and whether it exists."""
+        with self._lock:
+            entry = self._load().get(name)
+            path = self.data_dir / name
+            if entry is None or not path.exists():
+                return False
+            entry.last_used = time.time()
+            # The modification time keeps the order of use for other processes.
+            os.utime(path, (entry.last_used, entry.last_used))
+            return True
+
+    def _add(self, name: str) -> None:
+        """Adds a newly written file to the index and evicts other files."""
+        with self._lock:
+            index = self._load()
+            index[name] = _Entry((self.data_dir / name).stat().st_size, time.time())
+            self._evict(keep=name)
+
+    def _evict(self, keep: str) -> None:
+        index = self._load()
+        now = time.time()
+        total = sum(entry.size for entry in index.values())
+        for name, entry in sorted(index.items(), key=lambda item: item[1].last_used):
+            too_old = (
+                self.max_age_seconds is not None
+                and now - entry.last_used > self.max_age_seconds
+            )
+            too_large = self.max_bytes is not None and total > self.max_bytes
+            if name == keep or not (too_old or too_large):
+                continue
+            (self.data_dir / name).unlink(missing_ok=True)
+            del index[name]
+            total -= entry.size
+
+
+def fingerprint(data: Any) -> str | None:
+    """A hash of the content of a pandas or polars dataframe.
+
+    The hash combines the names and dtypes of the columns with the hash of every
+    row, which pandas and polars compute without serializing the data. Returns
+    `None` for other data and for columns that cannot be hashed, like lists in a
+    pandas column.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        if isinstance(data, pd.DataFrame) and not hasattr(data, "__geo_interface__"):
+            schema = [
+                (str(column), str(dtype)) for column, dtype in data.dtypes.items()
+            ]
+            row_hashes = pd.util.hash_pandas_object(data, index=False)
+        elif type(data).__module__.startswith("polars") and hasattr(data, "hash_rows"):
+            schema = [(column, str(dtype)) for column, dtype in data.schema.items()]
+            row_hashes = data.hash_rows(seed=0, seed_1=1, seed_2=2, seed_3=3)
+        else:
+            return None
+        digest.update(repr(schema).encode())
+        digest.update(row_hashes.to_numpy().tobytes())
+    except TypeError:
+        return None
+    return digest.hexdigest()
+
+
+# One cache per directory, shared by all transformers of the process.
+_CACHES: dict[Path, DataCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def data_cache(
+    data_dir: str | Path,
+    max_bytes: int | None = None,
+    max_age_seconds: float | None = None,
+) -> DataCache:
+    """The cache of `data_dir`, with the given limits.
+
+    Parameters
+    ----------
+    data_dir : str | Path
+        The directory that the data files are written to.
+    max_bytes : int | None
+        How many bytes the files may take in total. `None` for no limit.
+    max_age_seconds : float | None
+        After how many seconds without use a file is deleted. `None` for no limit.
+
+    Returns
+    -------
+    DataCache
+        The same cache for every call with the same directory.
+    """
+    key = Path(data_dir).resolve()
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = _CACHES[key] = DataCache(data_dir)
+    cache.max_bytes = max_bytes
+    cache.max_age_seconds = max_age_seconds
+    return cache
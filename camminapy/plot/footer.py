@@ -1,12 +1,113 @@
 import datetime
 import os
 import pwd
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
 import altair as alt
 from git import Repo  # type: ignore
 
 
+@dataclass(frozen=True)
+class GitSnapshot:
+    """The state of a repository that the footer shows.
+
+    `n_untracked` is `None` if the untracked files were not counted.
+    """
+
+    commit: str
+    is_dirty: bool
+    n_untracked: int | None
+
+
+@dataclass
+class _CacheEntry:
+    repo: Repo
+    state: tuple | None = None
+    read_at: float = 0.0
+    snapshot: GitSnapshot | None = None
+
+
+# The repositories by path, shared by all footers of the process.
+_CACHE: dict[tuple[str, bool], _CacheEntry] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def git_snapshot(
+    path: str, untracked_files: bool = True, ttl_seconds: float = 10.0
+) -> GitSnapshot:
+    """The commit, dirty state and number of untracked files of a repository.
+
+    Parameters
+    ----------
+    path : str
+        The root of the repository.
+    untracked_files : bool
+        Whether to count the untracked files, which scans the whole working tree.
+    ttl_seconds : float
+        For how long a snapshot is reused. A snapshot is read again earlier if
+        `HEAD`, the branch it points to or the index changed, which only takes a
+        few `stat` calls to check. Edits of tracked files that are not staged only
+        show up once the snapshot expired.
+
+    Returns
+    -------
+    GitSnapshot
+        The snapshot, which is shared by all calls with the same arguments.
+    """
+    with _CACHE_LOCK:
+        key = (os.path.abspath(path), untracked_files)
+        entry = _CACHE.get(key)
+        if entry is None:
+            entry = _CACHE[key] = _CacheEntry(Repo(path))
+        now = time.monotonic()
+        if (
+            entry.snapshot is None
+            or _git_state(entry.repo) != entry.state
+            or now - entry.read_at > ttl_seconds
+        ):
+            entry.snapshot = _read_snapshot(entry.repo, untracked_files)
+            # Checking the dirty state can refresh the index, so this comes after.
+            entry.state = _git_state(entry.repo)
+            entry.read_at = now
+        return entry.snapshot
+
+
+def clear_git_cache() -> None:
+    """Forgets all repositories and their snapshots."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def _read_snapshot(repo: Repo, untracked_files: bool) -> GitSnapshot:
+    return GitSnapshot(
+        commit=str(repo.head.commit),
+        is_dirty=repo.is_dirty(untracked_files=False),
+        n_untracked=len(repo.untracked_files) if untracked_files else None,
+    )
+
+
+def _git_state(repo: Repo) -> tuple:
+    """The content of `HEAD` and the modification times of what it depends on."""
+    git_dir = Path(repo.git_dir)
+    common_dir = Path(repo.common_dir)
+    head = (git_dir / "HEAD").read_text().strip()
+    paths = [git_dir / "HEAD", git_dir / "index", common_dir / "packed-refs"]
+    if head.startswith("ref: "):
+        paths.append(common_dir / head.removeprefix("ref: "))
+    return (head, *(_mtime(p) for p in paths))
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
 class Footer:
     """Add `.properties(title=Footer(repo).create())` to your plot to create a footer.
 
@@ -15,13 +116,29 @@ class Footer:
     Workaround:
     Add `.properties(title={"text": "ACTUAL PLOT TITLE", **Footer().subtitle()})`
     Then it is not a footer but a subtitle.
+
+    The git information is read once per process and reused by all footers of the
+    same repository, see `git_snapshot`. Pass `untracked_files=False` to skip the
+    count of untracked files, which scans the whole working tree.
     """
 
-    def __init__(self, path: str | None = None):
+    def __init__(
+        self,
+        path: str | None = None,
+        untracked_files: bool = True,
+        ttl_seconds: float = 10.0,
+    ):
         if path is None:
             path = os.getcwd()
         self.path = path
-        self.repo = Repo(self.path)
+        self.untracked_files = untracked_files
+        self.ttl_seconds = ttl_seconds
+
+    @property
+    def repo(self) -> Repo:
+        """The repository, which is shared by all footers of the same path."""
+        git_snapshot(self.path, self.untracked_files, self.ttl_seconds)
+        return _CACHE[(os.path.abspath(self.path), self.untracked_files)].repo
 
     def get_username(self) -> str:
         """Returns the username."""
@@ -37,11 +154,13 @@ class Footer:
 
     def get_git_status(self) -> str:
         """Returns git information."""
-        commit = str(self.repo.head.commit)
-        is_dirty = self.repo.is_dirty
-        n = str(len(self.repo.untracked_files))
-
-        return f"""{commit}, {"dirty," if is_dirty else ""} {n} untracked files"""
+        snapshot = git_snapshot(self.path, self.untracked_files, self.ttl_seconds)
+        status = [snapshot.commit]
+        if snapshot.is_dirty:
+            status.append("dirty")
+        if snapshot.n_untracked is not None:
+            status.append(f"{snapshot.n_untracked} untracked files")
+        return ", ".join(status)
 
     def create_list(self) -> list[str]:
         """Creates a list of strings containing the footer content."""
@@ -17,6 +17,20 @@ class Config:
     logger_file_fmt: str = (
         "%(levelname)s %(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] \t%(message)s"
     )
+    # Write the log file as one JSON object per line instead of `logger_file_fmt`.
+    logger_file_json: bool = False
+    # Format and write records on a background thread instead of the calling one.
+    logger_queue: bool = False
+    # Log a message from the same line of code at most once per this many seconds.
+    # Warnings and errors are never dropped. Zero logs everything.
+    logger_rate_limit_seconds: float = 0.0
+
+    # Record the time and rows of every stage of the resample functions into
+    # `camminapy.utils.metrics.metrics`.
+    metrics_enabled: bool = False
+    # Also record the memory peak of every stage. This only sees memory allocated
+    # by Python and numpy, and slows down everything that allocates.
+    metrics_trace_memory: bool = False
 
 
 config = Config()
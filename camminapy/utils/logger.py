@@ -1,28 +1,182 @@
+import atexit
+import copy
+import datetime
+import json
 import logging
+import logging.handlers
 import os
-
-from rich.logging import RichHandler
+import queue
+import threading
 
 from camminapy.utils.config import config
 
 logger = logging.getLogger(__name__)
+logger.setLevel(config.logger_level)
 
-shell_handler = RichHandler()
-if not os.path.exists(config.foldername_log):
-    os.makedirs(config.foldername_log)
+# The background thread that writes the records in `config.logger_queue` mode.
+_listener: logging.handlers.QueueListener | None = None
+_setup_lock = threading.RLock()
 
-file_handler = logging.FileHandler(config.filename_debug_log)
 
-logger.setLevel(config.logger_level)
-shell_handler.setLevel(config.logger_shell_level)
-file_handler.setLevel(config.logger_file_level)
+def configure_logger() -> None:
+    """(Re)creates the handlers of `logger` from the current `config`.
+
+    This happens automatically when the first record is logged. Call it again
+    after changing the logger settings of `config`. Records that are still queued
+    from before are written first.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for handler in logger.handlers:
+            handler.close()
+        logger.filters = [
+            f for f in logger.filters if not isinstance(f, _RateLimitFilter)
+        ]
+
+        handlers = _create_handlers()
+        if config.logger_queue:
+            records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+            _listener = logging.handlers.QueueListener(
+                records, *handlers, respect_handler_level=True
+            )
+            _listener.start()
+            handlers = [_QueueHandler(records)]
+        if config.logger_rate_limit_seconds > 0:
+            logger.addFilter(_RateLimitFilter(config.logger_rate_limit_seconds))
+        # Assign a new list, `Logger.callHandlers` may be iterating the old one.
+        logger.handlers = handlers
+
+
+def _stop_listener() -> None:
+    """Writes all queued records before the interpreter exits."""
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
+
+
+def _create_handlers() -> list[logging.Handler]:
+    """Creates the shell and file handler, and the log folder if necessary."""
+    from rich.logging import RichHandler
+
+    shell_handler = RichHandler()
+    if not os.path.exists(config.foldername_log):
+        os.makedirs(config.foldername_log)
+
+    file_handler = logging.FileHandler(config.filename_debug_log)
+
+    shell_handler.setLevel(config.logger_shell_level)
+    file_handler.setLevel(config.logger_file_level)
+
+    shell_formatter = logging.Formatter(config.logger_shell_fmt)
+    if config.logger_file_json:
+        file_formatter: logging.Formatter = _JsonFormatter()
+    else:
+        file_formatter = logging.Formatter(config.logger_file_fmt)
+
+    shell_handler.setFormatter(shell_formatter)
+    file_handler.setFormatter(file_formatter)
+
+    return [shell_handler, file_handler]
+
+
+class _JsonFormatter(logging.Formatter):
+    """Formats a record as a single line of JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "file": record.filename,
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        return json.dumps(entry)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records without merging the traceback into the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Makes the record picklable, with the traceback as `exc_text`."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_formatter = logging.Formatter()
+
+
+class _RateLimitFilter(logging.Filter):
+    """Drops records from a line of code that logged less than `seconds` ago.
+
+    The next record from that line that passes carries the number of records
+    that were dropped in between as `record.suppressed`.
+    """
+
+    def __init__(self, seconds: float):
+        super().__init__()
+        self.seconds = seconds
+        self._last_logged: dict[tuple[str, int], float] = {}
+        self._suppressed: dict[tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Whether the record should be logged."""
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            last_logged = self._last_logged.get(key)
+            if last_logged is not None and record.created - last_logged < self.seconds:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            self._last_logged[key] = record.created
+            suppressed = self._suppressed.pop(key, 0)
+        if suppressed > 0:
+            record.suppressed = suppressed
+            record.msg = f"{record.getMessage()} ({suppressed} similar suppressed)"
+            record.args = None
+        return True
+
+
+class _DeferredHandler(logging.Handler):
+    """Stands in for the actual handlers until the first record is logged.
+
+    This way, importing camminapy neither imports rich nor creates the log folder
+    and file, which only happens once something is logged.
+    """
 
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Replaces itself by the actual handlers and passes `record` on."""
+        with _setup_lock:
+            if self in logger.handlers:
+                configure_logger()
+        for log_filter in logger.filters:
+            if not log_filter.filter(record):
+                return False
+        for handler in logger.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
 
-shell_formatter = logging.Formatter(config.logger_shell_fmt)
-file_formatter = logging.Formatter(config.logger_file_fmt)
+    def emit(self, record: logging.LogRecord) -> None:
+        """Unused, see `handle`."""
 
-shell_handler.setFormatter(shell_formatter)
-file_handler.setFormatter(file_formatter)
 
-logger.addHandler(shell_handler)
-logger.addHandler(file_handler)
+logger.addHandler(_DeferredHandler())
@@ -0,0 +1,221 @@
+import contextvars
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from camminapy.utils.config import config
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+@dataclass
+class StageRecord:
+    """One run of one stage of a resample function.
+
+    `depth` counts the stages that this one runs within, like the stages of the
+    shards of a parallel run (depth 1), whose time and rows are also part of the
+    enclosing stage. `peak_bytes` is only recorded with
+    `config.metrics_trace_memory`, and only for stages that start while no other
+    stage runs, as the peak is shared by the whole process. It only covers
+    memory allocated by Python and numpy, not by polars.
+    """
+
+    stage: str
+    seconds: float
+    rows_in: int | None = None
+    rows_out: int | None = None
+    peak_bytes: int | None = None
+    depth: int = 0
+
+
+class Metrics:
+    """Collects a `StageRecord` for every stage that runs while it is active.
+
+    Either enable `config.metrics_enabled` to record into the process-wide
+    `metrics`, or use `record_metrics` to record a block of code:
+
+    ```python
+    with record_metrics() as m:
+        resample_dataframe_grouped_polars(df, "x", 0.1, "session")
+    print(m.to_polars())
+    ```
+
+    Stages that run in a thread pool are recorded too, those that run in a
+    process pool are not.
+    """
+
+    def __init__(self) -> None:
+        self.records: list[StageRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: StageRecord) -> None:
+        """Adds a record, e.g. from a stage of your own code."""
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self) -> None:
+        """Removes all records."""
+        with self._lock:
+            self.records.clear()
+
+    def to_polars(self) -> "pl.DataFrame":
+        """Aggregates the records per stage and depth, in order of first appearance.
+
+        Nested stages are kept apart from outer stages of the same name, so that
+        their rows are not counted twice.
+
+        Returns
+        -------
+        pl.DataFrame
+            The number of calls, the total seconds and rows, and the largest
+            `peak_bytes` of every stage and depth.
+        """
+        import polars as pl
+
+        with self._lock:
+            records = list(self.records)
+        return (
+            pl.DataFrame(
+                {
+                    "stage": [r.stage for r in records],
+                    "seconds": [r.seconds for r in records],
+                    "rows_in": [r.rows_in for r in records],
+                    "rows_out": [r.rows_out for r in records],
+                    "peak_bytes": [r.peak_bytes for r in records],
+                    "depth": [r.depth for r in records],
+                },
+                schema={
+                    "stage": pl.Utf8,
+                    "seconds": pl.Float64,
+                    "rows_in": pl.Int64,
+                    "rows_out": pl.Int64,
+                    "peak_bytes": pl.Int64,
+                    "depth": pl.Int64,
+                },
+            )
+            .groupby(["stage", "depth"], maintain_order=True)
+            .agg(
+                pl.count().alias("calls"),
+                pl.col("seconds").sum(),
+                pl.col("rows_in").sum(),
+                pl.col("rows_out").sum(),
+                pl.col("peak_bytes").max(),
+            )
+        )
+
+    def to_prometheus(self, prefix: str = "camminapy") -> str:
+        """Aggregates the records per stage in the Prometheus text format.
+
+        Nested stages get a `depth` label, see `to_polars`.
+        """
+        totals: dict[str, dict[str, float]] = {}
+        with self._lock:
+            for r in self.records:
+                labels = f'stage="{r.stage}"' + (
+                    f',depth="{r.depth}"' if r.depth else ""
+                )
+                total = totals.setdefault(labels, {"calls": 0, "seconds": 0})
+                total["calls"] += 1
+                total["seconds"] += r.seconds
+                for name in ["rows_in", "rows_out"]:
+                    if getattr(r, name) is not None:
+                        total[name] = total.get(name, 0) + getattr(r, name)
+                if r.peak_bytes is not None:
+                    total["peak_bytes"] = max(total.get("peak_bytes", 0), r.peak_bytes)
+
+        lines = []
+        for name, kind, description in [
+            ("calls", "counter", "Number of runs of the stage."),
+            ("seconds", "counter", "Wall time spent in the stage."),
+            ("rows_in", "counter", "Rows that went into the stage."),
+            ("rows_out", "counter", "Rows that came out of the stage."),
+            ("peak_bytes", "gauge", "Largest Python and numpy memory peak."),
+        ]:
+            metric = f"{prefix}_stage_{name}" + ("_total" if kind == "counter" else "")
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for labels, total in totals.items():
+                if name in total:
+                    lines.append(f"{metric}{{{labels}}} {total[name]:g}")
+        return "\n".join(lines) + "\n"
+
+
+# Records every stage while `config.metrics_enabled` is set.
+metrics = Metrics()
+
+_active: list[Metrics] = []
+_active_lock = threading.Lock()
+
+# How many stages enclose the code that runs in a context, see `StageRecord.depth`.
+# Thread pools need to run their tasks in a copy of the caller's context.
+_depth: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "camminapy_stage_depth", default=0
+)
+# How many stages run in the whole process, guarded by `_active_lock`.
+_n_running = 0
+
+
+@contextmanager
+def record_metrics() -> Iterator[Metrics]:
+    """Records all stages that run within the block into a new `Metrics`."""
+    collector = Metrics()
+    with _active_lock:
+        _active.append(collector)
+    try:
+        yield collector
+    finally:
+        with _active_lock:
+            _active.remove(collector)
+
+
+class _Stage:
+    """What `stage` yields, to set the number of output rows on."""
+
+    rows_out: int | None = None
+
+
+@contextmanager
+def stage(name: str, rows_in: int | None = None) -> Iterator[_Stage]:
+    """Records the wall time of a block of code as stage `name`.
+
+    Does nothing unless `config.metrics_enabled` is set or `record_metrics` is
+    active. Set `rows_out` on the yielded object to record the output rows.
+    """
+    global _n_running
+
+    collectors = ([metrics] if config.metrics_enabled else []) + _active
+    if not collectors:
+        yield _Stage()
+        return
+
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    with _active_lock:
+        # Resetting the peak of the process would corrupt that of running stages.
+        trace_memory = config.metrics_trace_memory and _n_running == 0
+        _n_running += 1
+    try:
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        current = _Stage()
+        t0 = time.perf_counter()
+        yield current
+        seconds = time.perf_counter() - t0
+
+        record = StageRecord(name, seconds, rows_in, current.rows_out, depth=depth)
+        if trace_memory:
+            record.peak_bytes = tracemalloc.get_traced_memory()[1] - memory_start
+        for collector in collectors:
+            collector.add(record)
+    finally:
+        _depth.reset(token)
+        with _active_lock:
+            _n_running -= 1
@@ -0,0 +1,13 @@
+import pytest
+
+from camminapy.utils.config import config
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _log_to_temporary_folder(tmp_path_factory: pytest.TempPathFactory):
+    """Keeps the tests from writing the log file into the repository."""
+    folder = tmp_path_factory.mktemp("logs")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(config, "foldername_log", folder)
+        monkeypatch.setattr(config, "filename_debug_log", folder / "debug.log")
+        yield
@@ -0,0 +1,91 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from camminapy.plot import aggregate_chart_data
+from camminapy.plot.altair_aggregate import _bin_extent
+
+
+def _get_df(n: int = 1000) -> pl.DataFrame:
+    np.random.seed(23)
+    return pl.DataFrame(
+        {
+            "x": np.arange(n) / 10,
+            "y": np.random.randn(n),
+            "s": np.random.choice(["a", "b"], n),
+        }
+    )
+
+
+def test_bins_like_vega():
+    assert _bin_extent(0, 99, 10, None, True) == (0, 100, 10)
+    assert _bin_extent(-4.3, 4.1, 10, None, True) == (-5, 5, 1)
+    assert _bin_extent(0, 1, 30, None, True) == (0, 1, 0.05)
+    assert _bin_extent(0.5, 2.5, 10, 0.5, False) == (0.5, 2.5, 0.5)
+    assert _bin_extent(3, 3, 10, None, True) == (3, 3.5, 0.5)
+
+
+def test_histogram():
+    df = _get_df()
+    chart = (
+        alt.Chart(df)
+        .mark_bar()
+        .encode(alt.X("x:Q", bin=True), y="count()", color="s:N")
+    )
+    aggregated = aggregate_chart_data(chart)
+    assert chart.data is df
+
+    assert set(aggregated.data.columns) == {
+        "bin_maxbins_10_x",
+        "bin_maxbins_10_x_end",
+        "s",
+        "__count",
+    }
+    counts = aggregated.data.groupby("bin_maxbins_10_x").agg(pl.sum("__count"))
+    assert counts.sort("bin_maxbins_10_x")["__count"].to_list() == [100] * 10
+    encoding = aggregated.to_dict()["encoding"]
+    assert encoding["x"] == {
+        "field": "bin_maxbins_10_x",
+        "bin": {"binned": True, "step": 10.0},
+        "title": "x (binned)",
+        "type": "quantitative",
+    }
+    assert encoding["x2"] == {"field": "bin_maxbins_10_x_end"}
+    assert encoding["y"]["title"] == "Count of Records"
+
+
+def test_heatmap_with_filter():
+    df = _get_df().to_pandas()
+    chart = (
+        alt.Chart(df)
+        .mark_rect()
+        .encode(alt.X("x", bin=alt.Bin(maxbins=5)), y="s", color="mean(y)")
+        .transform_filter(alt.FieldOneOfPredicate(field="s", oneOf=["a"]))
+    )
+    aggregated = aggregate_chart_data(chart)
+    assert isinstance(aggregated.data, pd.DataFrame)
+    assert aggregated.transform is alt.Undefined
+
+    a = df[df["s"] == "a"]
+    expected = a.groupby(a["x"] // 20 * 20)["y"].mean()
+    result = aggregated.data.set_index("bin_maxbins_5_x")["mean_y"]
+    assert np.allclose(result.sort_index(), expected.sort_index())
+
+
+def test_leaves_unsupported_views():
+    df = _get_df()
+    hist = alt.Chart(df).mark_bar().encode(alt.X("x:Q", bin=True), y="count()")
+    for chart in [
+        hist.transform_filter("datum.y > 0"),
+        hist.add_params(alt.selection_point(fields=["s"])),
+        alt.Chart(df).mark_line().encode(x="x:Q", y="y:Q"),
+        alt.Chart(df).mark_bar().encode(x="hours(x):T", y="count()"),
+    ]:
+        assert aggregate_chart_data(chart).data is df
+
+    # Zooming only changes the scales.
+    assert len(aggregate_chart_data(hist.interactive()).data) == 10
+    # The layers share their data, which one of them needs in full.
+    layered = alt.layer(hist, alt.Chart(df).mark_tick().encode(x="x:Q"))
+    assert aggregate_chart_data(layered).data is df
@@ -0,0 +1,75 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+from camminapy.plot import project_chart_data
+from camminapy.plot.altair_config import arrow_dir, parquet_dir
+from camminapy.plot.altair_data import to_arrow
+
+
+def _get_df() -> pl.DataFrame:
+    np.random.seed(20)
+    n = 100
+    return pl.DataFrame(
+        {
+            "x": np.arange(n),
+            "y": np.random.randn(n),
+            "unused": np.random.randn(n),
+            "s": pl.Series(np.random.choice(["a", "b"], n)).cast(pl.Categorical),
+        }
+    )
+
+
+def test_arrow_file_for_vega(tmp_path):
+    df = _get_df()
+    url = to_arrow(df, filename=str(tmp_path / "{prefix}-{hash}.{extension}"))
+    assert url["format"] == {"type": "arrow"}
+
+    table = pa.ipc.open_file(pa.memory_map(url["url"])).read_all()
+    assert table.schema.field("s").type == pa.dictionary(pa.int32(), pa.string())
+    assert (
+        pl.from_arrow(table)
+        .with_columns(pl.col("s").cast(pl.Utf8))
+        .frame_equal(df.with_columns(pl.col("s").cast(pl.Utf8)))
+    )
+
+
+def test_transformers(tmp_path):
+    df = _get_df()
+    arrow = arrow_dir(df, data_dir=str(tmp_path))
+    parquet = parquet_dir(df.to_pandas(), data_dir=str(tmp_path))
+
+    assert arrow["format"] == {"type": "arrow"}
+    assert parquet["format"] == {"type": "parquet"}
+    assert pq.read_table(parquet["url"]).column_names == df.columns
+    # Writing the same data again reuses the file.
+    assert arrow_dir(df, data_dir=str(tmp_path)) == arrow
+
+
+def test_project_chart_data():
+    df = _get_df()
+    chart = alt.Chart(df).mark_point().encode(x="x:Q", y="mean(y):Q")
+    layered = chart + alt.Chart(df.to_pandas()).mark_text().encode(x="x:Q", text="s:N")
+
+    projected = project_chart_data(layered)
+    assert projected.layer[0].data.columns == ["x", "y", "s"]
+    assert list(projected.layer[1].data.columns) == ["x", "y", "s"]
+    assert layered.layer[0].data.columns == df.columns
+
+    counted = alt.Chart(df).mark_bar().encode(y="count():Q")
+    assert project_chart_data(counted).data.columns == df.columns
+
+
+def test_project_chart_data_keeps_fields_of_expressions():
+    df = pd.DataFrame({"a": [1], "b": [2], "c": [3]})
+    chart = (
+        alt.Chart(df)
+        .transform_calculate(d="datum.b * 2")
+        .mark_point()
+        .encode(x="a:Q", y="d:Q")
+    )
+    assert list(project_chart_data(chart).data.columns) == ["a", "b"]
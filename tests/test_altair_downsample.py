@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from camminapy.plot.altair_config import json_dir
+from camminapy.plot.altair_downsample import downsample_for_plot
+
+
+def _get_df(n: int = 10_000) -> pl.DataFrame:
+    np.random.seed(22)
+    return pl.DataFrame(
+        {
+            "sensor": np.repeat(["a", "b"], n // 2),
+            "t": np.tile(np.arange(n // 2) / 10, 2),
+            "v": np.random.randn(n).cumsum(),
+        }
+    )
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, bucket: np.ndarray) -> list[int]:
+    """Straightforward LTTB of one series, to compare with."""
+    rows = [np.flatnonzero(bucket == b) for b in np.unique(bucket)]
+    kept = [0]
+    for i, bucket_rows in enumerate(rows):
+        if i + 1 < len(rows):
+            nx, ny = x[rows[i + 1]].mean(), y[rows[i + 1]].mean()
+        else:
+            nx, ny = x[-1], y[-1]
+        px, py = x[kept[-1]], y[kept[-1]]
+        area = np.abs(
+            (px - nx) * (y[bucket_rows] - py) - (px - x[bucket_rows]) * (ny - py)
+        )
+        kept.append(bucket_rows[np.argmax(area)])
+    return sorted(set(kept) | {len(x) - 1})
+
+
+def test_lttb_per_series():
+    df = _get_df()
+    df_down = downsample_for_plot(df, width=100, points_per_pixel=1)
+
+    for sensor in ["a", "b"]:
+        df_sensor = df.filter(pl.col("sensor") == sensor)
+        x = df_sensor["t"].to_numpy()
+        bucket = np.minimum((x - 0) / (x.max() - 0) * 98, 97).astype(int)
+        rows = _lttb(x, df_sensor["v"].to_numpy(), bucket)
+        assert df_down.filter(pl.col("sensor") == sensor).frame_equal(
+            df_sensor[np.array(rows)]
+        )
+
+
+def test_minmax_keeps_extremes():
+    # Shuffled rows need `x`, which otherwise must be sorted within every series.
+    df = _get_df().sample(fraction=1, shuffle=True, seed=22)
+    assert downsample_for_plot(df, method="minmax", width=100) is df
+    df_down = downsample_for_plot(df, x="t", method="minmax", width=100)
+
+    assert len(df_down) <= 2 * 200 + 4
+    for sensor in ["a", "b"]:
+        v = df.filter(pl.col("sensor") == sensor)["v"]
+        v_down = df_down.filter(pl.col("sensor") == sensor)["v"]
+        assert (v_down.min(), v_down.max()) == (v.min(), v.max())
+
+
+def test_keeps_small_and_other_data():
+    df = _get_df(100)
+    assert downsample_for_plot(df) is df
+    assert downsample_for_plot({"values": []}) == {"values": []}
+    with pytest.raises(ValueError):
+        downsample_for_plot(df, method="every_other")
+
+
+def test_pandas_and_transformer(tmp_path):
+    df = _get_df().to_pandas()
+    df_down = downsample_for_plot(df, width=100)
+    assert isinstance(df_down, pd.DataFrame)
+    assert df_down.index.is_monotonic_increasing
+    assert len(df_down) < len(df) / 10
+
+    url = json_dir(df, data_dir=str(tmp_path), downsample={"width": 100})
+    assert len(pd.read_json(url["url"])) == len(df_down)
@@ -0,0 +1,53 @@
+import json
+import os
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from camminapy.plot import export_charts
+
+
+def _get_df(n: int = 100, offset: int = 0) -> pl.DataFrame:
+    np.random.seed(24)
+    return pl.DataFrame({"x": np.arange(offset, offset + n), "y": np.random.randn(n)})
+
+
+def test_shared_data_is_written_once(tmp_path):
+    df = _get_df()
+    line = alt.Chart(df).mark_line().encode(x="x:Q", y="y:Q")
+    charts = {
+        "line": line,
+        "points": line.mark_point(),
+        # An equal dataframe in a layer.
+        "layered": alt.layer(
+            alt.Chart(df.clone()).mark_line().encode(x="x:Q", y="y:Q"),
+            alt.Chart(_get_df(offset=1)).mark_rule().encode(y="mean(y):Q"),
+        ),
+    }
+    paths = export_charts(charts, tmp_path, file_format="json")
+    assert charts["line"].data is df
+
+    assert paths == {name: tmp_path / f"{name}.json" for name in charts}
+    assert len(os.listdir(tmp_path / "data")) == 2
+    specs = {name: json.loads(path.read_text()) for name, path in paths.items()}
+    assert specs["line"]["data"] == specs["points"]["data"]
+    assert specs["layered"]["layer"][0]["data"] == specs["line"]["data"]
+    assert specs["line"]["config"]["view"]["width"] > 0
+
+    url = tmp_path / specs["line"]["data"]["url"]
+    pd.testing.assert_frame_equal(pd.read_json(url), df.to_pandas())
+
+
+def test_html_and_formats(tmp_path):
+    charts = [alt.Chart(_get_df()).mark_line().encode(x="x:Q", y="y:Q")] * 2
+    paths = export_charts(charts, tmp_path, data_format="csv", max_workers=2)
+    assert list(paths) == ["chart-0", "chart-1"]
+    assert '"url": "data/altair-data-' in paths["chart-0"].read_text()
+
+    with pytest.raises(ValueError):
+        export_charts(charts, tmp_path, file_format="png")
+    with pytest.raises(ValueError):
+        export_charts(charts, tmp_path, data_format="xlsx")
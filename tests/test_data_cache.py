@@ -0,0 +1,80 @@
+import os
+import time
+
+import altair as alt
+import pandas as pd
+import polars as pl
+
+from camminapy.plot.altair_config import csv_dir, json_dir
+from camminapy.plot.data_cache import DataCache, data_cache, fingerprint
+
+
+def _get_df(n: int = 100, offset: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({"x": range(offset, offset + n), "s": ["a", "b"] * (n // 2)})
+
+
+def test_fingerprint():
+    df = _get_df()
+    assert fingerprint(df) == fingerprint(df.copy())
+    assert fingerprint(df) != fingerprint(_get_df(offset=1))
+    assert fingerprint(df) != fingerprint(df.rename(columns={"x": "y"}))
+    assert fingerprint(df) != fingerprint(df.astype({"x": float}))
+    assert fingerprint(pl.from_pandas(df)) == fingerprint(pl.from_pandas(df))
+    assert fingerprint({"values": [{"x": 1}]}) is None
+
+
+def test_same_data_is_written_once(tmp_path):
+    calls = []
+
+    def to_json(data, filename):
+        calls.append(filename)
+        return alt.to_json(data, filename=filename)
+
+    cache = DataCache(tmp_path)
+    url = cache.write(_get_df(), alt.curry(to_json), "json")
+    assert cache.write(_get_df(), alt.curry(to_json), "json") == url
+    assert len(calls) == 1
+    assert pd.read_json(url["url"]).equals(_get_df())
+
+    # A new process finds the file on disk.
+    assert DataCache(tmp_path).write(_get_df(), alt.curry(to_json), "json") == url
+    assert len(calls) == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_transformers(tmp_path):
+    for transformer, extension in [(csv_dir, "csv"), (json_dir, "json")]:
+        url = transformer(_get_df(), data_dir=str(tmp_path))
+        assert url["format"] == {"type": extension}
+        assert url["url"].endswith(f".{extension}")
+
+    url = json_dir({"values": [{"x": 1}]}, data_dir=str(tmp_path))
+    assert os.path.exists(url["url"])
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_eviction_by_size(tmp_path):
+    cache = DataCache(tmp_path)
+    urls = [cache.write(_get_df(offset=i), alt.to_json, "json") for i in range(3)]
+    size = os.path.getsize(urls[0]["url"])
+
+    # Using the first file makes the second one the least recently used.
+    time.sleep(0.01)
+    cache.write(_get_df(offset=0), alt.to_json, "json")
+    # The files differ by a few bytes, so this only leaves room for three.
+    cache.max_bytes = 4 * size - 1
+    cache.write(_get_df(offset=3), alt.to_json, "json")
+    assert [os.path.exists(url["url"]) for url in urls] == [True, False, True]
+
+
+def test_eviction_by_age(tmp_path):
+    cache = data_cache(tmp_path)
+    assert data_cache(tmp_path, max_age_seconds=60) is cache
+    old = cache.write(_get_df(), alt.to_json, "json")
+
+    # Another process finds the file unused for long.
+    os.utime(old["url"], (0, 0))
+    DataCache(tmp_path, max_age_seconds=60).write(
+        _get_df(offset=1), alt.to_json, "json"
+    )
+    assert not os.path.exists(old["url"])
@@ -0,0 +1,149 @@
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.ipc
+import pytest
+
+from camminapy.data import (
+    resample_dataframe_grouped_polars,
+    resample_dataset_grouped_polars,
+)
+from camminapy.data.dataset import _iter_chunks
+
+
+def _get_df(n: int = 600) -> pl.DataFrame:
+    np.random.seed(18)
+    session = np.sort(np.random.choice(["a", "b", "c", "d"], n))
+    return pl.DataFrame(
+        {
+            "session": session,
+            "x": np.random.permutation(n) / 10,
+            "y": np.random.randn(n),
+            "z": np.random.choice(["dog", "cat"], n),
+        }
+    )
+
+
+def _write_dataset(df: pl.DataFrame, path, n_files: int = 3) -> None:
+    """Writes `df` as Parquet and IPC files with groups that cross files."""
+    path.mkdir()
+    size = -(-len(df) // n_files)
+    for i in range(n_files):
+        df_file = df.slice(i * size, size)
+        if i % 2 == 0:
+            df_file.write_parquet(path / f"part-{i}.parquet", row_group_size=37)
+        else:
+            table = df_file.to_arrow()
+            with pa.ipc.new_file(str(path / f"part-{i}.arrow"), table.schema) as f:
+                for batch in table.to_batches(max_chunksize=41):
+                    f.write_batch(batch)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 10_000])
+@pytest.mark.parametrize("max_in_flight", [1, 3])
+def test_dataset_matches_eager(tmp_path, chunk_size: int, max_in_flight: int):
+    df = _get_df()
+    _write_dataset(df, tmp_path / "input")
+    df_expected = resample_dataframe_grouped_polars(df, "x", 0.7, "session")
+
+    df_resampled = resample_dataset_grouped_polars(
+        tmp_path / "input",
+        "x",
+        0.7,
+        "session",
+        chunk_size=chunk_size,
+        max_in_flight=max_in_flight,
+    )
+    assert df_resampled.frame_equal(df_expected)
+
+
+def test_dataset_writes_partitions(tmp_path):
+    df = _get_df()
+    _write_dataset(df, tmp_path / "input")
+    resample_dataset_grouped_polars(
+        tmp_path / "input",
+        "x",
+        0.7,
+        "session",
+        sink=tmp_path / "output",
+        columns=["y"],
+        chunk_size=50,
+    )
+    df_expected = resample_dataframe_grouped_polars(df.drop("z"), "x", 0.7, "session")
+
+    paths = sorted((tmp_path / "output").iterdir())
+    assert {p.suffix for p in paths} <= {".parquet", ".arrow"}
+    df_written = pl.concat(
+        [
+            pl.read_parquet(p) if p.suffix == ".parquet" else pl.read_ipc(p)
+            for p in paths
+        ]
+    )
+    assert df_written.frame_equal(df_expected)
+
+
+def test_dataset_hive_partitions(tmp_path):
+    df = _get_df()
+    for (session,), df_session in df.groupby("session", maintain_order=True):
+        (tmp_path / f"session={session}").mkdir()
+        df_session.drop("session").write_parquet(
+            tmp_path / f"session={session}" / "data.parquet", row_group_size=20
+        )
+    df_expected = resample_dataframe_grouped_polars(df, "x", 0.7, "session")
+
+    df_resampled = resample_dataset_grouped_polars(tmp_path, "x", 0.7, "session")
+    assert df_resampled.select(df_expected.columns).frame_equal(df_expected)
+
+
+def test_chunks_of_groups_across_pieces_and_files(tmp_path):
+    df = _get_df().with_columns(
+        pl.Series("session", ["a"] * 300 + ["b"] * 20 + ["c"] * 280)
+    )
+    _write_dataset(df, tmp_path / "input")
+    paths = sorted((tmp_path / "input").iterdir())
+
+    chunks = list(_iter_chunks(paths, "session", None, chunk_size=50))
+    assert [
+        (path.name, df_chunk["session"].unique(maintain_order=True).to_list())
+        for path, df_chunk in chunks
+    ] == [("part-1.arrow", ["a", "b"]), ("part-2.parquet", ["c"])]
+    assert pl.concat([df_chunk for _, df_chunk in chunks]).frame_equal(df)
+
+
+def test_dataset_rejects_scattered_groups(tmp_path):
+    df = _get_df().sample(fraction=1, shuffle=True, seed=18)
+    _write_dataset(df, tmp_path / "input")
+    with pytest.raises(ValueError):
+        resample_dataset_grouped_polars(
+            tmp_path / "input", "x", 0.7, "session", chunk_size=100
+        )
+
+
+def test_dataset_compact_partitions(tmp_path):
+    df = _get_df()
+    _write_dataset(df, tmp_path / "input")
+    resample_dataset_grouped_polars(
+        tmp_path / "input",
+        "x",
+        0.7,
+        "session",
+        sink=tmp_path / "output",
+        chunk_size=50,
+        dtype_policy="compact",
+    )
+    df_expected = resample_dataframe_grouped_polars(
+        df, "x", 0.7, "session", dtype_policy="compact"
+    )
+
+    # The categories of the chunks of an IPC file are collected in one dictionary.
+    with pl.StringCache():
+        df_written = pl.concat(
+            [
+                pl.read_parquet(p) if p.suffix == ".parquet" else pl.read_ipc(p)
+                for p in sorted((tmp_path / "output").iterdir())
+            ]
+        )
+    assert df_written.schema == df_expected.schema
+    assert df_written.with_columns(pl.col("session", "z").cast(pl.Utf8)).frame_equal(
+        df_expected.with_columns(pl.col("session", "z").cast(pl.Utf8))
+    )
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from camminapy.data import (
+    downsample_dataframe_grouped_pandas,
+    downsample_dataframe_grouped_polars,
+    downsample_dataframe_pandas,
+    downsample_dataframe_polars,
+)
+
+
+def _get_df() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "x": [0, 1, 2, 3, 4, 5, 7],
+            "y": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
+            "s": ["a", "b", "c", "d", "e", "f", "g"],
+        }
+    )
+
+
+def test_downsample_polars():
+    df_downsampled = downsample_dataframe_polars(
+        _get_df(), interpolation_column="x", interpolation_step=2
+    )
+    expected = pl.DataFrame(
+        {"x": [0, 2, 4, 6], "y": [1.5, 3.5, 5.5, 7.0], "s": ["b", "d", "f", "g"]}
+    )
+    assert expected.frame_equal(df_downsampled)
+
+
+def test_multiple_aggregations_polars():
+    df_downsampled = downsample_dataframe_polars(
+        _get_df().reverse(),
+        interpolation_column="x",
+        interpolation_step=3,
+        aggregations={"y": ["min", "max", "count"], "s": "first"},
+    )
+    assert df_downsampled.columns == ["x", "y_min", "y_max", "y_count", "s"]
+    assert df_downsampled["x"].to_list() == [0, 3, 6]
+    assert df_downsampled["y_min"].to_list() == [1.0, 4.0, 7.0]
+    assert df_downsampled["y_max"].to_list() == [3.0, 6.0, 7.0]
+    assert df_downsampled["y_count"].to_list() == [3, 3, 1]
+    assert df_downsampled["s"].to_list() == ["a", "d", "g"]
+
+
+def test_bins_match_interpolation_points_polars():
+    np.random.seed(10)
+    df = pl.DataFrame({"x": np.sort(np.random.rand(1000)) * 7})
+    df_downsampled = downsample_dataframe_polars(
+        df.with_columns(pl.col("x").alias("x_min")),
+        interpolation_column="x",
+        interpolation_step=0.1,
+        aggregations={"x_min": "min"},
+    )
+    x = df_downsampled["x"].to_numpy()
+    assert np.array_equal(x, np.arange(x[0], x[-1] + 0.05, 0.1)[: len(x)])
+    assert (df_downsampled["x_min"].to_numpy() >= x).all()
+    assert (df_downsampled["x_min"].to_numpy()[1:] < x[1:] + 0.1).all()
+
+
+def test_downsample_grouped_polars():
+    df = _get_df()
+    df_grouped = pl.concat(
+        [
+            df.with_columns(pl.lit("b").alias("grp")),
+            df.with_columns(pl.lit("a").alias("grp"), pl.col("x") + 10),
+        ]
+    ).sample(fraction=1, shuffle=True, seed=1)
+    df_downsampled = downsample_dataframe_grouped_polars(
+        df_grouped, "x", 2, group_column="grp"
+    )
+    df_expected = pl.concat(
+        [
+            downsample_dataframe_polars(df_group, "x", 2)
+            for _, df_group in df_grouped.groupby("grp", maintain_order=True)
+        ]
+    )
+    assert df_expected.frame_equal(df_downsampled)
+
+
+def test_downsample_pandas():
+    df = _get_df().to_pandas()
+    df_downsampled = downsample_dataframe_pandas(df, "x", 2)
+    df_expected = downsample_dataframe_polars(pl.from_pandas(df), "x", 2)
+    assert df_expected.to_pandas().equals(df_downsampled)
+
+    df_grouped = pd.concat([df.assign(grp=1), df.assign(grp=2)], ignore_index=True)
+    df_downsampled = downsample_dataframe_grouped_pandas(df_grouped, "x", 2, "grp")
+    assert len(df_downsampled) == 2 * len(df_expected)
+
+
+@pytest.mark.parametrize(
+    "aggregations",
+    [
+        {"y": "mode"},
+        {"x": "mean"},
+        {"z": "min"},
+        {"s": "mean"},
+        {"s": ["last", "sum"]},
+        {"s": "median"},
+    ],
+)
+def test_invalid_aggregations(aggregations: dict[str, str | list[str]]):
+    with pytest.raises(ValueError):
+        downsample_dataframe_polars(_get_df(), "x", 2, aggregations=aggregations)
+
+
+def test_nan_is_missing_in_pandas():
+    df = pd.DataFrame({"x": [0, 1, 2, 3], "y": [1.0, np.nan, 3.0, 4.0]})
+    df_downsampled = downsample_dataframe_pandas(df, "x", 2)
+    assert df_downsampled["y"].tolist() == [1.0, 3.5]
@@ -1,8 +1,10 @@
 import os
 
 import altair as alt
+from git import Actor, Repo  # type: ignore
 
 from camminapy.plot import Footer
+from camminapy.plot.footer import GitSnapshot, git_snapshot
 
 
 def test_footer_returns_subtitle_dict():
@@ -35,3 +37,40 @@ def test_footer_can_create_chart_no_path():
 def test_footer_can_create_chart_no_path_not_one_line():
     chart = alt.Chart().properties(title=Footer().create(one_line=False))
     assert isinstance(chart, alt.Chart)
+
+
+def _make_repo(path) -> Repo:
+    repo = Repo.init(path)
+    (path / "a.txt").write_text("a")
+    repo.index.add(["a.txt"])
+    repo.index.commit("first", author=Actor("a", "a@example.com"))
+    return repo
+
+
+def test_git_snapshot_is_cached(tmp_path):
+    repo = _make_repo(tmp_path)
+    snapshot = git_snapshot(str(tmp_path))
+    assert snapshot == GitSnapshot(str(repo.head.commit), False, 0)
+    assert git_snapshot(str(tmp_path)) is snapshot
+
+    # Untracked files show up once the snapshot expires.
+    (tmp_path / "b.txt").write_text("b")
+    assert git_snapshot(str(tmp_path)) is snapshot
+    assert git_snapshot(str(tmp_path), ttl_seconds=0).n_untracked == 1
+
+
+def test_git_snapshot_follows_commits(tmp_path):
+    repo = _make_repo(tmp_path)
+    snapshot = git_snapshot(str(tmp_path), untracked_files=False)
+    assert snapshot.n_untracked is None
+
+    (tmp_path / "a.txt").write_text("b")
+    repo.index.add(["a.txt"])
+    assert git_snapshot(str(tmp_path), untracked_files=False).is_dirty
+    repo.index.commit("second", author=Actor("a", "a@example.com"))
+    snapshot = git_snapshot(str(tmp_path), untracked_files=False)
+    assert snapshot.commit == str(repo.head.commit)
+    assert not snapshot.is_dirty
+    assert Footer(str(tmp_path), untracked_files=False).get_git_status() == (
+        snapshot.commit
+    )
@@ -0,0 +1,163 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from camminapy.data import (
+    fuse_dataframes_pandas,
+    fuse_dataframes_polars,
+    resample_dataframe_polars,
+)
+
+
+def _get_sources() -> list[pl.DataFrame]:
+    np.random.seed(16)
+    n = 200
+    heart_rate = pl.DataFrame(
+        {
+            "t": np.random.choice(np.arange(1000), n, replace=False),
+            "hr": np.random.randint(60, 180, n),
+        }
+    )
+    power = pl.DataFrame(
+        {
+            "t": np.sort(np.random.choice(np.arange(300, 1500), n, replace=False)),
+            "power": np.random.rand(n) * 300,
+            "zone": np.random.choice(["easy", "hard"], n),
+        }
+    )
+    return [heart_rate, power]
+
+
+def test_matches_resample_and_join():
+    heart_rate, power = _get_sources()
+    points = np.arange(-10, 1600, 3)
+    df_fused = fuse_dataframes_polars(
+        [heart_rate, power],
+        "t",
+        None,
+        interpolation_points=points,
+        methods={"zone": "previous"},
+    )
+
+    df_expected = (
+        resample_dataframe_polars(heart_rate, "t", None, interpolation_points=points)
+        .join(
+            resample_dataframe_polars(
+                power,
+                "t",
+                None,
+                interpolation_points=points,
+                methods={"zone": "previous"},
+            ),
+            on="t",
+            how="outer",
+        )
+        .sort("t")
+    )
+    assert df_fused.frame_equal(df_expected, null_equal=True)
+
+
+def test_grid_spans_all_sources():
+    heart_rate, power = _get_sources()
+    df_fused = fuse_dataframes_polars([heart_rate, power], "t", 5)
+
+    start = min(heart_rate["t"].min(), power["t"].min())
+    stop = max(heart_rate["t"].max(), power["t"].max())
+    assert df_fused["t"].to_list() == list(range(start, stop + 1, 5))
+    assert df_fused.columns == ["t", "hr", "power", "zone"]
+
+
+def test_tolerance():
+    a = pl.DataFrame({"t": [0, 10, 11], "a": [0.0, 10.0, 11.0], "s": ["x", "y", "z"]})
+    b = pl.DataFrame({"t": [1, 4], "b": [1.0, 4.0]})
+    df_fused = fuse_dataframes_polars(
+        [a, b], "t", 1, methods={"b": "nearest"}, tolerance={"a": 2, "s": 3, "b": 1}
+    )
+
+    assert df_fused["a"].to_list() == [0.0] + [None] * 9 + [10.0, 11.0]
+    assert df_fused["s"].to_list() == ["x"] * 4 + [None] * 6 + ["y", "z"]
+    assert df_fused["b"].to_list() == [None, 1.0, 1.0, 4.0, 4.0] + [None] * 7
+
+
+def test_grouped_matches_per_group():
+    heart_rate, power = _get_sources()
+    heart_rate = heart_rate.with_columns(
+        pl.Series("session", np.random.choice(["A", "B"], len(heart_rate)))
+    )
+    power = power.with_columns(
+        pl.Series("session", np.random.choice(["B", "C"], len(power)))
+    )
+    df_fused = fuse_dataframes_polars(
+        [heart_rate, power], "t", 4, group_column="session"
+    )
+
+    sessions = pl.concat([heart_rate["session"], power["session"]])
+    assert (
+        df_fused["session"]
+        .unique(maintain_order=True)
+        .series_equal(sessions.unique(maintain_order=True))
+    )
+    for (session,), df_session in df_fused.groupby("session", maintain_order=True):
+        df_expected = fuse_dataframes_polars(
+            [
+                heart_rate.filter(pl.col("session") == session).drop("session"),
+                power.filter(pl.col("session") == session).drop("session"),
+            ],
+            "t",
+            4,
+        )
+        assert df_session.drop("session").frame_equal(df_expected, null_equal=True)
+
+
+def test_datetime_and_pandas():
+    start = datetime.datetime(2023, 1, 1)
+    a = pd.DataFrame(
+        {"t": [start + datetime.timedelta(seconds=s) for s in [0, 2]], "a": [0.0, 2.0]}
+    )
+    b = pd.DataFrame({"t": [start + datetime.timedelta(seconds=1)], "b": [1.0]})
+    df_fused = fuse_dataframes_pandas([a, b], "t", datetime.timedelta(seconds=1))
+
+    assert df_fused["t"].tolist() == [
+        start + datetime.timedelta(seconds=s) for s in [0, 1, 2]
+    ]
+    assert df_fused["a"].tolist() == [0.0, 1.0, 2.0]
+    assert df_fused["b"].isna().tolist() == [True, False, True]
+
+
+def test_datetime_with_time_zone():
+    start = datetime.datetime(2023, 1, 1)
+    df = pl.DataFrame(
+        {"t": [start, start + datetime.timedelta(seconds=2)], "a": [0.0, 2.0]}
+    ).with_columns(pl.col("t").dt.replace_time_zone("UTC"))
+    df_fused = fuse_dataframes_polars([df], "t", datetime.timedelta(seconds=1))
+
+    assert df_fused.schema == df.schema
+    assert df_fused["a"].to_list() == [0.0, 1.0, 2.0]
+
+
+@pytest.mark.parametrize(
+    "sources, kwargs",
+    [
+        ([], {}),
+        ([pl.DataFrame({"t": [0, 1], "a": [0, 1]})] * 2, {}),
+        ([pl.DataFrame({"t": [0, 0], "a": [0, 1]})], {}),
+        ([pl.DataFrame({"t": [0, 1], "a": [0, 1]})], {"methods": {"b": "nearest"}}),
+        ([pl.DataFrame({"t": [0, 1], "a": [0, 1]})], {"group_column": "g"}),
+        (
+            [pl.DataFrame({"t": [0, 1], "a": [0, 1]}), pl.DataFrame({"t": [0.5]})],
+            {},
+        ),
+    ],
+)
+def test_invalid_sources(sources: list[pl.DataFrame], kwargs: dict):
+    with pytest.raises(ValueError):
+        fuse_dataframes_polars(sources, "t", 1, **kwargs)
+
+
+def test_unsupported_dtype_is_named():
+    df = pl.DataFrame({"t": [0, 1], "a": [0, 1], "flag": [True, False]})
+    with pytest.raises(ValueError, match="'flag' of type Boolean"):
+        fuse_dataframes_polars([df], "t", 1)
@@ -0,0 +1,43 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+import camminapy.data
+import camminapy.plot
+
+
+def test_importing_packages_loads_no_dependencies():
+    code = (
+        "import sys, camminapy, camminapy.data, camminapy.plot; "
+        "print(*sorted({'polars', 'pandas', 'altair', 'rich'} & set(sys.modules)))"
+    )
+    command = [sys.executable, "-c", code]
+    output = subprocess.check_output(command, text=True)  # noqa: S603
+    assert output.strip() == ""
+
+
+@pytest.mark.parametrize("package", [camminapy.data, camminapy.plot])
+def test_all_names_are_available(package):
+    for name in package.__all__:
+        assert callable(getattr(package, name))
+        assert name in dir(package)
+    for name, module_name in package._MODULES.items():
+        module = importlib.import_module(module_name)
+        assert getattr(package, name) is getattr(module, name)
+    with pytest.raises(AttributeError):
+        package.does_not_exist  # noqa: B018
+
+
+def test_submodules_do_not_shadow_names():
+    # Importing the submodule `altair_theme` must not replace the function.
+    code = (
+        "import camminapy.plot.altair_theme; "
+        "from camminapy.plot import export_charts, altair_theme; "
+        "from camminapy.plot.altair_config import altair_theme as function; "
+        "print(altair_theme is function)"
+    )
+    command = [sys.executable, "-c", code]
+    output = subprocess.check_output(command, text=True)  # noqa: S603
+    assert output.strip() == "True"
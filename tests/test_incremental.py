@@ -0,0 +1,44 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from camminapy.data import Resampler, resample_dataframe_polars
+
+
+def _get_df(n: int = 200) -> pl.DataFrame:
+    np.random.seed(6)
+    return pl.DataFrame(
+        {
+            "x": np.sort(np.random.choice(np.arange(10 * n), n, replace=False)) / 10,
+            "y": np.random.randn(n),
+            "i": np.random.randint(-100, 100, n),
+            "z": np.random.choice(["dog", "cat", ""], n),
+        }
+    ).with_columns(pl.when(pl.col("z") != "").then(pl.col("z")))
+
+
+@pytest.mark.parametrize("step", [0.1, 0.7, 5])
+def test_appending_matches_full_resample(step: float):
+    df = _get_df()
+    df_expected = resample_dataframe_polars(
+        df, interpolation_column="x", interpolation_step=step
+    )
+
+    resampler = Resampler(interpolation_column="x", interpolation_step=step)
+    cuts = [0, 1, 2, 17, 18, 60, 150, 200]
+    df_resampled = pl.concat(
+        [
+            resampler.append(df[start:stop])
+            for start, stop in zip(cuts[:-1], cuts[1:], strict=True)
+        ]
+    )
+
+    assert df_expected.frame_equal(df_resampled)
+
+
+def test_appending_older_rows_fails():
+    df = _get_df()
+    resampler = Resampler(interpolation_column="x", interpolation_step=1)
+    resampler.append(df[100:])
+    with pytest.raises(ValueError):
+        resampler.append(df[:100])
@@ -0,0 +1,64 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from camminapy.data.kernel import (
+    Brackets,
+    blend,
+    bracket,
+    fill_forward,
+    searchsorted_grouped,
+)
+
+DTYPES = [pl.Float64, pl.Float32, pl.Int64, pl.Int16, pl.UInt8, pl.UInt32]
+
+
+def test_bracket_counts_points_between_rows():
+    x = np.array([0.0, 1.0, 4.0])
+    points = np.array([0.0, 0.5, 1.0, 2.0, 3.0, 4.0])
+    brackets = bracket(x, points, np.zeros(6, dtype=int), np.full(6, 3))
+
+    assert brackets.left.tolist() == [0, 0, 1, 1, 1, 2]
+    assert brackets.right.tolist() == [0, 1, 1, 2, 2, 2]
+    assert brackets.rank.tolist() == [0, 1, 0, 1, 2, 0]
+    assert brackets.steps.tolist() == [1, 2, 1, 3, 3, 1]
+
+
+def test_searchsorted_grouped_matches_numpy():
+    x = np.array([0, 2, 4, 1, 3, 5, 7])
+    points = np.array([0, 3, 4, 1, 6, 7])
+    row_start = np.array([0, 0, 0, 3, 3, 3])
+    row_stop = np.array([3, 3, 3, 7, 7, 7])
+    expected = [
+        start + np.searchsorted(x[start:stop], point, side="right")
+        for point, start, stop in zip(points, row_start, row_stop, strict=True)
+    ]
+
+    assert searchsorted_grouped(x, points, row_start, row_stop).tolist() == expected
+
+
+@pytest.mark.parametrize("dtype", DTYPES)
+def test_blend_matches_polars_interpolate(dtype: pl.PolarsDataType):
+    np.random.seed(3)
+    for _ in range(100):
+        k = np.random.randint(1, 20)
+        low, high = np.random.randint(0, 200, 2)
+        expected = (
+            pl.Series([low, *[None] * k, high], dtype=dtype).interpolate().to_numpy()
+        )
+        brackets = Brackets(
+            left=np.zeros(k, dtype=np.int64),
+            right=np.ones(k, dtype=np.int64),
+            rank=np.arange(1, k + 1),
+            steps=np.full(k, k + 1),
+        )
+        values = pl.Series([low, high], dtype=dtype).to_numpy()
+
+        assert np.array_equal(blend(values, brackets), expected[1:-1])
+
+
+def test_fill_forward_stays_within_groups():
+    valid = np.array([False, True, False, False, True, False, False])
+    group_index = np.array([0, 0, 0, 1, 1, 1, 2])
+    last = fill_forward(valid, group_index)
+    assert last.tolist() == [-1, 1, 1, -1, 4, 4, -1]
@@ -0,0 +1,117 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from camminapy.data import (
+    resample_dataframe_grouped_polars,
+    resample_dataframe_polars,
+    resample_lazyframe_grouped_polars,
+    resample_lazyframe_polars,
+)
+
+
+def _get_df(n: int = 200) -> pl.DataFrame:
+    np.random.seed(5)
+    return pl.DataFrame(
+        {
+            "x": np.sort(np.random.choice(np.arange(10 * n), n, replace=False)) / 10,
+            "y": np.random.randn(n),
+            "z": np.random.choice(["dog", "cat"], n),
+            "grp": np.random.choice([1, 2, 3], n),
+        }
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_lazy_matches_eager(chunk_size: int):
+    df = _get_df()
+    df_expected = resample_dataframe_polars(
+        df, interpolation_column="x", interpolation_step=0.3
+    )
+    df_resampled = resample_lazyframe_polars(
+        df.lazy(),
+        interpolation_column="x",
+        interpolation_step=0.3,
+        chunk_size=chunk_size,
+    )
+
+    assert df_expected.frame_equal(df_resampled)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 50, 1000])
+def test_lazy_grouped_matches_eager(chunk_size: int):
+    df = _get_df()
+    df_expected = resample_dataframe_grouped_polars(
+        df, interpolation_column="x", interpolation_step=0.3, group_column="grp"
+    )
+    df_resampled = resample_lazyframe_grouped_polars(
+        df.lazy(),
+        interpolation_column="x",
+        interpolation_step=0.3,
+        group_column="grp",
+        chunk_size=chunk_size,
+    )
+
+    assert df_expected.frame_equal(df_resampled)
+
+
+def test_lazy_grouped_missing_group_and_columns(tmp_path):
+    df = _get_df().with_columns(
+        pl.when(pl.col("grp") == 2).then(None).otherwise(pl.col("grp")).alias("grp")
+    )
+    df.write_parquet(tmp_path / "input.parquet", row_group_size=50)
+    df_expected = resample_dataframe_grouped_polars(
+        df.drop("z"),
+        interpolation_column="x",
+        interpolation_step=0.3,
+        group_column="grp",
+    )
+    df_resampled = resample_lazyframe_grouped_polars(
+        pl.scan_parquet(tmp_path / "input.parquet"),
+        interpolation_column="x",
+        interpolation_step=0.3,
+        group_column="grp",
+        chunk_size=64,
+        columns=["y"],
+        temp_dir=tmp_path,
+    )
+
+    assert df_expected.frame_equal(df_resampled)
+    assert list(tmp_path.iterdir()) == [tmp_path / "input.parquet"]
+
+
+def test_lazy_sinks_parquet(tmp_path):
+    df = _get_df()
+    df.write_parquet(tmp_path / "input.parquet", row_group_size=50)
+    resample_lazyframe_polars(
+        pl.scan_parquet(tmp_path / "input.parquet"),
+        interpolation_column="x",
+        interpolation_step=0.3,
+        sink=tmp_path / "output.parquet",
+        chunk_size=64,
+    )
+    df_expected = resample_dataframe_polars(
+        df, interpolation_column="x", interpolation_step=0.3
+    )
+
+    assert df_expected.frame_equal(pl.read_parquet(tmp_path / "output.parquet"))
+
+
+def test_lazy_projects_columns():
+    df = _get_df()
+    df_expected = resample_dataframe_polars(
+        df.select("x", "y"), interpolation_column="x", interpolation_step=0.3
+    )
+    df_resampled = resample_lazyframe_polars(
+        df.lazy(), interpolation_column="x", interpolation_step=0.3, columns=["y"]
+    )
+
+    assert df_expected.frame_equal(df_resampled)
+
+
+def test_lazy_rejects_unsorted_input():
+    df = _get_df().reverse()
+    with pytest.raises(ValueError):
+        resample_lazyframe_polars(
+            df.lazy(), interpolation_column="x", interpolation_step=0.3
+        )
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from camminapy.utils.config import config
+from camminapy.utils.logger import configure_logger, logger
+
+
+@pytest.fixture
+def log_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config, "foldername_log", tmp_path)
+    monkeypatch.setattr(config, "filename_debug_log", tmp_path / "debug.log")
+    yield tmp_path / "debug.log"
+    monkeypatch.undo()
+    configure_logger()
+
+
+def test_queued_json_logging(log_file: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config, "logger_queue", True)
+    monkeypatch.setattr(config, "logger_file_json", True)
+    configure_logger()
+    for i in range(3):
+        logger.info(f"Message {i}")
+    try:
+        raise ValueError("Oops")
+    except ValueError:
+        logger.exception("Failed")
+    # Reconfiguring writes everything that is still queued.
+    configure_logger()
+
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [entry["message"] for entry in entries] == [
+        "Message 0",
+        "Message 1",
+        "Message 2",
+        "Failed",
+    ]
+    assert entries[0]["level"] == "INFO"
+    assert "ValueError: Oops" in entries[-1]["exception"]
+
+
+def test_repeated_messages_are_rate_limited(
+    log_file: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(config, "logger_rate_limit_seconds", 60)
+    configure_logger()
+    for i in range(100):
+        logger.info(f"Message {i}")
+    logger.warning("Warnings always pass")
+    logger.warning("Warnings always pass")
+
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 3
+    assert lines[0].endswith("Message 0")
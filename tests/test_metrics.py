@@ -0,0 +1,103 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from camminapy.data import (
+    resample_dataframe_grouped_polars,
+    resample_dataframe_polars,
+)
+from camminapy.utils.config import config
+from camminapy.utils.metrics import metrics, record_metrics, stage
+
+
+def _get_df() -> pl.DataFrame:
+    np.random.seed(13)
+    return pl.DataFrame(
+        {
+            "grp": np.repeat([1, 2], 50),
+            "x": np.tile(np.arange(50), 2),
+            "y": np.random.randn(100),
+        }
+    )
+
+
+def test_stages_of_sorted_and_joined_paths():
+    df = _get_df()
+    with record_metrics() as m:
+        resample_dataframe_grouped_polars(df, "x", 2, group_column="grp")
+        resample_dataframe_polars(df.drop("grp"), "x", 2)
+
+    df_metrics = m.to_polars()
+    assert df_metrics["stage"].to_list() == [
+        "group",
+        "check",
+        "plan",
+        "interpolate",
+        "grid",
+        "outer_join",
+        "sort",
+        "left_join",
+        "forward_fill",
+    ]
+    calls = dict(zip(df_metrics["stage"], df_metrics["calls"], strict=True))
+    assert calls["check"] == 2
+    assert calls["interpolate"] == 2
+    rows_out = dict(zip(df_metrics["stage"], df_metrics["rows_out"], strict=True))
+    assert rows_out["plan"] == 50
+    assert (df_metrics["seconds"] >= 0).all()
+
+
+def test_nested_stages_of_thread_pool():
+    df = _get_df()
+    with record_metrics() as m:
+        resample_dataframe_grouped_polars(
+            df, "x", 2, group_column="grp", n_jobs=2, executor="thread"
+        )
+
+    df_metrics = m.to_polars()
+    assert df_metrics.filter(pl.col("stage") == "parallel")["depth"].to_list() == [0]
+    df_group = df_metrics.filter(pl.col("stage") == "group").sort("depth")
+    assert df_group["depth"].to_list() == [0, 1]
+    assert df_group["rows_in"].to_list() == [100, 100]
+    assert 'stage="plan",depth="1"' in m.to_prometheus()
+
+
+def test_nested_stages_keep_outer_peak(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config, "metrics_trace_memory", True)
+    with record_metrics() as m:
+        with stage("outer"):
+            array = np.ones(1_000_000)
+            del array
+            with stage("inner"):
+                pass
+
+    inner, outer = m.records
+    assert outer.peak_bytes >= 8_000_000
+    assert (inner.depth, inner.peak_bytes) == (1, None)
+
+
+def test_prometheus_text():
+    with record_metrics() as m:
+        with stage("custom", rows_in=10) as current:
+            current.rows_out = 5
+        with stage("custom", rows_in=10):
+            pass
+
+    text = m.to_prometheus()
+    assert "# TYPE camminapy_stage_calls_total counter" in text
+    assert 'camminapy_stage_calls_total{stage="custom"} 2' in text
+    assert 'camminapy_stage_rows_in_total{stage="custom"} 20' in text
+    assert 'camminapy_stage_rows_out_total{stage="custom"} 5' in text
+
+
+def test_enabled_through_config(monkeypatch: pytest.MonkeyPatch):
+    metrics.clear()
+    resample_dataframe_polars(_get_df(), "x", 2)
+    assert len(metrics.records) == 0
+
+    monkeypatch.setattr(config, "metrics_enabled", True)
+    monkeypatch.setattr(config, "metrics_trace_memory", True)
+    resample_dataframe_polars(_get_df().filter(pl.col("grp") == 1), "x", 2)
+    assert [r.stage for r in metrics.records] == ["check", "plan", "interpolate"]
+    assert all(r.peak_bytes is not None for r in metrics.records)
+    metrics.clear()
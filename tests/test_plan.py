@@ -0,0 +1,67 @@
+import numpy as np
+import polars as pl
+
+from camminapy.data import (
+    PlanCache,
+    resample_dataframe_grouped_polars,
+    resample_dataframe_polars,
+)
+
+
+def _get_df(n: int = 300) -> pl.DataFrame:
+    np.random.seed(8)
+    return pl.DataFrame(
+        {
+            "group": np.repeat(["a", "b", "c"], n // 3),
+            "x": np.tile(np.arange(n // 3), 3) + np.random.rand(n) / 2,
+            "y": np.random.randn(n),
+            "i": np.random.randint(-100, 100, n),
+        }
+    )
+
+
+def test_cached_plans_give_the_same_result():
+    df = _get_df().filter(pl.col("group") == "a").drop("group")
+    plan_cache = PlanCache()
+    df_expected = resample_dataframe_polars(df, "x", 0.3)
+
+    for column in ["y", "i"]:
+        df_resampled = resample_dataframe_polars(
+            df.select("x", column), "x", 0.3, plan_cache=plan_cache
+        )
+        assert df_expected.select("x", column).frame_equal(df_resampled)
+    assert (plan_cache.misses, plan_cache.hits, len(plan_cache)) == (1, 1, 1)
+
+    # Another step or other values on the axis need another plan.
+    resample_dataframe_polars(df, "x", 0.4, plan_cache=plan_cache)
+    resample_dataframe_polars(df[1:], "x", 0.3, plan_cache=plan_cache)
+    assert (plan_cache.misses, plan_cache.hits, len(plan_cache)) == (3, 1, 3)
+
+
+def test_cached_plans_for_groups():
+    df = _get_df()
+    plan_cache = PlanCache()
+    df_expected = resample_dataframe_grouped_polars(df, "x", 0.3, "group")
+    for _ in range(2):
+        df_resampled = resample_dataframe_grouped_polars(
+            df, "x", 0.3, "group", plan_cache=plan_cache
+        )
+        assert df_expected.frame_equal(df_resampled)
+    assert plan_cache.hits == 1
+
+
+def test_least_recently_used_plans_are_evicted():
+    df = _get_df().filter(pl.col("group") == "a").drop("group")
+    plan_cache = PlanCache()
+    resample_dataframe_polars(df, "x", 0.5, plan_cache=plan_cache)
+    plan_cache.max_bytes = int(plan_cache.nbytes * 2.5)
+
+    resample_dataframe_polars(df[1:], "x", 0.5, plan_cache=plan_cache)
+    resample_dataframe_polars(df, "x", 0.5, plan_cache=plan_cache)
+    resample_dataframe_polars(df[2:], "x", 0.5, plan_cache=plan_cache)
+    assert len(plan_cache) == 2
+    assert plan_cache.nbytes <= plan_cache.max_bytes
+
+    # `df` was used more recently than `df[1:]`, so it is still cached.
+    resample_dataframe_polars(df, "x", 0.5, plan_cache=plan_cache)
+    assert plan_cache.hits == 2
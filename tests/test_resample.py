@@ -1,3 +1,5 @@
+import datetime
+
 import numpy as np
 import pandas as pd
 import polars as pl
@@ -121,3 +123,505 @@ def test_resample_non_int():
     df = pl.DataFrame({"x": [1, 2, 3.5], "y": [2, 3, 4]})
     df2 = resample_dataframe_polars(df, interpolation_column="x", interpolation_step=1)
     assert df2["x"].to_list() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("step", [1, 3, 7])
+def test_grouped_matches_per_group_polars(step: int):
+    np.random.seed(2)
+    n = 200
+    df = pl.DataFrame(
+        {
+            "grp": np.random.choice(["A", "B", "C"], n),
+            "x": np.random.choice(np.arange(1000), n, replace=False),
+            "y": np.random.randn(n),
+            "z": np.random.choice(["dog", "cat"], n),
+        }
+    )
+    df_expected = pl.concat(
+        [
+            resample_dataframe_polars(
+                groupdf, interpolation_column="x", interpolation_step=step
+            )
+            for _, groupdf in df.groupby("grp", maintain_order=True)
+        ]
+    )
+    df_resampled = resample_dataframe_grouped_polars(
+        df, interpolation_column="x", interpolation_step=step, group_column="grp"
+    )
+
+    assert df_expected.frame_equal(df_resampled)
+
+
+@pytest.mark.parametrize("step", [0.3, 1.7])
+def test_sorted_input_matches_unsorted_input_polars(step: float):
+    np.random.seed(4)
+    n = 100
+    df = pl.DataFrame(
+        {
+            "x": np.sort(np.random.choice(np.arange(1000), n, replace=False)) / 10,
+            "y": np.random.randn(n),
+            "i": np.random.randint(-100, 100, n),
+            "z": np.random.choice(["dog", "cat"], n),
+        }
+    )
+    df_sorted = resample_dataframe_polars(
+        df, interpolation_column="x", interpolation_step=step
+    )
+    df_unsorted = resample_dataframe_polars(
+        df.reverse(), interpolation_column="x", interpolation_step=step
+    )
+
+    assert df_sorted.frame_equal(df_unsorted)
+
+
+def test_pyarrow_dtype_backend():
+    df = _get_df_pandas(20, 1, to_group=True).assign(z=lambda df: df["y"].astype(str))
+    df_resampled = resample_dataframe_grouped_pandas(
+        df,
+        interpolation_column="x",
+        interpolation_step=1,
+        group_column="grp",
+        dtype_backend="pyarrow",
+    )
+
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df_resampled.dtypes)
+    assert df.equals(df_resampled.astype(df.dtypes))
+
+
+def test_unknown_dtype_backend():
+    df = _get_df_pandas(20, 1)
+    with pytest.raises(ValueError):
+        resample_dataframe_pandas(
+            df, interpolation_column="x", interpolation_step=1, dtype_backend="foo"
+        )
+
+
+@pytest.mark.parametrize(
+    "n_jobs,executor", [(2, "thread"), (5, "thread"), (2, "process")]
+)
+def test_grouped_in_parallel_polars(n_jobs: int, executor: str):
+    df = _get_df_polars(300, 23, to_group=True)
+    df_expected = resample_dataframe_grouped_polars(
+        df, interpolation_column="x", interpolation_step=5, group_column="grp"
+    )
+    df_resampled = resample_dataframe_grouped_polars(
+        df,
+        interpolation_column="x",
+        interpolation_step=5,
+        group_column="grp",
+        n_jobs=n_jobs,
+        executor=executor,
+    )
+
+    assert df_expected.frame_equal(df_resampled)
+
+
+def test_unknown_executor():
+    df = _get_df_polars(300, 23, to_group=True)
+    with pytest.raises(ValueError):
+        resample_dataframe_grouped_polars(
+            df,
+            interpolation_column="x",
+            interpolation_step=5,
+            group_column="grp",
+            n_jobs=2,
+            executor="foo",
+        )
+
+
+def test_interpolation_methods_polars():
+    df = pl.DataFrame(
+        {
+            "x": [0.0, 1.0, 2.0, 3.0, 4.0],
+            "y": [0.0, 1.0, 4.0, 9.0, 16.0],
+            "i": [0, 10, 20, 30, 40],
+            "s": ["a", "b", None, "c", "d"],
+        }
+    )
+    df_resampled = resample_dataframe_polars(
+        df,
+        interpolation_column="x",
+        interpolation_step=1.4,
+        methods={"y": "cubic", "i": "nearest", "s": "previous"},
+    )
+
+    assert df_resampled["x"].to_list() == [0.0, 1.4, 2.8]
+    assert df_resampled["i"].to_list() == [0, 10, 30]
+    assert df_resampled["s"].to_list() == ["a", "b", None]
+    # Away from the edges, the cubic reproduces quadratics exactly.
+    assert np.allclose(df_resampled["y"][1:], [1.4**2, 2.8**2])
+
+    df_default = resample_dataframe_polars(
+        df, interpolation_column="x", interpolation_step=1.4
+    )
+    df_linear = resample_dataframe_polars(
+        df,
+        interpolation_column="x",
+        interpolation_step=1.4,
+        methods={"y": "linear"},
+    )
+    assert df_default.frame_equal(df_linear)
+
+
+def test_interpolation_methods_grouped_polars():
+    df = _get_df_polars(300, 23, to_group=True)
+    methods = {"y": "cubic", "z": "previous"}
+    df_resampled = resample_dataframe_grouped_polars(
+        df, "x", 5, group_column="grp", methods=methods
+    )
+    df_expected = pl.concat(
+        [
+            resample_dataframe_polars(df_group, "x", 5, methods=methods)
+            for _, df_group in df.groupby("grp", maintain_order=True)
+        ]
+    )
+
+    assert df_expected.frame_equal(df_resampled)
+
+
+@pytest.mark.parametrize(
+    "methods",
+    [{"y": "quadratic"}, {"nope": "linear"}, {"x": "linear"}, {"s": "linear"}],
+)
+def test_invalid_interpolation_methods(methods: dict[str, str]):
+    df = pl.DataFrame({"x": [0, 1, 2], "y": [0.0, 1.0, 2.0], "s": ["a", "b", "c"]})
+    with pytest.raises(ValueError):
+        resample_dataframe_polars(df, "x", 1, methods=methods)
+
+
+def test_interpolation_methods_need_sorted_rows():
+    df = pl.DataFrame({"x": [0, 2, 1], "y": [0.0, 2.0, 1.0]})
+    with pytest.raises(ValueError):
+        resample_dataframe_polars(df, "x", 1, methods={"y": "nearest"})
+
+
+@pytest.mark.parametrize("step", [1, 3])
+def test_low_memory_matches_joins_polars(step: int):
+    np.random.seed(14)
+    n = 200
+    df = pl.DataFrame(
+        {
+            "grp": np.random.choice(["A", "B", "C"], n),
+            "x": np.random.randint(0, 100, n),
+            "y": np.random.randn(n),
+            "b": np.random.rand(n) < 0.5,
+            "z": pl.Series(np.random.choice(["dog", "cat", ""], n)),
+        }
+    ).with_columns(
+        pl.when(pl.col("y") > 1).then(None).otherwise(pl.col("y")).alias("y"),
+        pl.when(pl.col("z") == "").then(None).otherwise(pl.col("z")).alias("z"),
+    )
+    df = df.with_columns(pl.col("z").cast(pl.Categorical).alias("c"))
+
+    df_expected = resample_dataframe_polars(
+        df, interpolation_column="x", interpolation_step=step
+    )
+    df_resampled = resample_dataframe_polars(
+        df, interpolation_column="x", interpolation_step=step, low_memory=True
+    )
+    assert df_expected.frame_equal(df_resampled, null_equal=True)
+
+    df_expected = resample_dataframe_grouped_polars(
+        df, interpolation_column="x", interpolation_step=step, group_column="grp"
+    )
+    df_resampled = resample_dataframe_grouped_polars(
+        df,
+        interpolation_column="x",
+        interpolation_step=step,
+        group_column="grp",
+        low_memory=True,
+    )
+    assert df_expected.frame_equal(df_resampled, null_equal=True)
+
+
+@pytest.mark.parametrize("low_memory", [False, True])
+def test_datetime_interpolation_column_polars(low_memory: bool):
+    # Crosses the switch to daylight saving time in Berlin.
+    start = datetime.datetime(2023, 3, 26, 0, 59, 59)
+    df = pl.DataFrame(
+        {
+            "t": [start + datetime.timedelta(seconds=s) for s in [0, 1.5, 4, 7]],
+            "y": [0.0, 3.0, 8.0, 14.0],
+        }
+    ).with_columns(
+        pl.col("t").dt.replace_time_zone("UTC").dt.convert_time_zone("Europe/Berlin")
+    )
+    df_expected = resample_dataframe_polars(
+        df.with_columns(pl.col("t").dt.epoch("us")), "t", 2_000_000
+    )
+
+    for frame in [df, df.reverse()]:
+        df_resampled = resample_dataframe_polars(
+            frame, "t", datetime.timedelta(seconds=2), low_memory=low_memory
+        )
+        assert df_resampled.schema == df.schema
+        assert df_resampled.with_columns(pl.col("t").dt.epoch("us")).frame_equal(
+            df_expected
+        )
+
+
+def test_integer_and_date_steps_are_exact():
+    x = 10**15 + np.arange(0, 3001, 3)
+    df = pl.DataFrame({"x": x, "y": np.arange(len(x))})
+    df_resampled = resample_dataframe_polars(df, "x", 3)
+    assert (df_resampled["x"].to_numpy() == x).all()
+
+    df = pl.DataFrame(
+        {"d": [datetime.date(2020, 1, 1), datetime.date(2020, 1, 5)], "y": [0, 4]}
+    )
+    df_resampled = resample_dataframe_polars(df, "d", datetime.timedelta(days=2))
+    assert df_resampled["d"].to_list() == [
+        datetime.date(2020, 1, 1),
+        datetime.date(2020, 1, 3),
+        datetime.date(2020, 1, 5),
+    ]
+    assert df_resampled["y"].to_list() == [0, 2, 4]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"interpolation_step": None},
+        {"interpolation_step": 1, "interpolation_points": [1, 2]},
+        {"interpolation_step": 0.5},
+        {"interpolation_step": datetime.timedelta(hours=1)},
+    ],
+)
+def test_invalid_steps(kwargs: dict):
+    df = pl.DataFrame(
+        {"d": [datetime.date(2020, 1, 1), datetime.date(2020, 1, 5)], "y": [0, 4]}
+    )
+    with pytest.raises(ValueError):
+        resample_dataframe_polars(df, "d", **kwargs)
+
+
+def test_interpolation_points_polars():
+    df = pl.DataFrame({"x": [0, 10, 20], "y": [0.0, 1.0, 2.0], "s": ["a", "b", "c"]})
+    df_resampled = resample_dataframe_polars(
+        df,
+        "x",
+        None,
+        interpolation_points=pl.Series([25, 10, 5, -5, 10]),
+        methods={"s": "previous"},
+    )
+    assert df_resampled.frame_equal(
+        pl.DataFrame({"x": [5, 10], "y": [0.5, 1.0], "s": ["a", "b"]})
+    )
+
+
+def test_interpolation_points_on_integer_axis():
+    df = pl.DataFrame({"t": [0, 2, 4], "y": [0.0, 2.0, 4.0]})
+    with pytest.raises(ValueError):
+        resample_dataframe_polars(
+            df, "t", None, interpolation_points=np.array([0.5, 1.5, 3.5])
+        )
+    df_resampled = resample_dataframe_polars(
+        df, "t", None, interpolation_points=np.array([1.0, 3.0])
+    )
+    assert df_resampled.frame_equal(pl.DataFrame({"t": [1, 3], "y": [1.0, 3.0]}))
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_interpolation_points_grouped_polars(n_jobs: int):
+    np.random.seed(15)
+    n = 300
+    df = pl.DataFrame(
+        {
+            "grp": np.random.choice(["A", "B", "C"], n),
+            "x": np.random.choice(np.arange(1000), n, replace=False),
+            "y": np.random.randn(n),
+        }
+    )
+    points = np.arange(-50, 1100, 7.0)
+
+    df_expected = pl.concat(
+        [
+            resample_dataframe_polars(
+                groupdf, "x", None, interpolation_points=points, low_memory=True
+            )
+            for _, groupdf in df.groupby("grp", maintain_order=True)
+        ]
+    )
+    df_resampled = resample_dataframe_grouped_polars(
+        df,
+        "x",
+        None,
+        "grp",
+        interpolation_points=points,
+        n_jobs=n_jobs,
+        executor="thread",
+    )
+    assert df_expected.frame_equal(df_resampled)
+    assert set(df_resampled["x"]) <= set(points.astype(int))
+
+
+def _get_df_with_gap() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "x": [0.0, 1.0, 5.0, 6.0, 7.0],
+            "y": [0.0, 1.0, 5.0, 6.0, 7.0],
+            "s": ["a", "b", "c", None, "d"],
+        }
+    )
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("low_memory", [False, True])
+def test_max_gap_polars(reverse: bool, low_memory: bool):
+    df = _get_df_with_gap()
+    df_resampled = resample_dataframe_polars(
+        df.reverse() if reverse else df,
+        "x",
+        0.5,
+        low_memory=low_memory,
+        max_gap=2,
+    )
+
+    assert df_resampled["y"].to_list() == (
+        [0.0, 0.5, 1.0] + [None] * 7 + [5.0, 5.5, 6.0, 6.5, 7.0]
+    )
+    # Strings are not forward filled across the gap either.
+    assert df_resampled["s"].to_list() == (
+        ["a", "a", "b"] + [None] * 7 + ["c", "c", "c", "c", "d"]
+    )
+
+
+def test_max_gap_interpolation_methods():
+    df_resampled = resample_dataframe_polars(
+        _get_df_with_gap(),
+        "x",
+        1,
+        methods={"y": "nearest", "s": "previous"},
+        max_gap=2,
+    )
+    assert df_resampled["y"].to_list() == [0.0, 1.0, None, None, None, 5.0, 6.0, 7.0]
+    assert df_resampled["s"].to_list() == ["a", "b", None, None, None, "c", None, "d"]
+
+
+def test_max_gap_grouped():
+    df = pl.concat(
+        [
+            _get_df_with_gap().with_columns(pl.lit("A").alias("grp")),
+            _get_df_with_gap().with_columns(pl.lit("B").alias("grp"), pl.col("x") * 2),
+        ]
+    )
+    df_expected = pl.concat(
+        [
+            resample_dataframe_polars(groupdf, "x", 1, max_gap=3).with_columns(
+                pl.lit(group).alias("grp")
+            )
+            for group, groupdf in df.groupby("grp", maintain_order=True)
+        ]
+    )
+    df_shuffled = df.sample(fraction=1, shuffle=True, seed=17).sort("grp")
+    for df_input, kwargs in [
+        (df, {}),
+        (df, {"n_jobs": 2, "executor": "thread"}),
+        (df_shuffled, {}),
+        (df_shuffled, {"low_memory": True}),
+    ]:
+        df_resampled = resample_dataframe_grouped_polars(
+            df_input, "x", 1, "grp", max_gap=3, **kwargs
+        )
+        assert df_resampled.frame_equal(df_expected, null_equal=True)
+        assert df_resampled["grp"].null_count() == 0
+    assert df_expected["y"].null_count() > 0
+
+    df_pandas = resample_dataframe_grouped_pandas(
+        df.to_pandas(), "x", 1, "grp", max_gap=3
+    )
+    assert df_pandas["y"].isna().sum() == df_expected["y"].null_count()
+    assert df_pandas["grp"].notna().all()
+
+
+def test_max_gap_datetime():
+    start = datetime.datetime(2023, 1, 1)
+    df = pd.DataFrame(
+        {
+            "t": [start + datetime.timedelta(minutes=m) for m in [0, 1, 10, 11]],
+            "y": [0.0, 1.0, 10.0, 11.0],
+        }
+    )
+    df_resampled = resample_dataframe_pandas(
+        df,
+        "t",
+        datetime.timedelta(minutes=1),
+        max_gap=datetime.timedelta(minutes=5),
+    )
+    assert df_resampled["y"].isna().tolist() == [False] * 2 + [True] * 8 + [False] * 2
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("low_memory", [False, True])
+def test_dtype_policy_compact(reverse: bool, low_memory: bool):
+    df = pl.concat(
+        [
+            _get_df_with_gap().with_columns(pl.lit("A").alias("grp")),
+            _get_df_with_gap().with_columns(pl.lit("B").alias("grp"), pl.col("x") * 2),
+        ]
+    ).with_columns(pl.col("y").cast(pl.Int16).alias("counts"))
+    if reverse:
+        df = df.reverse()
+    df_expected = resample_dataframe_grouped_polars(
+        df, "x", 0.5, "grp", low_memory=low_memory, max_gap=3
+    )
+    df_resampled = resample_dataframe_grouped_polars(
+        df, "x", 0.5, "grp", low_memory=low_memory, max_gap=3, dtype_policy="compact"
+    )
+
+    assert df_resampled.schema == {
+        "x": pl.Float64,
+        "y": pl.Float32,
+        "s": pl.Categorical,
+        "grp": pl.Categorical,
+        "counts": pl.Int16,
+    }
+    assert df_resampled.with_columns(pl.col("s", "grp").cast(pl.Utf8)).frame_equal(
+        df_expected.with_columns(pl.col("y").cast(pl.Float32)), null_equal=True
+    )
+
+
+def test_dtype_policy_methods_and_pandas():
+    df = _get_df_with_gap()
+    df_resampled = resample_dataframe_polars(
+        df, "x", 0.5, methods={"y": "cubic"}, dtype_policy="compact"
+    )
+    assert df_resampled.schema == {
+        "x": pl.Float64,
+        "y": pl.Float32,
+        "s": pl.Categorical,
+    }
+
+    df_pandas = resample_dataframe_pandas(
+        df.to_pandas(), "x", 0.5, dtype_policy="compact"
+    )
+    assert df_pandas.dtypes.astype(str).tolist() == ["float64", "float32", "category"]
+
+    with pytest.raises(ValueError):
+        resample_dataframe_polars(df, "x", 0.5, dtype_policy="smallest")
+
+
+def test_nan_is_missing_in_pandas():
+    df = pd.DataFrame({"t": [0.0, 1.0, 2.0, 3.0], "v": [1.0, np.nan, 3.0, 4.0]})
+    expected = [1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0]
+
+    df_resampled = resample_dataframe_pandas(df, "t", 0.5)
+    assert df_resampled["v"].tolist() == expected
+
+    df_grouped = resample_dataframe_grouped_pandas(df.assign(grp=1), "t", 0.5, "grp")
+    assert df_grouped["v"].tolist() == expected
+
+
+@pytest.mark.parametrize("dtype_policy", ["preserve", "compact"])
+def test_dtype_policy_keeps_float32_axis_and_precision(dtype_policy: str):
+    np.random.seed(25)
+    df = pl.DataFrame(
+        {"x": np.arange(100, dtype=np.float32), "y": np.random.randn(100) * 1e3}
+    )
+    df_expected = resample_dataframe_polars(df, "x", 0.3)
+    df_resampled = resample_dataframe_polars(df, "x", 0.3, dtype_policy=dtype_policy)
+
+    assert df_resampled.schema["x"] == pl.Float32
+    if dtype_policy == "compact":
+        df_expected = df_expected.with_columns(pl.col("y").cast(pl.Float32))
+    assert df_resampled.frame_equal(df_expected)